@@ -9,6 +9,58 @@ import os
 from typing import Any
 
 
+class VersionAction(argparse.Action):
+    """Print the version of Statick and exit.
+
+    Unlike the version action of argparse, the version is only looked up when the
+    argument is used, so reading package metadata does not slow down every run.
+    """
+
+    def __init__(
+        self,
+        option_strings: list[str],
+        dest: str = argparse.SUPPRESS,
+        default: Any = argparse.SUPPRESS,
+        help: str | None = None,  # pylint: disable=redefined-builtin
+    ) -> None:
+        """Initialize the action.
+
+        Args:
+            option_strings: Flags of the argument.
+            dest: Name of the attribute, which is never set.
+            default: Default value, which is never set.
+            help: Help text of the argument.
+        """
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Any,
+        option_string: str | None = None,
+    ) -> None:
+        """Print the version and exit.
+
+        Args:
+            parser: Parser the argument belongs to.
+            namespace: Parsed arguments.
+            values: Values of the argument.
+            option_string: Flag that was used.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from importlib.metadata import version
+
+        print(f"{parser.prog} {version('statick')}")
+        parser.exit()
+
+
 class Args:
     """Custom argument handling.
 
@@ -29,6 +81,8 @@ class Args:
             "configuration or plugins",
         }
         self.pre_parser.add_argument("--user-paths", "-u", **user_path_args)  # type: ignore
+        self.pre_parser.add_argument("--cache-dir", dest="cache_dir", type=str)
+        self.pre_parser.add_argument("--no-cache", dest="no_cache", action="store_true")
 
         self.parser = argparse.ArgumentParser(description=name)
         self.parser.add_argument("--user-paths", "-u", **user_path_args)  # type: ignore
@@ -53,6 +107,21 @@ class Args:
                     logging.error("Could not find user path %s!", path)
         return user_paths
 
+    def get_cache_dir(self, args: Any = None) -> str | None:
+        """Get the cache directory, if caching is not turned off.
+
+        Args:
+            args: Arguments to parse.
+
+        Returns:
+            Cache directory, or None if no cache directory is set or caching is off.
+        """
+        args = self.pre_parser.parse_known_args(args)[0]
+        if args.no_cache:
+            return None
+        cache_dir: str | None = args.cache_dir
+        return cache_dir
+
     def get_args(self, args: list[str] | None = None) -> argparse.Namespace:
         """Get parsed command-line arguments.
 
@@ -4,9 +4,17 @@ Sets what flags are used for each plugin at those levels.
 """
 
 import os
-from typing import Any
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, NamedTuple
 
-import yaml
+LevelConfig = NamedTuple(
+    "LevelConfig",
+    [
+        ("plugins", Mapping[str, tuple[str, ...]]),
+        ("settings", Mapping[tuple[str, str, str], Any]),
+    ],
+)
 
 
 class Config:
@@ -29,6 +37,7 @@ class Config:
             default_level: The default level to use if no level is specified.
         """
         self.default_level = default_level
+        self.levels: dict[str, LevelConfig] = {}
         if base_file is None or not os.path.exists(base_file):
             self.config: Any = []
             return
@@ -37,6 +46,8 @@ class Config:
 
         if user_file and os.path.exists(user_file):
             self.get_user_levels(user_file)
+        else:
+            self.levels = self.flatten_levels()
 
     def get_user_levels(self, user_file: str) -> None:
         """Get configuration levels from user file.
@@ -60,6 +71,7 @@ class Config:
                     ):
                         level_config["inherits_from"] = ""
                     self.config["levels"][level] = user_config["levels"][level]
+        self.levels = self.flatten_levels()
 
     @staticmethod
     def get_config_from_file(filename: str) -> Any:
@@ -69,9 +81,13 @@ class Config:
             filename: The file to get configuration from.
         """
         if filename:
+            import yaml  # pylint: disable=import-outside-toplevel
+
             with open(filename, encoding="utf8") as fid:
                 try:
-                    return yaml.safe_load(fid)
+                    # The LibYAML loader is much faster, if PyYAML was built with it.
+                    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                    return yaml.load(fid, Loader=loader)  # nosec B506
                 except (
                     yaml.YAMLError,
                     yaml.scanner.ScannerError,  # pyright: ignore
@@ -82,6 +98,153 @@ class Config:
 
         return None
 
+    def flatten_levels(self) -> dict[str, LevelConfig]:
+        """Resolve the inheritance of every level in the configuration.
+
+        Returns:
+            The flattened configuration of each level.
+
+        Raises:
+            ValueError: If levels inherit from each other in a cycle.
+        """
+        levels: dict[str, LevelConfig] = {}
+        if not self.config or not self.config.get("levels"):
+            return levels
+        for level in self.config["levels"]:
+            self.flatten_level(level, levels, [])
+        return levels
+
+    def flatten_level(
+        self, level: str, levels: dict[str, LevelConfig], chain: list[str]
+    ) -> LevelConfig:
+        """Resolve the inheritance of a level.
+
+        Plugins that a level enables and the plugins of the levels it inherits from are
+        combined in the order the level lists them, and the default level enables no
+        plugins. Settings of the level override the
+        settings of inherited levels. Settings that only inherited levels have are
+        joined in the order of inherits_from if they are strings, otherwise the first
+        inherited value is used. Inherited levels that do not exist are skipped.
+
+        Args:
+            level: The level to resolve.
+            levels: Levels that are already resolved, which the level is added to.
+            chain: Levels whose inheritance is being resolved, outermost first.
+
+        Returns:
+            The flattened configuration of the level.
+
+        Raises:
+            ValueError: If the level inherits from itself through other levels.
+        """
+        if level in levels:
+            return levels[level]
+        if level in chain:
+            raise ValueError(
+                "Levels inherit from each other in a cycle: "
+                + " -> ".join(chain + [level])
+            )
+        level_config = self.config["levels"][level] or {}
+        inherited: dict[str, LevelConfig] = {}
+        for inherited_level in level_config.get("inherits_from") or []:
+            if inherited_level != level and inherited_level in self.config["levels"]:
+                inherited[inherited_level] = self.flatten_level(
+                    inherited_level, levels, chain + [level]
+                )
+
+        plugins: dict[str, list[str]] = {}
+        settings: dict[tuple[str, str, str], Any] = {}
+        for key, type_config in level_config.items():
+            if key == "inherits_from":
+                for inherited_level, inherited_config in inherited.items():
+                    if inherited_level == self.default_level:
+                        continue
+                    for plugin_type, names in inherited_config.plugins.items():
+                        self.add_plugins(plugins.setdefault(plugin_type, []), names)
+            elif type_config is not None:
+                self.add_plugins(plugins.setdefault(key, []), list(type_config))
+                if isinstance(type_config, dict):
+                    for plugin, plugin_config in type_config.items():
+                        if isinstance(plugin_config, dict):
+                            for name, value in plugin_config.items():
+                                settings[(key, plugin, name)] = value
+
+        inherited_settings: dict[tuple[str, str, str], list[Any]] = {}
+        for inherited_config in inherited.values():
+            for setting, value in inherited_config.settings.items():
+                if setting not in settings and value is not None:
+                    inherited_settings.setdefault(setting, []).append(value)
+        for setting, values in inherited_settings.items():
+            if all(isinstance(value, str) for value in values):
+                if "".join(values):
+                    settings[setting] = "".join(values)
+            else:
+                settings[setting] = values[0]
+
+        levels[level] = self.make_level_config(
+            {plugin_type: tuple(names) for plugin_type, names in plugins.items()},
+            settings,
+        )
+        return levels[level]
+
+    @staticmethod
+    def make_level_config(
+        plugins: Mapping[str, tuple[str, ...]],
+        settings: Mapping[tuple[str, str, str], Any],
+    ) -> LevelConfig:
+        """Make the flattened configuration of a level, which can not be changed.
+
+        Args:
+            plugins: Plugins enabled for each plugin type.
+            settings: Settings keyed by plugin type, plugin and setting name.
+
+        Returns:
+            The flattened configuration of the level.
+        """
+        return LevelConfig(
+            MappingProxyType(dict(plugins)), MappingProxyType(dict(settings))
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state of the configuration for pickling.
+
+        Read-only mappings can not be pickled, so flattened levels are stored as
+        dictionaries.
+
+        Returns:
+            The state of the configuration.
+        """
+        state = self.__dict__.copy()
+        state["levels"] = {
+            level: (dict(level_config.plugins), dict(level_config.settings))
+            for level, level_config in self.levels.items()
+        }
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the state of the configuration after unpickling.
+
+        Args:
+            state: The state of the configuration.
+        """
+        state["levels"] = {
+            level: self.make_level_config(plugins, settings)
+            for level, (plugins, settings) in state["levels"].items()
+        }
+        self.__dict__.update(state)
+
+    @staticmethod
+    def add_plugins(plugins: list[str], names: Any) -> None:
+        """Add plugins to a list of plugins, skipping plugins already in the list.
+
+        Args:
+            plugins: The list of plugins to add to.
+            names: Names of the plugins to add.
+        """
+        for name in names:
+            if name not in plugins:
+                plugins.append(name)
+
     def has_level(self, level: str | None) -> bool:
         """Check if given level exists in config.
 
@@ -91,7 +254,7 @@ class Config:
         Returns:
             True if level exists in config, False otherwise.
         """
-        return "levels" in self.config and level in self.config["levels"]
+        return level in self.levels
 
     def get_enabled_plugins(self, level: str, plugin_type: str) -> list[str]:
         """Get what plugins are enabled for a certain level.
@@ -103,29 +266,9 @@ class Config:
         Returns:
             A list of plugins enabled for the given level.
         """
-        plugins: list[str] = []
-
-        if level == self.default_level:
-            return plugins
-
-        # pylint: disable=too-many-nested-blocks
-        for level_type in self.config["levels"][level]:
-            # pylint: enable=too-many-nested-blocks
-            if (
-                plugin_type in level_type
-                and self.config["levels"][level][plugin_type] is not None
-            ):
-                plugins += list(self.config["levels"][level][plugin_type])
-            if "inherits_from" in self.config["levels"][level]:
-                for inherited_level in self.config["levels"][level]["inherits_from"]:
-                    if level is not inherited_level:
-                        enabled_plugins = self.get_enabled_plugins(
-                            inherited_level, plugin_type
-                        )
-                        for plugin in enabled_plugins:
-                            if plugin not in plugins:
-                                plugins.append(plugin)
-        return plugins
+        if level == self.default_level or level not in self.levels:
+            return []
+        return list(self.levels[level].plugins.get(plugin_type, ()))
 
     def get_enabled_tool_plugins(self, level: str) -> list[str]:
         """Get what tool plugins are enabled for a certain level.
@@ -201,28 +344,9 @@ class Config:
         Returns:
             The flags to use for a plugin at a certain level.
         """
-        if level not in self.config["levels"]:
+        if level not in self.levels:
             return default
-        level_config = self.config["levels"][level]
-        if plugin_type in level_config:
-            type_config = level_config[plugin_type]
-            if plugin in type_config:
-                plugin_config = type_config[plugin]
-                if plugin_config is not None and key in plugin_config:
-                    return plugin_config[key]
-        if "inherits_from" in level_config:
-            inherited_level = level_config["inherits_from"]
-            configs = ""
-            for inherited_level in self.config["levels"][level]["inherits_from"]:
-                if level is not inherited_level:
-                    config = self.get_plugin_config(
-                        plugin_type, plugin, inherited_level, key, default
-                    )
-                    if config is not None:
-                        configs += config
-            if configs:
-                return configs
-        return default
+        return self.levels[level].settings.get((plugin_type, plugin, key), default)
 
     def get_tool_config(
         self, plugin: str, level: str, key: str, default: str | None = None
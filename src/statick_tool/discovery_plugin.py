@@ -6,16 +6,94 @@ import subprocess
 import sys
 from typing import Any
 
-from statick_tool.exceptions import Exceptions
+from statick_tool.exceptions import Exceptions, GlobSet
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
+from statick_tool.tool_probe import ToolProbe
 
 
 class DiscoveryPlugin:
-    """Default implementation of discovery plugin."""
+    """Default implementation of discovery plugin.
+
+    Each file found by find_files has a `file_cmd_out` entry with the output of the
+    file command. Files whose extension is in NAMED_TYPE_EXTENSIONS are not passed to
+    the file command, so their `file_cmd_out` is always empty and plugins have to
+    classify them by name. For example, a `.js` file that the file command reports as
+    C source is not found by the C discovery plugin.
+    """
 
     plugin_context = None
 
+    # Files with these extensions are identified by their name alone, so the file
+    # command is not run on them.
+    NAMED_TYPE_EXTENSIONS = (
+        ".a",
+        ".bash",
+        ".bib",
+        ".c",
+        ".cc",
+        ".class",
+        ".cmake",
+        ".cpp",
+        ".csh",
+        ".css",
+        ".cxx",
+        ".dash",
+        ".gif",
+        ".gradle",
+        ".groovy",
+        ".gz",
+        ".h",
+        ".hpp",
+        ".html",
+        ".hxx",
+        ".java",
+        ".jpg",
+        ".js",
+        ".ksh",
+        ".launch",
+        ".md",
+        ".o",
+        ".pddl",
+        ".pdf",
+        ".pl",
+        ".png",
+        ".py",
+        ".pyc",
+        ".rst",
+        ".sh",
+        ".so",
+        ".tex",
+        ".xml",
+        ".yaml",
+        ".yml",
+        ".zip",
+        ".zsh",
+    )
+
+    # Directories that never hold files to analyze, such as version control data and
+    # dependency or tool caches.
+    IGNORED_DIRECTORIES = frozenset(
+        [
+            ".eggs",
+            ".git",
+            ".hg",
+            ".mypy_cache",
+            ".nox",
+            ".pytest_cache",
+            ".ruff_cache",
+            ".svn",
+            ".tox",
+            "CMakeFiles",
+            "__pycache__",
+            "node_modules",
+        ]
+    )
+
+    # Directories holding one of these files are virtual environments or CMake build
+    # trees. A CMake build tree that is also a source tree is still walked.
+    BUILD_TREE_MARKERS = frozenset(["CMakeCache.txt", "pyvenv.cfg"])
+
     def get_name(self) -> str | None:
         """Get name of plugin.
 
@@ -53,29 +131,167 @@ class DiscoveryPlugin:
             exceptions: Exceptions to apply to discovery.
         """
 
-    def find_files(self, package: Package) -> None:
+    def find_files(
+        self, package: Package, exceptions: Exceptions | None = None
+    ) -> None:
         """Walk the package path exactly once to discover files for analysis.
 
+        If only changed files are scanned, then those files are used instead of walking
+        the package path. The file command is run once for all files whose type is not
+        decided by their extension.
+
         Args:
             package: Package to scan.
+            exceptions: Exceptions used to leave out files and directories early.
         """
         if package._walked:  # pylint: disable=protected-access
             return
 
-        for root, _, files in os.walk(package.path):
-            for fname in files:
-                full_path = os.path.join(root, fname)
-                abs_path = os.path.abspath(full_path)
-                file_output = self.get_file_cmd_output(full_path)
-                file_dict = {
-                    "name": fname.lower(),
-                    "path": abs_path,
-                    "file_cmd_out": file_output,
-                }
-                package.files[abs_path] = file_dict
+        globs: list[str] = []
+        if exceptions is not None:
+            globs = exceptions.get_early_exception_globs(package)
+
+        if package.changed_files is not None:
+            # Only changed files are scanned, so there is no need to walk the package.
+            package_path = os.path.abspath(package.path)
+            file_globs = GlobSet(globs)
+            full_paths = [
+                fname
+                for fname in sorted(package.changed_files)
+                if os.path.isfile(fname)
+                and not any(
+                    part in self.IGNORED_DIRECTORIES
+                    for part in os.path.relpath(fname, package_path).split(os.sep)
+                )
+                and not file_globs.match_exception(fname)
+            ]
+        else:
+            full_paths = self.walk_package(package, globs)
+
+        file_outputs = self.get_file_cmd_outputs(
+            [
+                full_path
+                for full_path in full_paths
+                if not full_path.lower().endswith(self.NAMED_TYPE_EXTENSIONS)
+            ]
+        )
+
+        for full_path in full_paths:
+            abs_path = os.path.abspath(full_path)
+            file_output = file_outputs.get(full_path, "")
+            file_dict = {
+                "name": os.path.basename(full_path).lower(),
+                "path": abs_path,
+                "file_cmd_out": file_output,
+            }
+            package.files[abs_path] = file_dict
 
         package._walked = True  # pylint: disable=protected-access
 
+    def walk_package(self, package: Package, globs: list[str]) -> list[str]:
+        """Walk the package path, leaving out directories that are never analyzed.
+
+        Directories are left out if they are in the default set of ignored directories,
+        if they are virtual environments or CMake build trees, if they match an
+        exception for all tools, or (if enabled) if they are ignored by git. Files are
+        listed in the same order as os.walk would list them.
+
+        Args:
+            package: Package to walk.
+            globs: File patterns of exceptions for all tools.
+
+        Returns:
+            Absolute paths of the files in the package.
+        """
+        package_path = os.path.abspath(package.path)
+        ignored_paths: set[str] = set()
+        if (
+            self.plugin_context is not None
+            and "use_gitignore" in self.plugin_context.args
+            and self.plugin_context.args.use_gitignore
+        ):
+            ignored_paths = self.get_gitignored_paths(package_path)
+        # Only patterns that end with a wildcard match every file below a directory.
+        dir_globs = GlobSet([pattern for pattern in globs if pattern.endswith("*")])
+        file_globs = GlobSet(globs)
+
+        full_paths: list[str] = []
+        dirs_to_walk = [package_path]
+        while dirs_to_walk:
+            top = dirs_to_walk.pop()
+            try:
+                with os.scandir(top) as scan_it:
+                    entries = list(scan_it)
+            except OSError:
+                continue
+
+            if top != package_path and any(
+                entry.name in self.BUILD_TREE_MARKERS for entry in entries
+            ):
+                if not any(entry.name == "CMakeLists.txt" for entry in entries):
+                    continue
+
+            sub_dirs: list[str] = []
+            for entry in entries:
+                if entry.path in ignored_paths:
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk, do not follow links to directories.
+                    if (
+                        entry.name in self.IGNORED_DIRECTORIES
+                        or entry.is_symlink()
+                        or dir_globs.match_exception(entry.path + os.sep)
+                    ):
+                        continue
+                    sub_dirs.append(entry.path)
+                elif not file_globs.match_exception(entry.path):
+                    full_paths.append(entry.path)
+
+            dirs_to_walk += reversed(sub_dirs)
+
+        return full_paths
+
+    @staticmethod
+    def get_gitignored_paths(package_path: str) -> set[str]:
+        """Get the files and directories in a package that are ignored by git.
+
+        Args:
+            package_path: Absolute path of the package.
+
+        Returns:
+            Absolute paths of ignored files and directories.
+        """
+        try:
+            output = subprocess.check_output(
+                [
+                    "git",
+                    "ls-files",
+                    "-z",
+                    "--others",
+                    "--ignored",
+                    "--exclude-standard",
+                    "--directory",
+                ],
+                cwd=package_path,
+                stderr=subprocess.DEVNULL,
+            )
+        except subprocess.CalledProcessError:
+            logging.warning("%s is not in a git repository.", package_path)
+            return set()
+        except OSError as ex:
+            logging.warning("Couldn't find git executable! (%s)", ex)
+            return set()
+
+        return {
+            os.path.normpath(os.path.join(package_path, os.fsdecode(name)))
+            for name in output.split(b"\0")
+            if name
+        }
+
     def get_file_cmd_output(self, full_path: str) -> str:
         """Run the file command (if it exists) on the supplied path.
 
@@ -114,6 +330,58 @@ class DiscoveryPlugin:
             logging.warning("OSError on file command for %s", full_path)
             return ""
 
+    def get_file_cmd_outputs(self, full_paths: list[str]) -> dict[str, str]:
+        """Run the file command (if it exists) once on all of the supplied paths.
+
+        Args:
+            full_paths: Full paths to files.
+
+        Returns:
+            Output of file command for each path, in the format of get_file_cmd_output.
+        """
+        if not full_paths or not self.file_command_exists():
+            return {}
+
+        # Paths are read one per line, so paths with line breaks are run one at a time.
+        outputs = {
+            full_path: self.get_file_cmd_output(full_path)
+            for full_path in full_paths
+            if "\n" in full_path or "\r" in full_path
+        }
+        batch_paths = [
+            full_path for full_path in full_paths if full_path not in outputs
+        ]
+        if not batch_paths:
+            return outputs
+
+        try:
+            # With --print0 each line is the path, a NUL and then the usual ": <type>".
+            output = subprocess.check_output(
+                ["file", "--no-pad", "--print0", "--files-from", "-"],
+                input=b"".join(
+                    os.fsencode(full_path) + b"\n" for full_path in batch_paths
+                ),
+            )
+        except subprocess.CalledProcessError as ex:
+            logging.warning(
+                "Failed to run 'file' command. Returncode = %d", ex.returncode
+            )
+            logging.warning("Exception output: %s", ex.output)
+            return outputs
+        except OSError as ex:
+            logging.warning("OSError on file command: %s", ex)
+            return outputs
+
+        for line in output.split(b"\n"):
+            name, sep, file_type = line.partition(b"\0")
+            if sep:
+                full_path = os.fsdecode(name)
+                outputs[full_path] = (
+                    full_path + file_type.decode("utf-8", errors="replace") + "\n"
+                ).lower()
+
+        return outputs
+
     def set_plugin_context(self, plugin_context: None | PluginContext) -> None:
         """Set the plugin context.
 
@@ -134,9 +402,4 @@ class DiscoveryPlugin:
         else:
             command_name = "file"
 
-        for path in os.environ["PATH"].split(os.pathsep):
-            exe_path = os.path.join(path, command_name)
-            if os.path.isfile(exe_path) and os.access(exe_path, os.X_OK):
-                return True
-
-        return False
+        return ToolProbe.find_executable(command_name) is not None
@@ -13,9 +13,7 @@ import fnmatch
 import logging
 import os
 import re
-from typing import Any, Match, Pattern
-
-import yaml
+from typing import Any, Pattern
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -32,11 +30,19 @@ class Exceptions:
         """
         if not filename:
             raise ValueError(f"{filename} is not a valid file")
+        import yaml  # pylint: disable=import-outside-toplevel
+
         with open(filename, encoding="utf8") as fname:
             try:
-                self.exceptions: dict[Any, Any] = yaml.safe_load(fname)
+                # The LibYAML loader is much faster, if PyYAML was built with it.
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                self.exceptions: dict[Any, Any] = yaml.load(  # nosec B506
+                    fname, Loader=loader
+                )
             except (yaml.YAMLError, yaml.scanner.ScannerError) as ex:  # pyright: ignore
                 raise ValueError(f"{filename} is not a valid YAML file: {ex}") from ex
+        self.compiled: dict[str, CompiledExceptions] = {}
+        self.nolint_lines: dict[str, set[int] | None] = {}
 
     def get_ignore_packages(self) -> list[str]:
         """Get list of packages to skip when scanning a workspace.
@@ -91,6 +97,23 @@ class Exceptions:
 
         return exceptions
 
+    def get_compiled_exceptions(self, package: Package) -> "CompiledExceptions":
+        """Get exceptions for a package, compiled for fast filtering.
+
+        Exceptions are only compiled once for each package.
+
+        Args:
+            package: Package to get exceptions for.
+
+        Returns:
+            Compiled exceptions for the given package.
+        """
+        if package.name not in self.compiled:
+            self.compiled[package.name] = CompiledExceptions(
+                self.get_exceptions(package)
+            )
+        return self.compiled[package.name]
+
     def filter_file_exceptions_early(
         self, package: Package, file_list: list[str]
     ) -> list[str]:
@@ -107,26 +130,25 @@ class Exceptions:
         Returns:
             List of files with exceptions removed.
         """
-        exceptions: dict[Any, Any] = self.get_exceptions(package)
-        to_remove = []
-        for filename in file_list:
-            removed = False
-            for exception in exceptions["file"]:
-                if exception["tools"] == "all":
-                    for pattern in exception["globs"]:
-                        # Hack to avoid exceptions for everything on Travis CI.
-                        fname = filename
-                        prefix = "/home/travis/build/"
-                        if pattern == "*/build/*" and fname.startswith(prefix):
-                            fname = fname[len(prefix) :]
-                        if fnmatch.fnmatch(fname, pattern):
-                            to_remove.append(filename)
-                            removed = True
-                            break
-                    if removed:
-                        break
-        file_list = [filename for filename in file_list if filename not in to_remove]
-        return file_list
+        early_globs = self.get_compiled_exceptions(package).early_globs
+        return [
+            filename
+            for filename in file_list
+            if not early_globs.match_exception(filename)
+        ]
+
+    def get_early_exception_globs(self, package: Package) -> list[str]:
+        """Get file patterns of exceptions that apply to all tools.
+
+        Files matching these patterns can be left out before any tool runs.
+
+        Args:
+            package: Package to get patterns for.
+
+        Returns:
+            List of file patterns.
+        """
+        return self.get_compiled_exceptions(package).early_globs.patterns
 
     def filter_file_exceptions(
         self, package: Package, exceptions: list[Any], issues: dict[str, list[Issue]]
@@ -141,33 +163,8 @@ class Exceptions:
         Returns:
             Filtered issues.
         """
-        for tool, tool_issues in list(  # pylint: disable=too-many-nested-blocks
-            issues.items()
-        ):
-            warning_printed = False
-            to_remove: list[Issue] = []
-            for issue in tool_issues:
-                if not os.path.isabs(issue.filename):
-                    if not warning_printed:
-                        self.print_exception_warning(tool)
-                        warning_printed = True
-                    continue
-                rel_path: str = os.path.relpath(issue.filename, package.path)
-                for exception in exceptions:
-                    if exception["tools"] == "all" or tool in exception["tools"]:
-                        for pattern in exception["globs"]:
-                            # Hack to avoid exceptions for everything on Travis CI.
-                            fname: str = issue.filename
-                            prefix: str = "/home/travis/build/"
-                            if pattern == "*/build/*" and fname.startswith(prefix):
-                                fname = fname[len(prefix) :]
-                            if fnmatch.fnmatch(fname, pattern) or fnmatch.fnmatch(
-                                rel_path, pattern
-                            ):
-                                to_remove.append(issue)
-            issues[tool] = [issue for issue in tool_issues if issue not in to_remove]
-
-        return issues
+        compiled = CompiledExceptions({"file": exceptions, "message_regex": []})
+        return compiled.filter_issues(package, issues)
 
     @classmethod
     def filter_regex_exceptions(
@@ -182,41 +179,45 @@ class Exceptions:
         Returns:
             Filtered issues.
         """
-        for exception in exceptions:  # pylint: disable=too-many-nested-blocks
-            exception_re = exception["regex"]
-            exception_tools = exception["tools"]
-            exception_globs = []
-            if "globs" in exception:
-                exception_globs = exception["globs"]
-            try:
-                compiled_re: Pattern[str] = re.compile(exception_re)
-            except re.error:
-                logging.warning(
-                    "Invalid regular expression in exception: %s", exception_re
-                )
-                continue
-            for tool, tool_issues in list(issues.items()):
-                to_remove = []
-                if exception_tools == "all" or tool in exception_tools:
-                    for issue in tool_issues:
-                        if exception_globs:
-                            for pattern in exception_globs:
-                                if fnmatch.fnmatch(issue.filename, pattern):
-                                    match: Match[str] | None = compiled_re.match(
-                                        issue.message
-                                    )
-                                    if match:
-                                        to_remove.append(issue)
-                        else:
-                            match_re: Match[str] | None = compiled_re.match(
-                                issue.message
-                            )
-                            if match_re:
-                                to_remove.append(issue)
-                issues[tool] = [
-                    issue for issue in tool_issues if issue not in to_remove
-                ]
-        return issues
+        compiled = CompiledExceptions({"file": [], "message_regex": exceptions})
+        return compiled.filter_issues(None, issues)
+
+    def get_nolint_lines(self, filename: str) -> set[int] | None:
+        """Get the numbers of the lines of a file that contain NOLINT.
+
+        Each file is only read once. The result is shared by the issues of all tools.
+
+        Args:
+            filename: Absolute path of the file.
+
+        Returns:
+            Line numbers, starting from 1, of lines that contain NOLINT, or None if the
+            file can not be read.
+        """
+        if filename in self.nolint_lines:
+            return self.nolint_lines[filename]
+
+        nolint_lines: set[int] | None = set()
+        try:
+            with open(filename, encoding="utf-8") as fid:
+                contents = fid.read()
+        except (FileNotFoundError, UnicodeDecodeError) as exc:
+            logging.warning("Could not read %s: %s", filename, exc)
+            nolint_lines = None
+        else:
+            if "NOLINT" in contents:
+                lines = contents.split("\n")
+                if contents.endswith("\n"):
+                    lines.pop()
+                nolint_lines = {
+                    index + 1 for index, line in enumerate(lines) if "NOLINT" in line
+                }
+                # As with list indexing, an issue on line 0 is checked against the last
+                # line.
+                if lines and len(lines) in nolint_lines:
+                    nolint_lines.add(0)
+        self.nolint_lines[filename] = nolint_lines
+        return nolint_lines
 
     def filter_nolint(self, issues: dict[str, list[Issue]]) -> dict[str, list[Issue]]:
         """Filter out lines that have an explicit NOLINT on them.
@@ -232,31 +233,19 @@ class Exceptions:
         """
         for tool, tool_issues in list(issues.items()):
             warning_printed: bool = False
-            to_remove: list[Issue] = []
+            kept: list[Issue] = []
             for issue in tool_issues:
                 if not os.path.isabs(issue.filename):
                     if not warning_printed:
                         self.print_exception_warning(tool)
                         warning_printed = True
+                    kept.append(issue)
                     continue
-                try:
-                    with open(issue.filename, encoding="utf-8") as fid:
-                        try:
-                            lines = fid.readlines()
-                        except UnicodeDecodeError as exc:
-                            logging.warning(
-                                "Could not read %s: %s", issue.filename, exc
-                            )
-                            continue
-                except FileNotFoundError as exc:
-                    logging.warning("Could not read %s: %s", issue.filename, exc)
-                    continue
-                if len(lines) <= 0:
+                nolint_lines = self.get_nolint_lines(issue.filename)
+                if nolint_lines and issue.line_number in nolint_lines:
                     continue
-                line_number = issue.line_number - 1
-                if line_number < len(lines) and "NOLINT" in lines[line_number]:
-                    to_remove.append(issue)
-            issues[tool] = [issue for issue in tool_issues if issue not in to_remove]
+                kept.append(issue)
+            issues[tool] = kept
         return issues
 
     def filter_issues(
@@ -271,13 +260,7 @@ class Exceptions:
         Returns:
             Filtered issues.
         """
-        exceptions = self.get_exceptions(package)
-
-        if exceptions["file"]:
-            issues = self.filter_file_exceptions(package, exceptions["file"], issues)
-
-        if exceptions["message_regex"]:
-            issues = self.filter_regex_exceptions(exceptions["message_regex"], issues)
+        issues = self.get_compiled_exceptions(package).filter_issues(package, issues)
 
         issues = self.filter_nolint(issues)
 
@@ -297,3 +280,238 @@ class Exceptions:
             "plugin due to lack of absolute paths for issues.",
             tool,
         )
+
+
+class GlobSet:
+    """Set of file patterns that are matched with a single regular expression.
+
+    Patterns are matched the same way as with fnmatch.fnmatch.
+    """
+
+    # Hack to avoid exceptions for everything on Travis CI.
+    TRAVIS_PREFIX = "/home/travis/build/"
+    TRAVIS_PATTERN = "*/build/*"
+
+    def __init__(self, patterns: list[str]) -> None:
+        """Initialize the set of file patterns.
+
+        Args:
+            patterns: File patterns.
+        """
+        self.patterns = list(patterns)
+        self.regex = self.compile_patterns(self.patterns)
+        self.has_travis_pattern = self.TRAVIS_PATTERN in self.patterns
+        self.exception_regex = self.compile_patterns(
+            [pattern for pattern in self.patterns if pattern != self.TRAVIS_PATTERN]
+        )
+        self.travis_regex = self.compile_patterns([self.TRAVIS_PATTERN])
+
+    @staticmethod
+    def compile_patterns(patterns: list[str]) -> Pattern[str] | None:
+        """Combine file patterns into a single regular expression.
+
+        Args:
+            patterns: File patterns.
+
+        Returns:
+            Regular expression matching any of the patterns, or None if there are none.
+        """
+        if not patterns:
+            return None
+        return re.compile(
+            "|".join(
+                f"(?:{fnmatch.translate(os.path.normcase(pattern))})"
+                for pattern in patterns
+            )
+        )
+
+    def match(self, filename: str) -> bool:
+        """Check whether a file matches any of the patterns.
+
+        Args:
+            filename: Path of the file.
+
+        Returns:
+            True if the file matches a pattern, False otherwise.
+        """
+        return self.regex is not None and bool(
+            self.regex.match(os.path.normcase(filename))
+        )
+
+    def match_exception(self, filename: str) -> bool:
+        """Check whether an absolute file path is excepted by any of the patterns.
+
+        On Travis CI everything is below a build directory, so the build directory
+        pattern is only matched against the part of the path below it.
+
+        Args:
+            filename: Absolute path of the file.
+
+        Returns:
+            True if the file matches a pattern, False otherwise.
+        """
+        if self.exception_regex is not None and self.exception_regex.match(
+            os.path.normcase(filename)
+        ):
+            return True
+        if self.has_travis_pattern and self.travis_regex is not None:
+            if filename.startswith(self.TRAVIS_PREFIX):
+                filename = filename[len(self.TRAVIS_PREFIX) :]
+            return bool(self.travis_regex.match(os.path.normcase(filename)))
+        return False
+
+
+class CompiledExceptions:
+    """Exceptions for a package, compiled to filter issues in a single pass."""
+
+    def __init__(self, exceptions: dict[Any, Any]) -> None:
+        """Compile exceptions.
+
+        Args:
+            exceptions: File and message regex exceptions, as from get_exceptions.
+        """
+        self.file_exceptions: list[Any] = exceptions["file"]
+        self.early_globs = GlobSet(
+            [
+                pattern
+                for exception in self.file_exceptions
+                if exception["tools"] == "all"
+                for pattern in exception["globs"]
+            ]
+        )
+        self.regex_exceptions: list[tuple[Any, Pattern[str], GlobSet | None]] = []
+        for exception in exceptions["message_regex"]:
+            try:
+                compiled_re: Pattern[str] = re.compile(exception["regex"])
+            except re.error:
+                logging.warning(
+                    "Invalid regular expression in exception: %s", exception["regex"]
+                )
+                continue
+            globs = None
+            if "globs" in exception and exception["globs"]:
+                globs = GlobSet(exception["globs"])
+            self.regex_exceptions.append((exception["tools"], compiled_re, globs))
+        self.tool_file_globs: dict[str, GlobSet] = {}
+        self.tool_regexes: dict[str, list[tuple[Pattern[str], GlobSet | None]]] = {}
+
+    def get_file_globs(self, tool: str) -> GlobSet:
+        """Get the file patterns of exceptions that apply to a tool.
+
+        Args:
+            tool: Name of the tool.
+
+        Returns:
+            File patterns for the tool.
+        """
+        if tool not in self.tool_file_globs:
+            self.tool_file_globs[tool] = GlobSet(
+                [
+                    pattern
+                    for exception in self.file_exceptions
+                    if exception["tools"] == "all" or tool in exception["tools"]
+                    for pattern in exception["globs"]
+                ]
+            )
+        return self.tool_file_globs[tool]
+
+    def get_regexes(self, tool: str) -> list[tuple[Pattern[str], GlobSet | None]]:
+        """Get the message regexes of exceptions that apply to a tool.
+
+        Args:
+            tool: Name of the tool.
+
+        Regexes that apply to all files are combined into a single regex where
+        possible, so each message is only matched once.
+
+        Returns:
+            Message regexes for the tool, along with the files they apply to.
+        """
+        if tool not in self.tool_regexes:
+            regexes: list[tuple[Pattern[str], GlobSet | None]] = []
+            combinable: list[str] = []
+            for tools, compiled_re, globs in self.regex_exceptions:
+                if tools != "all" and tool not in tools:
+                    continue
+                if globs is None and self.is_combinable(compiled_re):
+                    combinable.append(compiled_re.pattern)
+                else:
+                    regexes.append((compiled_re, globs))
+            if len(combinable) > 1:
+                try:
+                    combined = re.compile(
+                        "|".join(f"(?:{pattern})" for pattern in combinable)
+                    )
+                    regexes.insert(0, (combined, None))
+                except re.error:
+                    regexes[:0] = [
+                        (re.compile(pattern), None) for pattern in combinable
+                    ]
+            elif combinable:
+                regexes.insert(0, (re.compile(combinable[0]), None))
+            self.tool_regexes[tool] = regexes
+        return self.tool_regexes[tool]
+
+    @staticmethod
+    def is_combinable(compiled_re: Pattern[str]) -> bool:
+        """Check whether a regex can be combined with others into a single regex.
+
+        Regexes with back references or global inline flags change meaning when they
+        are combined with other regexes.
+
+        Args:
+            compiled_re: Compiled regex.
+
+        Returns:
+            True if the regex can be combined, False otherwise.
+        """
+        return not re.search(r"\\[1-9]|\(\?P=|^\(\?[aiLmsux]+\)", compiled_re.pattern)
+
+    def filter_issues(
+        self, package: Package | None, issues: dict[str, list[Issue]]
+    ) -> dict[str, list[Issue]]:
+        """Filter issues based on file pattern and message regex exceptions.
+
+        Args:
+            package: Package the issues were found in. File pattern exceptions are
+                only applied if a package is given.
+            issues: Issues to filter.
+
+        Returns:
+            Filtered issues.
+        """
+        use_file_exceptions = package is not None and bool(self.file_exceptions)
+        rel_paths: dict[str, str] = {}
+        for tool, tool_issues in list(issues.items()):
+            file_globs = self.get_file_globs(tool)
+            regexes = self.get_regexes(tool)
+            if not use_file_exceptions and not regexes:
+                continue
+
+            warning_printed = False
+            kept: list[Issue] = []
+            for issue in tool_issues:
+                if use_file_exceptions and package is not None:
+                    if not os.path.isabs(issue.filename):
+                        if not warning_printed:
+                            Exceptions.print_exception_warning(tool)
+                            warning_printed = True
+                    else:
+                        if issue.filename not in rel_paths:
+                            rel_paths[issue.filename] = os.path.relpath(
+                                issue.filename, package.path
+                            )
+                        if file_globs.match_exception(issue.filename) or (
+                            file_globs.match(rel_paths[issue.filename])
+                        ):
+                            continue
+                if any(
+                    (globs is None or globs.match(issue.filename))
+                    and compiled_re.match(issue.message)
+                    for compiled_re, globs in regexes
+                ):
+                    continue
+                kept.append(issue)
+            issues[tool] = kept
+
+        return issues
@@ -0,0 +1,224 @@
+"""Compact storage for large numbers of issues.
+
+A workspace scan can find hundreds of thousands of issues, and keeping each of them as
+an Issue holds a full set of strings per issue. The same file names, tool names and
+issue types repeat across many issues.
+
+An IssueStore interns every string once and keeps issues in columns backed by typed
+arrays, holding indices into the string table. It pickles as a few arrays and one list
+of strings, which keeps results small when they are sent back from worker processes.
+It is a sequence of Issue, so it can be used wherever a list of issues is read.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from statick_tool.issue import Issue
+
+# Index used for a cert_reference of None.
+NO_STRING = -1
+
+
+class IssueStore(Sequence[Issue]):
+    """Compact storage for large numbers of issues."""
+
+    STRING_FIELDS = ("filename", "tool", "issue_type", "message", "cert_reference")
+    # Type codes of the integer columns.
+    INT_FIELDS = {"line_number": "i", "severity": "b"}
+
+    def __init__(self, issues: Iterable[Issue] | None = None) -> None:
+        """Initialize the issue store.
+
+        Args:
+            issues: Issues to add to the store.
+        """
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        self.columns: dict[str, array[int]] = {
+            field: array("i") for field in self.STRING_FIELDS
+        }
+        self.columns.update(
+            {field: array(typecode) for field, typecode in self.INT_FIELDS.items()}
+        )
+        # Values that do not fit in their column, keyed by row and field.
+        self.other_values: dict[tuple[int, str], Any] = {}
+        if issues is not None:
+            self.extend(issues)
+
+    def intern(self, string: str | None) -> int:
+        """Get the index of a string in the string table, adding it if needed.
+
+        Args:
+            string: String to intern, or None.
+
+        Returns:
+            Index of the string, or NO_STRING for None.
+        """
+        if string is None:
+            return NO_STRING
+        string_id = self.string_ids.get(string)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(string)
+            self.string_ids[string] = string_id
+        return string_id
+
+    def append(self, issue: Issue) -> None:
+        """Add an issue to the end of the store.
+
+        Args:
+            issue: Issue to add.
+        """
+        row = len(self)
+        for field in self.STRING_FIELDS:
+            value = getattr(issue, field)
+            if value is not None and not isinstance(value, str):
+                self.other_values[(row, field)] = value
+                value = None
+            self.columns[field].append(self.intern(value))
+        for field in self.INT_FIELDS:
+            value = getattr(issue, field)
+            # Some tools report numbers as strings, which are kept as they are.
+            if type(value) is int:  # pylint: disable=unidiomatic-typecheck
+                try:
+                    self.columns[field].append(value)
+                    continue
+                except OverflowError:
+                    pass
+            self.other_values[(row, field)] = value
+            self.columns[field].append(0)
+
+    def extend(self, issues: Iterable[Issue]) -> None:
+        """Add issues to the end of the store.
+
+        Args:
+            issues: Issues to add, which can be another IssueStore.
+        """
+        if not isinstance(issues, IssueStore):
+            for issue in issues:
+                self.append(issue)
+            return
+
+        offset = len(self)
+        # Map the string table of the other store onto this one, once per string.
+        string_map = [self.intern(string) for string in issues.strings]
+        for field in self.STRING_FIELDS:
+            self.columns[field].extend(
+                NO_STRING if string_id == NO_STRING else string_map[string_id]
+                for string_id in issues.columns[field]
+            )
+        for field in self.INT_FIELDS:
+            self.columns[field].extend(issues.columns[field])
+        for (row, field), value in issues.other_values.items():
+            self.other_values[(offset + row, field)] = value
+
+    def get_issue(self, row: int) -> Issue:
+        """Get the issue at a row of the store.
+
+        Args:
+            row: Row of the issue, which must not be negative.
+
+        Returns:
+            The issue.
+        """
+        values: dict[str, Any] = {}
+        for field in self.STRING_FIELDS:
+            string_id = self.columns[field][row]
+            values[field] = None if string_id == NO_STRING else self.strings[string_id]
+        for field in self.INT_FIELDS:
+            values[field] = self.columns[field][row]
+        if self.other_values:
+            for field in self.STRING_FIELDS + tuple(self.INT_FIELDS):
+                if (row, field) in self.other_values:
+                    values[field] = self.other_values[(row, field)]
+        return Issue(**values)
+
+    def __len__(self) -> int:
+        """Get the number of issues in the store.
+
+        Returns:
+            Number of issues.
+        """
+        return len(self.columns["line_number"])
+
+    @overload
+    def __getitem__(self, index: int) -> Issue: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Issue]: ...
+
+    def __getitem__(self, index: int | slice) -> Issue | list[Issue]:
+        """Get an issue, or a list of issues for a slice.
+
+        Args:
+            index: Index or slice of the issues.
+
+        Returns:
+            The issue, or a list of issues.
+
+        Raises:
+            IndexError: The index is out of range.
+        """
+        if isinstance(index, slice):
+            return [self.get_issue(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("issue index out of range")
+        return self.get_issue(index)
+
+    def __iter__(self) -> Iterator[Issue]:
+        """Iterate over the issues in the store.
+
+        Yields:
+            Each issue, in the order they were added.
+        """
+        for row in range(len(self)):
+            yield self.get_issue(row)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the issues in the store with another sequence of issues.
+
+        Args:
+            other: Sequence to compare with.
+
+        Returns:
+            True if both hold the same issues in the same order.
+        """
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            issue == other_issue for issue, other_issue in zip(self, other)
+        )
+
+    def __repr__(self) -> str:
+        """Get a representation of the store.
+
+        Returns:
+            Representation listing the issues.
+        """
+        return f"IssueStore({list(self)!r})"
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle, leaving out the index of the string table.
+
+        Returns:
+            State of the store.
+        """
+        return {
+            "strings": self.strings,
+            "columns": self.columns,
+            "other_values": self.other_values,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore a pickled store, rebuilding the index of the string table.
+
+        Args:
+            state: State of the store.
+        """
+        self.strings = state["strings"]
+        self.columns = state["columns"]
+        self.other_values = state["other_values"]
+        self.string_ids = {string: index for index, string in enumerate(self.strings)}
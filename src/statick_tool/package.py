@@ -1,5 +1,7 @@
 """Package interface."""
 
+import os
+
 
 class Package(dict):  # type: ignore
     """Default implementation of package interface."""
@@ -17,3 +19,19 @@ class Package(dict):  # type: ignore
         self.path = path
         self.files: dict[str, dict[str, str]] = {}
         self._walked = False
+        self.changed_files: set[str] | None = None
+
+    def get_changed_files(self, files: list[str]) -> list[str]:
+        """Get the files that changed when only changed files are scanned.
+
+        Args:
+            files: Paths of files to check.
+
+        Returns:
+            Paths of files that changed, or all files if every file is scanned.
+        """
+        if self.changed_files is None:
+            return files
+        return [
+            fname for fname in files if os.path.abspath(fname) in self.changed_files
+        ]
@@ -0,0 +1,127 @@
+"""Order packages in a workspace so that the longest scans start first.
+
+When packages are scanned in parallel, a long package that starts last decides when
+the whole workspace is done. Starting the longest packages first keeps every process
+busy until the end.
+
+How long a package takes is estimated from the durations of earlier runs, kept in the
+cache directory. Packages without a recorded duration are estimated from the number of
+entries in their directory, as listed when the workspace was walked, and are scheduled
+before the others, so that their duration is known for the next run.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from statick_tool.package import Package
+
+
+class PackageScheduler:
+    """Order packages in a workspace so that the longest scans start first."""
+
+    CACHE_FILE_NAME = "package_durations.json"
+
+    def __init__(self, cache_dir: str | None = None) -> None:
+        """Initialize the package scheduler.
+
+        Args:
+            cache_dir: Directory to keep package durations in between runs, or None to
+                only estimate durations from package sizes.
+        """
+        self.cache_file: str | None = None
+        if cache_dir is not None:
+            self.cache_file = os.path.join(
+                os.path.abspath(cache_dir), self.CACHE_FILE_NAME
+            )
+        self.durations: dict[str, float] = self.load_durations()
+
+    @staticmethod
+    def get_key(package: Package) -> str:
+        """Get the key used to keep the duration of a package.
+
+        Args:
+            package: Package to get the key for.
+
+        Returns:
+            Absolute path of the package.
+        """
+        return os.path.abspath(package.path)
+
+    def load_durations(self) -> dict[str, float]:
+        """Load package durations kept on disk.
+
+        Returns:
+            Durations in seconds keyed by package path.
+        """
+        if self.cache_file is None:
+            return {}
+        try:
+            with open(self.cache_file, encoding="utf8") as fid:
+                durations = json.load(fid)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(durations, dict):
+            return {}
+        return {
+            key: float(value)
+            for key, value in durations.items()
+            if isinstance(value, (int, float))
+        }
+
+    def save_durations(self) -> None:
+        """Keep package durations on disk for the next run."""
+        if self.cache_file is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_file))
+            with os.fdopen(fd, "w", encoding="utf8") as fid:
+                json.dump(self.durations, fid, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as ex:
+            logging.warning(
+                "Unable to write package durations %s: %s", self.cache_file, ex
+            )
+
+    def record(self, package: Package, duration: float) -> None:
+        """Record how long a package took to scan.
+
+        Args:
+            package: Package that was scanned.
+            duration: Duration of the scan in seconds.
+        """
+        self.durations[self.get_key(package)] = duration
+
+    def get_order(
+        self, packages: list[Package], sizes: dict[str, int] | None = None
+    ) -> list[Package]:
+        """Order packages so that the longest scans start first.
+
+        Packages without a recorded duration come first, largest first, followed by
+        the other packages, longest first. Ties keep the original order.
+
+        Args:
+            packages: Packages to order.
+            sizes: Estimated size of each package keyed by package path, such as the
+                number of entries in its directory.
+
+        Returns:
+            Packages in the order they should be scanned.
+        """
+        if sizes is None:
+            sizes = {}
+        unknown = [
+            package
+            for package in packages
+            if self.get_key(package) not in self.durations
+        ]
+        known = [
+            package for package in packages if self.get_key(package) in self.durations
+        ]
+        unknown.sort(key=lambda package: sizes.get(package.path, 0), reverse=True)
+        known.sort(
+            key=lambda package: self.durations[self.get_key(package)], reverse=True
+        )
+        return unknown + known
@@ -0,0 +1,429 @@
+"""Index of the plugins of an entry point group, loaded when they are first used.
+
+Importing every plugin pulls in the third-party modules of every tool, even when the
+selected level only runs a few of them. The index only knows the names of the plugins
+until one of them is used.
+
+Command line arguments of the plugins that come with Statick are declared in a file
+installed with it, keyed by entry point, so that building the argument parser does
+not have to load them. Arguments of other plugins can be kept on disk between runs. Arguments are keyed by the
+entry point and the modification time and size of the plugin module, so changing a
+plugin invalidates its entry.
+
+The entry points themselves can be kept on disk as well, as reading the metadata of
+every installed package is slow. They are keyed by the import search path and the
+modification times of its directories, which change when packages are installed or
+removed.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Iterator, MutableMapping
+from typing import Any
+
+
+class ArgumentRecorder:
+    """Record the arguments a plugin adds to an argument parser.
+
+    Only add_argument and set_defaults are recorded. Plugins that use other parts of
+    the argument parser are given the argument parser itself.
+    """
+
+    ARGUMENT_TYPES = {"str": str, "int": int, "float": float}
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def add_argument(self, *args: Any, **kwargs: Any) -> None:
+        """Record an argument.
+
+        Args:
+            args: Names or flags of the argument.
+            kwargs: Options of the argument.
+        """
+        self.calls.append(("add_argument", args, kwargs))
+
+    def set_defaults(self, **kwargs: Any) -> None:
+        """Record default values of arguments.
+
+        Args:
+            kwargs: Default value of each argument.
+        """
+        self.calls.append(("set_defaults", (), kwargs))
+
+    def get_declarations(self) -> list[Any] | None:
+        """Get the recorded arguments in a form that can be written as JSON.
+
+        Returns:
+            Parser method, names and options of each recorded call, or None if an
+            option can not be written as JSON.
+        """
+        declarations: list[Any] = []
+        for method, args, kwargs in self.calls:
+            options = dict(kwargs)
+            if method == "add_argument" and "type" in options:
+                type_names = [
+                    name
+                    for name, arg_type in self.ARGUMENT_TYPES.items()
+                    if options["type"] is arg_type
+                ]
+                if not type_names:
+                    return None
+                options["type"] = type_names[0]
+            try:
+                json.dumps([args, options])
+            except (TypeError, ValueError):
+                return None
+            declarations.append([method, list(args), options])
+        return declarations
+
+    @classmethod
+    def add_declarations(
+        cls, parser: argparse.ArgumentParser, declarations: list[Any]
+    ) -> None:
+        """Add recorded arguments to an argument parser.
+
+        Args:
+            parser: Argument parser to add the arguments to.
+            declarations: Arguments from get_declarations.
+        """
+        for method, args, options in declarations:
+            options = dict(options)
+            if method == "set_defaults":
+                parser.set_defaults(**options)
+                continue
+            if "type" in options:
+                options["type"] = cls.ARGUMENT_TYPES[options["type"]]
+            parser.add_argument(*args, **options)
+
+
+class PluginIndex(MutableMapping[str, Any]):
+    """Plugins of an entry point group, loaded when they are first used."""
+
+    ARGUMENTS_FILE_NAME = "plugin_arguments.json"
+    ENTRY_POINTS_FILE_NAME = "entry_points.json"
+    DECLARED_ARGUMENTS_DIR = os.path.join(os.path.dirname(__file__), "rsc")
+
+    def __init__(self, group: str, entry_points: dict[str, str] | None = None) -> None:
+        """Find the plugins of an entry point group without loading them.
+
+        Args:
+            group: Entry point group of the plugins.
+            entry_points: Entry point of each plugin, as found by find_entry_points.
+                The installed entry points of the group are used if not given.
+        """
+        self.group = group
+        if entry_points is None:
+            entry_points = self.find_entry_points([group])[group]
+        self.entry_points = dict(entry_points)
+        self.names: list[str] = list(self.entry_points)
+        self.plugins: dict[str, Any] = {}
+
+    @staticmethod
+    def load_entry_point(entry_point: str) -> Any:
+        """Import the object an entry point refers to.
+
+        Args:
+            entry_point: Entry point in the form module:attribute, optionally followed
+                by extras in brackets.
+
+        Returns:
+            The object the entry point refers to.
+        """
+        module_name, _, attrs = entry_point.split("[")[0].partition(":")
+        plugin = importlib.import_module(module_name.strip())
+        for attr in attrs.strip().split("."):
+            if attr:
+                plugin = getattr(plugin, attr)
+        return plugin
+
+    @staticmethod
+    def get_search_path_key() -> list[Any]:
+        """Get a key that changes whenever packages are installed or removed.
+
+        Returns:
+            Each directory of the import search path and its modification time.
+        """
+        key: list[Any] = []
+        for path in sys.path:
+            try:
+                key.append([path, os.stat(path or os.curdir).st_mtime_ns])
+            except OSError:
+                key.append([path, None])
+        return key
+
+    @classmethod
+    def find_entry_points(
+        cls, groups: list[str], cache_dir: str | None = None
+    ) -> dict[str, dict[str, str]]:
+        """Find the installed entry points of plugin groups.
+
+        Args:
+            groups: Entry point groups to find.
+            cache_dir: Directory to keep the entry points in between runs.
+
+        Returns:
+            Entry point of each plugin in each group, keyed by group and plugin name.
+        """
+        key = cls.get_search_path_key()
+        if cache_dir is not None:
+            cached = cls.read_cache_file(cache_dir, cls.ENTRY_POINTS_FILE_NAME)
+            if (
+                isinstance(cached, dict)
+                and cached.get("key") == key
+                and isinstance(cached.get("groups"), dict)
+                and all(group in cached["groups"] for group in groups)
+            ):
+                return {group: cached["groups"][group] for group in groups}
+
+        # Reading package metadata is slow to import, so it is only imported when the
+        # entry points are not cached.
+        # pylint: disable=import-outside-toplevel
+        if sys.version_info < (3, 10):
+            from importlib_metadata import entry_points
+        else:
+            from importlib.metadata import entry_points
+        # pylint: enable=import-outside-toplevel
+
+        found = {
+            group: {
+                plugin_type.name: plugin_type.value
+                for plugin_type in entry_points(group=group)
+            }
+            for group in groups
+        }
+        if cache_dir is not None:
+            cls.write_cache_file(
+                cache_dir, cls.ENTRY_POINTS_FILE_NAME, {"key": key, "groups": found}
+            )
+        return found
+
+    def __getitem__(self, name: str) -> Any:
+        """Get a plugin, loading it if it is not loaded yet.
+
+        Args:
+            name: Name of the plugin.
+
+        Returns:
+            The plugin.
+
+        Raises:
+            KeyError: If there is no plugin with that name.
+        """
+        if name not in self.plugins:
+            if name not in self.entry_points:
+                raise KeyError(name)
+            plugin = self.load_entry_point(self.entry_points[name])
+            self.plugins[name] = plugin()
+        return self.plugins[name]
+
+    def __setitem__(self, name: str, plugin: Any) -> None:
+        """Add a plugin that is already loaded.
+
+        Args:
+            name: Name of the plugin.
+            plugin: The plugin.
+        """
+        if name not in self.names:
+            self.names.append(name)
+        self.plugins[name] = plugin
+
+    def __delitem__(self, name: str) -> None:
+        """Remove a plugin.
+
+        Args:
+            name: Name of the plugin.
+
+        Raises:
+            KeyError: If there is no plugin with that name.
+        """
+        if name not in self.names:
+            raise KeyError(name)
+        self.names.remove(name)
+        self.plugins.pop(name, None)
+        self.entry_points.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        """Check if there is a plugin with a name, without loading it.
+
+        Args:
+            name: Name of the plugin.
+
+        Returns:
+            True if there is a plugin with that name, False otherwise.
+        """
+        return name in self.names
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the plugins, without loading them.
+
+        Returns:
+            Iterator over the names of the plugins.
+        """
+        return iter(list(self.names))
+
+    def __len__(self) -> int:
+        """Get the number of plugins.
+
+        Returns:
+            Number of plugins.
+        """
+        return len(self.names)
+
+    def is_loaded(self, name: str) -> bool:
+        """Check if a plugin has been loaded.
+
+        Args:
+            name: Name of the plugin.
+
+        Returns:
+            True if the plugin is loaded, False otherwise.
+        """
+        return name in self.plugins
+
+    def get_module_key(self, name: str) -> str | None:
+        """Get a key that changes whenever the module of a plugin changes.
+
+        Args:
+            name: Name of the plugin.
+
+        Returns:
+            Entry point, modification time and size of the plugin module, or None if
+            the plugin is not loaded from an entry point or its module can not be
+            found.
+        """
+        if name not in self.entry_points:
+            return None
+        entry_point = self.entry_points[name]
+        try:
+            spec = importlib.util.find_spec(entry_point.split(":")[0].strip())
+            if spec is None or spec.origin is None:
+                return None
+            stat = os.stat(spec.origin)
+        except (ImportError, OSError, ValueError):
+            return None
+        return f"{entry_point}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def gather_args(
+        self,
+        args: argparse.ArgumentParser,
+        arguments: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Add the arguments of every plugin to an argument parser.
+
+        Plugins whose arguments are known, from an earlier run or from the arguments
+        declared for the plugins that come with Statick, are not loaded.
+
+        Args:
+            args: Argument parser that arguments will be added to.
+            arguments: Arguments of plugins from an earlier run, keyed by module key.
+
+        Returns:
+            Arguments of the plugins, keyed by module key.
+        """
+        if arguments is None:
+            arguments = {}
+        declared = self.load_declared_arguments()
+        plugin_arguments: dict[str, Any] = {}
+        for name in self.names:
+            key = self.get_module_key(name)
+            if key is not None and key in arguments:
+                declarations = arguments[key]
+            elif self.entry_points.get(name) in declared:
+                declarations = declared[self.entry_points[name]]
+            else:
+                recorder = ArgumentRecorder()
+                try:
+                    self[name].gather_args(recorder)
+                    declarations = recorder.get_declarations()
+                except AttributeError:
+                    declarations = None
+                if declarations is None:
+                    self[name].gather_args(args)
+                    continue
+            if key is not None:
+                plugin_arguments[key] = declarations
+            ArgumentRecorder.add_declarations(args, declarations)
+        return plugin_arguments
+
+    @classmethod
+    def load_declared_arguments(cls) -> dict[str, Any]:
+        """Load the arguments declared for the plugins that come with Statick.
+
+        Returns:
+            Arguments of plugins, keyed by entry point.
+        """
+        arguments = cls.read_cache_file(
+            cls.DECLARED_ARGUMENTS_DIR, cls.ARGUMENTS_FILE_NAME
+        )
+        if not isinstance(arguments, dict):
+            return {}
+        return arguments
+
+    @classmethod
+    def load_arguments(cls, cache_dir: str) -> dict[str, Any]:
+        """Load the arguments of plugins kept on disk.
+
+        Args:
+            cache_dir: Directory the arguments are kept in.
+
+        Returns:
+            Arguments of plugins, keyed by module key.
+        """
+        arguments = cls.read_cache_file(cache_dir, cls.ARGUMENTS_FILE_NAME)
+        if not isinstance(arguments, dict):
+            return {}
+        return arguments
+
+    @classmethod
+    def store_arguments(cls, cache_dir: str, arguments: dict[str, Any]) -> None:
+        """Keep the arguments of plugins on disk.
+
+        Args:
+            cache_dir: Directory to keep the arguments in.
+            arguments: Arguments of plugins, keyed by module key.
+        """
+        cls.write_cache_file(cache_dir, cls.ARGUMENTS_FILE_NAME, arguments)
+
+    @staticmethod
+    def read_cache_file(cache_dir: str, file_name: str) -> Any:
+        """Read a file kept in the cache directory.
+
+        Args:
+            cache_dir: Directory the file is kept in.
+            file_name: Name of the file.
+
+        Returns:
+            Contents of the file, or None if it can not be read.
+        """
+        try:
+            with open(os.path.join(cache_dir, file_name), encoding="utf8") as fid:
+                return json.load(fid)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def write_cache_file(cache_dir: str, file_name: str, contents: Any) -> None:
+        """Write a file to the cache directory.
+
+        Args:
+            cache_dir: Directory to keep the file in.
+            file_name: Name of the file.
+            contents: Contents of the file.
+        """
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Other processes may read the file at the same time.
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, "w", encoding="utf8") as fid:
+                json.dump(contents, fid)
+            os.replace(tmp_path, os.path.join(cache_dir, file_name))
+        except OSError as ex:
+            logging.warning("Unable to write %s in %s: %s", file_name, cache_dir, ex)
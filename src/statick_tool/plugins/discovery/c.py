@@ -33,7 +33,7 @@ class CDiscoveryPlugin(DiscoveryPlugin):
         c_extensions = (".c", ".cc", ".cpp", ".cxx", ".h", ".hxx", ".hpp")
         c_output = ("c source", "c program", "c++ source")
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(c_extensions):
@@ -68,7 +68,7 @@ class CMakeDiscoveryPlugin(DiscoveryPlugin):
 
         package["cmake_src"] = []
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             # Check for all lower-case file name since that is how they are stored.
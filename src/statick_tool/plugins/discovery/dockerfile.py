@@ -32,7 +32,7 @@ class DockerfileDiscoveryPlugin(DiscoveryPlugin):
         src_files: list[str] = []
         yaml_extensions = (".yaml", ".yml")
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].startswith("dockerfile") and not file_dict[
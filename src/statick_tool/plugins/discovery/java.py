@@ -32,7 +32,7 @@ class JavaDiscoveryPlugin(DiscoveryPlugin):
         java_src_files: list[str] = []
         java_class_files: list[str] = []
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(".java"):
@@ -31,7 +31,7 @@ class MarkdownDiscoveryPlugin(DiscoveryPlugin):
         """
         src_files: list[str] = []
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(".md"):
@@ -30,7 +30,7 @@ class PDDLDiscoveryPlugin(DiscoveryPlugin):
         """
         pddl_files: list[str] = []
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(".pddl"):
@@ -5,8 +5,6 @@ import os
 from functools import reduce
 from typing import Any
 
-import xmltodict
-
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
 from statick_tool.package import Package
@@ -85,6 +83,8 @@ class RosDiscoveryPlugin(DiscoveryPlugin):
                             )
                 package["is_ros2"] = True
         elif os.path.isfile(package_file) and ros_version is not None:
+            import xmltodict  # pylint: disable=import-outside-toplevel
+
             with open(package_file, encoding="utf8") as fconfig:
                 try:
                     output = xmltodict.parse(fconfig.read())
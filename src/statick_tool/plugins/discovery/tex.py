@@ -34,7 +34,7 @@ class TexDiscoveryPlugin(DiscoveryPlugin):
         tex_ignore_extensions = (".sty", ".log", ".cls")
         tex_output = ["latex document", "bibtex text file", "latex 2e document"]
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(tex_extensions):
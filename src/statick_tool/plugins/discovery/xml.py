@@ -32,7 +32,7 @@ class XMLDiscoveryPlugin(DiscoveryPlugin):
         xml_files: list[str] = []
         xml_extensions: tuple[str, str] = (".xml", ".launch")
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(xml_extensions):
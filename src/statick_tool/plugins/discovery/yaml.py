@@ -31,7 +31,7 @@ class YAMLDiscoveryPlugin(DiscoveryPlugin):
         yaml_files: list[str] = []
         yaml_extensions = (".yaml", ".yml")
 
-        self.find_files(package)
+        self.find_files(package, exceptions)
 
         for file_dict in package.files.values():
             if file_dict["name"].endswith(yaml_extensions):
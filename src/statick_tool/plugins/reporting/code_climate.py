@@ -5,6 +5,7 @@ import json
 import logging
 import os
 from collections import OrderedDict
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from statick_tool.issue import Issue
@@ -20,7 +21,7 @@ class CodeClimateReportingPlugin(ReportingPlugin):
         return "code_climate"
 
     def report(
-        self, package: Package, issues: dict[str, list[Issue]], level: str
+        self, package: Package, issues: Mapping[str, Sequence[Issue]], level: str
     ) -> tuple[None, bool]:
         """Go through the issues list and print them in JSON format.
 
@@ -1,5 +1,7 @@
 """Do nothing to have a default reporting plugin with no side effects."""
 
+from collections.abc import Mapping, Sequence
+
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.reporting_plugin import ReportingPlugin
@@ -13,7 +15,7 @@ class DoNothingReportingPlugin(ReportingPlugin):
         return "do_nothing"
 
     def report(
-        self, package: Package, issues: dict[str, list[Issue]], level: str
+        self, package: Package, issues: Mapping[str, Sequence[Issue]], level: str
     ) -> tuple[None, bool]:
         """Do nothing.
 
@@ -3,7 +3,10 @@
 import json
 import logging
 import os
+import sys
 from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import IO
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -13,12 +16,18 @@ from statick_tool.reporting_plugin import ReportingPlugin
 class JsonReportingPlugin(ReportingPlugin):
     """Prints the Statick reports out to the terminal or file in JSON format."""
 
+    # Issues are encoded one at a time as they are written, so the report is never
+    # held in memory as a whole.
+    ENCODER = json.JSONEncoder()
+    FORMATS = {"json": ".statick.json", "ndjson": ".statick.ndjson"}
+    BUFFER_SIZE = 1024 * 1024
+
     def get_name(self) -> str:
         """Return the plugin name."""
         return "json"
 
     def report(
-        self, package: Package, issues: dict[str, list[Issue]], level: str
+        self, package: Package, issues: Mapping[str, Sequence[Issue]], level: str
     ) -> tuple[None, bool]:
         """Go through the issues list and print them in JSON format.
 
@@ -46,43 +55,116 @@ class JsonReportingPlugin(ReportingPlugin):
         )
         if terminal_output_str and terminal_output_str.lower() == "true":
             terminal_output = True
-
-        all_issues = []
-        for _, value in issues.items():
-            for issue in value:
-                issue_dict: OrderedDict[str, str | int] = OrderedDict()
-                issue_dict["fileName"] = issue.filename
-                issue_dict["lineNumber"] = issue.line_number
-                issue_dict["tool"] = issue.tool
-                issue_dict["type"] = issue.issue_type
-                issue_dict["severity"] = issue.severity
-                issue_dict["message"] = issue.message
-                issue_dict["certReference"] = ""
-                if issue.cert_reference:
-                    issue_dict["certReference"] = issue.cert_reference
-                all_issues.append(issue_dict)
-        report_json = {"issues": all_issues}
-        line = json.dumps(report_json)
+        output_format = self.get_format(level)
 
         if file_output:
-            if not self.write_output(package, level, line):
+            output_file = self.get_output_file(package, level, output_format)
+            if output_file is None:
                 return None, False
+            logging.info("Writing output to %s", output_file)
+            with open(
+                output_file, "w", encoding="utf8", buffering=self.BUFFER_SIZE
+            ) as out:
+                self.write_issues(out, issues, output_format)
 
         if terminal_output:
-            print(line)
+            self.write_issues(sys.stdout, issues, output_format)
+            if output_format == "json":
+                sys.stdout.write("\n")
 
         return None, True
 
-    def write_output(self, package: Package, level: str, line: str) -> bool:
-        """Write JSON output to a file.
+    def get_format(self, level: str) -> str:
+        """Get the format of the report.
+
+        The format is `json` for a single JSON object holding a list of all issues, or
+        `ndjson` for one JSON object per issue on each line.
+
+        Args:
+            level: Name of the level used in the scan.
+
+        Returns:
+            Format of the report.
+        """
+        if not self.plugin_context or not self.plugin_context.config:
+            return "json"
+        output_format = self.plugin_context.config.get_reporting_config(
+            self.get_name(), level, "format"
+        )
+        if output_format is None:
+            return "json"
+        if output_format.lower() not in self.FORMATS:
+            logging.warning(
+                "Unknown %s report format %s, using json.",
+                self.get_name(),
+                output_format,
+            )
+            return "json"
+        return str(output_format.lower())
+
+    @staticmethod
+    def get_issue_dict(issue: Issue) -> OrderedDict[str, str | int]:
+        """Convert an issue to the dictionary written to the report.
+
+        Args:
+            issue: Issue to convert.
+
+        Returns:
+            Fields of the issue, in report order.
+        """
+        issue_dict: OrderedDict[str, str | int] = OrderedDict()
+        issue_dict["fileName"] = issue.filename
+        issue_dict["lineNumber"] = issue.line_number
+        issue_dict["tool"] = issue.tool
+        issue_dict["type"] = issue.issue_type
+        issue_dict["severity"] = issue.severity
+        issue_dict["message"] = issue.message
+        issue_dict["certReference"] = ""
+        if issue.cert_reference:
+            issue_dict["certReference"] = issue.cert_reference
+        return issue_dict
+
+    def write_issues(
+        self, out: IO[str], issues: Mapping[str, Sequence[Issue]], output_format: str
+    ) -> None:
+        """Write issues to a stream as they are encoded.
+
+        The `json` format is the same as encoding {"issues": [...]} at once.
+
+        Args:
+            out: Stream to write to.
+            issues: The issues found by the Statick analysis,
+                    keyed by the tool that found them.
+            output_format: Format of the report, `json` or `ndjson`.
+        """
+        if output_format == "ndjson":
+            for value in issues.values():
+                for issue in value:
+                    out.write(self.ENCODER.encode(self.get_issue_dict(issue)))
+                    out.write("\n")
+            return
+
+        out.write('{"issues": [')
+        separator = ""
+        for value in issues.values():
+            for issue in value:
+                out.write(separator)
+                out.write(self.ENCODER.encode(self.get_issue_dict(issue)))
+                separator = ", "
+        out.write("]}")
+
+    def get_output_file(
+        self, package: Package, level: str, output_format: str = "json"
+    ) -> str | None:
+        """Get the file to write the report to, creating its directory if needed.
 
         Args:
             package: The Package object that was analyzed.
             level: Name of the level used in the scan.
-            line: The JSON string to write to the file.
+            output_format: Format of the report, `json` or `ndjson`.
 
         Returns:
-            True if the output was successfully written, otherwise False.
+            Path of the report file, or None if its directory can not be created.
         """
         # By default write report to the current directory.
         output_dir = os.getcwd()
@@ -100,11 +182,27 @@ class JsonReportingPlugin(ReportingPlugin):
             os.mkdir(output_dir)
         if not os.path.isdir(output_dir):
             logging.error("Unable to create output directory at %s!", output_dir)
-            return False
+            return None
 
-        output_file = os.path.join(
-            output_dir, package.name + "-" + level + ".statick.json"
+        return os.path.join(
+            output_dir, package.name + "-" + level + self.FORMATS[output_format]
         )
+
+    def write_output(self, package: Package, level: str, line: str) -> bool:
+        """Write JSON output to a file.
+
+        Args:
+            package: The Package object that was analyzed.
+            level: Name of the level used in the scan.
+            line: The JSON string to write to the file.
+
+        Returns:
+            True if the output was successfully written, otherwise False.
+        """
+        output_file = self.get_output_file(package, level)
+        if output_file is None:
+            return False
+
         logging.info("Writing output to %s", output_file)
         with open(output_file, "w", encoding="utf8") as out:
             out.write(line)
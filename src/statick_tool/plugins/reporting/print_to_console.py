@@ -1,6 +1,7 @@
 """Write issue reports to the console."""
 
 from collections import OrderedDict
+from collections.abc import Mapping, Sequence
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -15,7 +16,7 @@ class PrintToConsoleReportingPlugin(ReportingPlugin):
         return "print_to_console"
 
     def report(
-        self, package: Package, issues: dict[str, list[Issue]], level: str
+        self, package: Package, issues: Mapping[str, Sequence[Issue]], level: str
     ) -> tuple[None, bool]:
         """Go through the issues list and print them to the console.
 
@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+from collections.abc import Mapping, Sequence
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -17,7 +18,7 @@ class WriteJenkinsWarningsNGReportingPlugin(ReportingPlugin):
         return "write_jenkins_warnings_ng"
 
     def report(
-        self, package: Package, issues: dict[str, list[Issue]], level: str
+        self, package: Package, issues: Mapping[str, Sequence[Issue]], level: str
     ) -> tuple[None, bool]:
         """Write the results to Jenkins Warnings-NG plugin compatible file.
 
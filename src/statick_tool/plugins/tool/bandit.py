@@ -76,10 +76,8 @@ class BanditToolPlugin(ToolPlugin):
         flags += user_flags
 
         try:
-            output = subprocess.check_output(
-                [bandit_bin] + flags + files,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
+            output = self.check_output_batched(
+                [bandit_bin] + flags, files, shards=self.get_shards(level)
             )
 
         except subprocess.CalledProcessError as ex:
@@ -121,6 +119,15 @@ class BanditToolPlugin(ToolPlugin):
                 break
             output_minus_log.remove(line)
 
+        # Output from several shards holds more log messages and CSV headers.
+        if output_minus_log:
+            header = output_minus_log[0]
+            output_minus_log = [header] + [
+                line
+                for line in output_minus_log[1:]
+                if line != header and not line.startswith("[")
+            ]
+
         csvreader = csv.DictReader(output_minus_log)
         for csv_line in csvreader:
             severity = 1
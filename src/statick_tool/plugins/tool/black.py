@@ -21,6 +21,24 @@ class BlackToolPlugin(ToolPlugin):
         """
         return "black"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, black results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return ["pyproject.toml"]
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -50,10 +68,7 @@ class BlackToolPlugin(ToolPlugin):
 
         tool_bin = self.get_binary()
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
-            )
+            output = self.check_output_batched([tool_bin] + flags, files)
 
         except subprocess.CalledProcessError as ex:
             # Return code 123 means there was an internal error
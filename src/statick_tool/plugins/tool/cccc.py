@@ -109,16 +109,33 @@ class CCCCToolPlugin(ToolPlugin):
 
         issues: list[Issue] = []
 
+        # Files are scanned at the same time, so files with the same name need their
+        # own output directories.
+        tool_output_dirs: dict[str, str] = {}
+        used_output_dirs: set[str] = set()
         for src in package["c_src"]:
-            tool_output_dir: str = ".cccc-" + Path(src).name
-            opts.append("--outdir=" + tool_output_dir)
-
+            if src in tool_output_dirs:
+                continue
+            tool_output_dir = ".cccc-" + Path(src).name
+            suffix = 1
+            while tool_output_dir in used_output_dirs:
+                suffix += 1
+                tool_output_dir = f".cccc-{Path(src).name}-{suffix}"
+            tool_output_dirs[src] = tool_output_dir
+            used_output_dirs.add(tool_output_dir)
+
+        def run_cccc(src: str) -> bytes:
+            """Run cccc on a single file."""
+            subproc_args: list[str] = (
+                [cccc_bin] + opts + ["--outdir=" + tool_output_dirs[src], src]
+            )
+            logging.debug(" ".join(subproc_args))
+            return subprocess.check_output(subproc_args, stderr=subprocess.STDOUT)
+
+        for src, result in self.run_per_file(run_cccc, package["c_src"]):
+            tool_output_dir = tool_output_dirs[src]
             try:
-                subproc_args: list[str] = [cccc_bin] + opts + [src]
-                logging.debug(" ".join(subproc_args))
-                log_output: bytes = subprocess.check_output(
-                    subproc_args, stderr=subprocess.STDOUT
-                )
+                log_output: bytes = result.result()
             except subprocess.CalledProcessError as ex:
                 if ex.returncode == 1:
                     log_output = ex.output
@@ -113,6 +113,7 @@ class ClangFormatToolPlugin(ToolPlugin):
                 files += target["src"]
         if "headers" in package:
             files += package["headers"]
+        files = package.get_changed_files(files)
 
         check: bool | None = self.check_configuration(clang_format_bin)
         if check is None:
@@ -122,13 +123,17 @@ class ClangFormatToolPlugin(ToolPlugin):
 
         total_output: list[str] = []
 
+        def format_file(src: str) -> str:
+            """Run clang-format on a single file."""
+            return subprocess.check_output(
+                [clang_format_bin, src, "-output-replacements-xml"],
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+
         try:
-            for src in files:
-                output = subprocess.check_output(
-                    [clang_format_bin, src, "-output-replacements-xml"],
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                )
+            for src, result in self.run_per_file(format_file, files):
+                output = result.result()
                 if (
                     not self.plugin_context
                     or not self.plugin_context.args.clang_format_issue_per_line
@@ -1,7 +1,9 @@
 """Apply clang-tidy tool and gather results."""
 
 import argparse
+import json
 import logging
+import os
 import re
 import subprocess
 from typing import Match, Pattern
@@ -14,6 +16,10 @@ from statick_tool.tool_plugin import ToolPlugin
 class ClangTidyToolPlugin(ToolPlugin):
     """Apply clang-tidy tool and gather results."""
 
+    PARSE_RE: Pattern[str] = re.compile(
+        r"^(.+):(\d+):(\d+):[^\S\n](.+):[^\S\n](.+)[^\S\n]\[(.+)\]", re.MULTILINE
+    )
+
     def get_name(self) -> str:
         """Get name of tool.
 
@@ -44,6 +50,33 @@ class ClangTidyToolPlugin(ToolPlugin):
             help="clang-tidy binary path",
         )
 
+    @staticmethod
+    def get_translation_units(compile_commands: str, files: list[str]) -> list[str]:
+        """Get the files that have an entry in a compilation database.
+
+        Other files, such as headers listed as sources of a target, are only checked
+        as part of the translation units that include them.
+
+        Args:
+            compile_commands: Path to compile_commands.json.
+            files: Files to check.
+
+        Returns:
+            Files with an entry in the compilation database, or all of the files if
+            the database can not be read.
+        """
+        try:
+            with open(compile_commands, encoding="utf8") as fid:
+                entries = json.load(fid)
+            units = {
+                os.path.normpath(os.path.join(entry["directory"], entry["file"]))
+                for entry in entries
+            }
+        except (OSError, ValueError, TypeError, KeyError) as ex:
+            logging.warning("Unable to read %s: %s", compile_commands, ex)
+            return files
+        return [src for src in files if os.path.normpath(os.path.abspath(src)) in units]
+
     def scan(self, package: Package, level: str) -> list[Issue] | None:
         """Run tool and gather output.
 
@@ -89,19 +122,44 @@ class ClangTidyToolPlugin(ToolPlugin):
         if "make_targets" in package:
             for target in package["make_targets"]:
                 files += target["src"]
+        files = package.get_changed_files(files)
+        if package.changed_files is not None and not files:
+            return []
 
-        try:
-            output = subprocess.check_output(
-                [clang_tidy_bin] + flags + files,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
+        # Like run-clang-tidy, translation units are spread across several runs of
+        # clang-tidy, which each check their files one after another.
+        shards = self.get_shards(level)
+        if shards > 1:
+            files = self.get_translation_units(
+                package["bin_dir"] + "/compile_commands.json", files
             )
-            if (
-                "clang-diagnostic-error" in output
-            ):  # pylint: disable=unsupported-membership-test
-                raise subprocess.CalledProcessError(-1, clang_tidy_bin, output)
+            if not files:
+                return []
+
+        # Load the plugin mapping if possible
+        warnings_mapping = self.load_mapping()
+
+        # The output can be very large, so it is parsed as it is read. Diagnostics in
+        # headers are reported for every translation unit that includes them, so they
+        # are only kept once.
+        issues: list[Issue] = []
+        seen: set[Issue] = set()
+        diagnostic_errors: list[str] = []
+        try:
+            for line in self.stream_output_batched(
+                [clang_tidy_bin] + flags, files, self.get_log_file(), shards=shards
+            ):
+                if "clang-diagnostic-error" in line:
+                    diagnostic_errors.append(line)
+                issue = self.parse_line(line, warnings_mapping)
+                if issue is not None and issue not in seen:
+                    seen.add(issue)
+                    issues.append(issue)
+            if diagnostic_errors:
+                raise subprocess.CalledProcessError(
+                    -1, clang_tidy_bin, "\n".join(diagnostic_errors)
+                )
         except subprocess.CalledProcessError as ex:
-            output = ex.output
             if ex.returncode != 1:
                 logging.warning("clang-tidy failed! Returncode = %d", ex.returncode)
                 logging.warning("%s exception: %s", self.get_name(), ex.output)
@@ -111,13 +169,6 @@ class ClangTidyToolPlugin(ToolPlugin):
             logging.warning("Couldn't find %s! (%s)", clang_tidy_bin, ex)
             return None
 
-        logging.debug("%s", output)
-
-        if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
-                fid.write(output)
-
-        issues: list[Issue] = self.parse_tool_output(output)
         return issues
 
     @classmethod
@@ -146,31 +197,58 @@ class ClangTidyToolPlugin(ToolPlugin):
         Returns:
             A list of issues found by the tool.
         """
-        clang_tidy_re = r"(.+):(\d+):(\d+):\s(.+):\s(.+)\s\[(.+)\]"
-        parse: Pattern[str] = re.compile(clang_tidy_re)
         issues: list[Issue] = []
         # Load the plugin mapping if possible
         warnings_mapping = self.load_mapping()
-        for line in output.splitlines():
-            match: Match[str] | None = parse.match(line)
-            if match and not self.check_for_exceptions(match):
-                if (
-                    line[1] != "*"
-                    and match.group(3) != "information"
-                    and match.group(4) != "note"
-                ):
-                    cert_reference = None
-                    if match.group(6) in warnings_mapping:
-                        cert_reference = warnings_mapping[match.group(6)]
-                    issues.append(
-                        Issue(
-                            match.group(1),
-                            int(match.group(2)),
-                            self.get_name(),
-                            match.group(4) + "/" + match.group(6),
-                            3,
-                            match.group(5),
-                            cert_reference,
-                        )
-                    )
+        for match in self.find_line_matches(self.PARSE_RE, output):
+            issue = self.get_issue(match, warnings_mapping)
+            if issue is not None:
+                issues.append(issue)
         return issues
+
+    def parse_line(self, line: str, warnings_mapping: dict[str, str]) -> Issue | None:
+        """Parse a single line of tool output.
+
+        Args:
+            line: Line of output from the tool.
+            warnings_mapping: Mapping of warnings to CERT references.
+
+        Returns:
+            The issue reported on the line, or None.
+        """
+        match: Match[str] | None = self.PARSE_RE.match(line)
+        if match:
+            return self.get_issue(match, warnings_mapping)
+        return None
+
+    def get_issue(
+        self, match: Match[str], warnings_mapping: dict[str, str]
+    ) -> Issue | None:
+        """Get the issue for a line of tool output.
+
+        Args:
+            match: The regex match of the line.
+            warnings_mapping: Mapping of warnings to CERT references.
+
+        Returns:
+            The issue reported on the line, or None if it is not reported.
+        """
+        filename, line_number, _, severity, message, issue_type = match.groups()
+        if (
+            not self.check_for_exceptions(match)
+            and filename[1:2] != "*"
+            and severity != "note"
+        ):
+            cert_reference = None
+            if issue_type in warnings_mapping:
+                cert_reference = warnings_mapping[issue_type]
+            return Issue(
+                filename,
+                int(line_number),
+                self.get_name(),
+                severity + "/" + issue_type,
+                3,
+                message,
+                cert_reference,
+            )
+        return None
@@ -54,9 +54,8 @@ class CMakelintToolPlugin(ToolPlugin):
 
         tool_bin = self.get_binary()
         try:
-            subproc_args = [tool_bin] + flags + cmake_files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output_batched(
+                [tool_bin] + flags, cmake_files, shards=self.get_shards(level)
             )
         except subprocess.CalledProcessError as ex:
             if ex.returncode == 1:
@@ -1,6 +1,7 @@
 """Apply cppcheck tool and gather results."""
 
 import argparse
+import hashlib
 import logging
 import os
 import re
@@ -17,6 +18,10 @@ from statick_tool.tool_plugin import ToolPlugin
 class CppcheckToolPlugin(ToolPlugin):
     """Apply cppcheck tool and gather results."""
 
+    PARSE_RE: Pattern[str] = re.compile(
+        r"^\[(.+):(\d+)\]:[^\S\n]\((.+?)[^\S\n](.+?)\)[^\S\n](.+)", re.MULTILINE
+    )
+
     # pylint: disable=super-init-not-called
     def __init__(self) -> None:
         """Initialize cppcheck extensions."""
@@ -82,6 +87,98 @@ class CppcheckToolPlugin(ToolPlugin):
             version = match.group(2)
         return version
 
+    def get_project(self, package: Package, level: str) -> str | None:
+        """Get the compilation database to check, if project mode is enabled.
+
+        Project mode is enabled with the `project` key of the tool in the level config.
+        Cppcheck then checks the translation units of compile_commands.json in the
+        build directory of the package, with the include paths and defines they are
+        compiled with.
+
+        Args:
+            package: The package to scan.
+            level: The level of the scan.
+
+        Returns:
+            Path to compile_commands.json, or None if project mode is not enabled or
+            the package has no compilation database.
+        """
+        if self.plugin_context is None or self.plugin_context.config is None:
+            return None
+        project = self.plugin_context.config.get_tool_config(
+            self.get_name(), level, "project"
+        )
+        if str(project).lower() != "true":
+            return None
+        if "bin_dir" in package:
+            compile_commands = os.path.join(package["bin_dir"], "compile_commands.json")
+            if os.path.isfile(compile_commands):
+                return compile_commands
+        logging.warning(
+            "No compile_commands.json found for %s, checking files instead.",
+            package.name,
+        )
+        return None
+
+    def get_build_dir(self, package: Package, level: str) -> str | None:
+        """Get the directory cppcheck keeps its analysis in between runs.
+
+        Cppcheck only checks translation units again when they change. The directory
+        is in the cache directory if one is used, or else in the output directory.
+
+        Args:
+            package: The package to scan.
+            level: The level of the scan.
+
+        Returns:
+            Path to the build directory, or None if there is nowhere to keep it.
+        """
+        if self.plugin_context is None:
+            return None
+        args = self.plugin_context.args
+        if (
+            "cache_dir" in args
+            and args.cache_dir is not None
+            and not ("no_cache" in args and args.no_cache)
+        ):
+            path_hash = hashlib.sha256(package.path.encode("utf8")).hexdigest()[:16]
+            build_dir = os.path.join(
+                os.path.abspath(args.cache_dir),
+                "cppcheck",
+                f"{package.name}-{level}-{path_hash}",
+            )
+        elif "output_directory" in args and args.output_directory:
+            build_dir = os.path.join(
+                os.path.abspath(args.output_directory),
+                f"{package.name}-{level}",
+                "cppcheck-build",
+            )
+        else:
+            return None
+        try:
+            os.makedirs(build_dir, exist_ok=True)
+        except OSError as ex:
+            logging.warning("Unable to create %s: %s", build_dir, ex)
+            return None
+        return build_dir
+
+    @staticmethod
+    def get_file_filters(package: Package, files: list[str]) -> list[str]:
+        """Get the flags that limit project mode to the files of the package.
+
+        Only the changed files are checked if only changed files are scanned.
+
+        Args:
+            package: The package to scan.
+            files: Paths of the files of the package to check.
+
+        Returns:
+            A --file-filter flag for each changed file, or for the package directory.
+        """
+        if package.changed_files is not None:
+            return ["--file-filter=" + os.path.abspath(fname) for fname in files]
+        return ["--file-filter=" + os.path.join(os.path.abspath(package.path), "*")]
+
     # pylint: disable=too-many-locals, too-many-branches, too-many-return-statements
     def scan(self, package: Package, level: str) -> list[Issue] | None:
         """Run tool and gather output.
@@ -112,10 +209,15 @@ class CppcheckToolPlugin(ToolPlugin):
 
         cppcheck_bin = self.get_binary()
 
-        try:
-            version = self.parse_version(self.get_version())
-            # If specific version is not specified just use the installed version.
-            if user_version is not None and Version(version) != Version(user_version):
+        # The version is already probed for the scan results, so it is only checked
+        # here if a specific version is needed.
+        if user_version is not None:
+            version_output = self.get_version()
+            if version_output in (self.TOOL_MISSING_STR, self.TOOL_UNKNOWN_STR):
+                logging.warning("Cppcheck not found! (%s)", version_output)
+                return None
+            version = self.parse_version(version_output)
+            if Version(version) != Version(user_version):
                 logging.warning(
                     "You need version %s of cppcheck, but you have %s. "
                     "See README.md for instructions on how to install the "
@@ -125,10 +227,6 @@ class CppcheckToolPlugin(ToolPlugin):
                 )
                 return None
 
-        except OSError as ex:
-            logging.warning("Cppcheck not found! (%s)", ex)
-            return None
-
         files: list[str] = []
         include_dirs: list[str] = []
         if "make_targets" in package:
@@ -140,6 +238,7 @@ class CppcheckToolPlugin(ToolPlugin):
                             include_dirs.append(include_dir)
         if "headers" in package:
             files += package["headers"]
+        files = package.get_changed_files(files)
 
         if not files:
             return []
@@ -150,18 +249,35 @@ class CppcheckToolPlugin(ToolPlugin):
                 include_args.append("-I")
                 include_args.append(include_dir)
 
+        project = self.get_project(package, level)
+        if project is not None:
+            # Include paths and defines come from the compilation database, and
+            # unchanged translation units are skipped using the build directory.
+            flags += ["--project=" + project, "-j", str(self.get_max_procs())]
+            flags += self.get_file_filters(package, files)
+            build_dir = self.get_build_dir(package, level)
+            if build_dir is not None:
+                flags.append("--cppcheck-build-dir=" + build_dir)
+
         try:
-            output = subprocess.check_output(
-                [cppcheck_bin] + flags + include_args + files,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-            )
+            if project is not None:
+                output = self.check_output_profiled([cppcheck_bin] + flags, len(files))
+            else:
+                # Cppcheck checks all files together, so long lists are passed in a
+                # file instead of being split.
+                output = self.check_output_batched(
+                    [cppcheck_bin] + flags + include_args, files, "--file-list="
+                )
         except subprocess.CalledProcessError as ex:
             output = ex.output
             logging.warning("cppcheck failed! Returncode = %d", ex.returncode)
             logging.warning("%s exception: %s", self.get_name(), ex.output)
             return None
 
+        except OSError as ex:
+            logging.warning("Cppcheck not found! (%s)", ex)
+            return None
+
         logging.debug("%s", output)
 
         if self.plugin_context and self.plugin_context.args.output_directory:
@@ -169,6 +285,16 @@ class CppcheckToolPlugin(ToolPlugin):
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(output)
+        if project is not None:
+            # The compilation database can have translation units of other packages
+            # or generated sources, and headers outside the package are reported too.
+            package_dir = os.path.join(os.path.abspath(package.path), "")
+            issues = [
+                issue
+                for issue in issues
+                if not os.path.isabs(issue.filename)
+                or issue.filename.startswith(package_dir)
+            ]
         return issues
 
     # pylint: enable=too-many-locals, too-many-branches, too-many-return-statements
@@ -197,31 +323,28 @@ class CppcheckToolPlugin(ToolPlugin):
         Returns:
             A list of issues found by the tool.
         """
-        cppcheck_re = r"\[(.+):(\d+)\]:\s\((.+?)\s(.+?)\)\s(.+)"
-        parse: Pattern[str] = re.compile(cppcheck_re)
         issues: list[Issue] = []
         warnings_mapping = self.load_mapping()
-        for line in output.splitlines():
-            match: Match[str] | None = parse.match(line)
+        for match in self.find_line_matches(self.PARSE_RE, output, "["):
+            filename, line_number, severity, issue_type, message = match.groups()
             if (
-                match
-                and line[1] != "*"
-                and match.group(3) != "information"
+                filename[0] != "*"
+                and severity != "information"
                 and not self.check_for_exceptions(match)
             ):
-                dummy, extension = os.path.splitext(match.group(1))
+                dummy, extension = os.path.splitext(filename)
                 if extension in self.valid_extensions:
                     cert_reference = None
-                    if match.group(4) in warnings_mapping:
-                        cert_reference = warnings_mapping[match.group(4)]
+                    if issue_type in warnings_mapping:
+                        cert_reference = warnings_mapping[issue_type]
                     issues.append(
                         Issue(
-                            match.group(1),
-                            int(match.group(2)),
+                            filename,
+                            int(line_number),
                             self.get_name(),
-                            match.group(3) + "/" + match.group(4),
+                            severity + "/" + issue_type,
                             5,
-                            match.group(5),
+                            message,
                             cert_reference,
                         )
                     )
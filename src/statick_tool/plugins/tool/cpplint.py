@@ -14,6 +14,10 @@ from statick_tool.tool_plugin import ToolPlugin
 class CpplintToolPlugin(ToolPlugin):
     """Apply Cpplint tool and gather results."""
 
+    PARSE_RE: Pattern[str] = re.compile(
+        r"^(.+):(\d+):[^\S\n](.+)[^\S\n]\[(.+)\][^\S\n]\[(\d+)\]", re.MULTILINE
+    )
+
     def get_name(self) -> str:
         """Get name of tool.
 
@@ -22,6 +26,24 @@ class CpplintToolPlugin(ToolPlugin):
         """
         return "cpplint"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, cpplint results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return ["CPPLINT.cfg"]
+
     def get_binary(  # pylint: disable=unused-argument
         self, level: str | None = None, package: Package | None = None
     ) -> str:
@@ -68,12 +90,20 @@ class CpplintToolPlugin(ToolPlugin):
         if "make_targets" in package:
             for target in package["make_targets"]:
                 files += target["src"]
+        files = package.get_changed_files(files)
+        if package.changed_files is not None and not files:
+            return []
+
+        cached_issues, uncached_files, cache_keys = self.load_cached_results(
+            package, level, files, flags
+        )
+        if files and not uncached_files:
+            return cached_issues
+        files = uncached_files
 
         try:
-            output = subprocess.check_output(
-                [cpplint] + flags + files,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
+            output = self.check_output_batched(
+                [cpplint] + flags, files, shards=self.get_shards(level)
             )
         except subprocess.CalledProcessError as ex:
             output = ex.output
@@ -93,7 +123,8 @@ class CpplintToolPlugin(ToolPlugin):
                 fid.write(output)
 
         issues: list[Issue] = self.parse_tool_output(output)
-        return issues
+        self.store_cached_results(cache_keys, issues)
+        return cached_issues + issues
 
     @classmethod
     def check_for_exceptions(cls, match: Match[str]) -> bool:
@@ -131,21 +162,18 @@ class CpplintToolPlugin(ToolPlugin):
         Returns:
             A list of issues found by the tool.
         """
-        lint_re = r"(.+):(\d+):\s(.+)\s\[(.+)\]\s\[(\d+)\]"
-        parse: Pattern[str] = re.compile(lint_re)
         issues: list[Issue] = []
-        for line in output.splitlines():
-            match: Match[str] | None = parse.match(line)
-            if match and not self.check_for_exceptions(match):
-                norm_path = os.path.normpath(match.group(1))
+        for match in self.find_line_matches(self.PARSE_RE, output):
+            if not self.check_for_exceptions(match):
+                filename, line_number, message, issue_type, severity = match.groups()
                 issues.append(
                     Issue(
-                        norm_path,
-                        int(match.group(2)),
+                        os.path.normpath(filename),
+                        int(line_number),
                         self.get_name(),
-                        match.group(4),
-                        int(match.group(5)),
-                        match.group(3),
+                        issue_type,
+                        int(severity),
+                        message,
                         None,
                     )
                 )
@@ -58,9 +58,8 @@ class DocformatterToolPlugin(ToolPlugin):
             return total_output
 
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output_batched(
+                [tool_bin] + flags, files, shards=self.get_shards(level)
             )
 
         except (IOError, OSError) as ex:
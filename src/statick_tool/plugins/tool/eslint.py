@@ -98,7 +98,7 @@ class ESLintToolPlugin(ToolPlugin):
         """
         tool_bin = self.get_binary()
 
-        (format_file_name, copied_file) = self.get_format_file(level)
+        format_file_name, copied_file = self.get_format_file(level)
 
         flags: list[str] = ["-f", "json"]
         if format_file_name is not None:
@@ -108,12 +108,17 @@ class ESLintToolPlugin(ToolPlugin):
 
         total_output: list[str] = []
 
-        for src in files:
+        def check_file(src: str) -> str:
+            """Run the tool on a single file."""
+            return subprocess.check_output(
+                [tool_bin] + flags + [src],
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+
+        for _, result in self.run_per_file(check_file, files):
             try:
-                exe = [tool_bin] + flags + [src]
-                output = subprocess.check_output(
-                    exe, stderr=subprocess.STDOUT, universal_newlines=True
-                )
+                output = result.result()
                 total_output.append(output)
 
             except subprocess.CalledProcessError as ex:
@@ -49,9 +49,8 @@ class FlawfinderToolPlugin(ToolPlugin):
         tool_bin = self.get_binary()
 
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output_batched(
+                [tool_bin] + flags, files, shards=self.get_shards(level)
             )
             total_output.append(output)
         except subprocess.CalledProcessError as ex:
@@ -194,35 +194,40 @@ class HadolintToolPlugin(ToolPlugin):
         Returns:
             Output string or None.
         """
-        try:
-            json_dict = []
-            for src in files:
-                exe = [
-                    "docker",
-                    "run",
-                    "--rm",
-                    "-i",
-                ]
-                if config_file_path is not None and config_file_path:
-                    exe.extend(
-                        [
-                            "-v",
-                            config_file_path + ":/.config/hadolint.yaml",
-                        ]
-                    )
+
+        def run_docker(src: str) -> str:
+            """Run hadolint on a single file in a docker container."""
+            exe = [
+                "docker",
+                "run",
+                "--rm",
+                "-i",
+            ]
+            if config_file_path is not None and config_file_path:
                 exe.extend(
                     [
                         "-v",
-                        src + ":/Dockerfile",
-                        "hadolint/hadolint",
-                        "hadolint",
+                        config_file_path + ":/.config/hadolint.yaml",
                     ]
                 )
-                exe.extend(flags)
-                exe.append("Dockerfile")
-                output = subprocess.check_output(
-                    exe, stderr=subprocess.STDOUT, universal_newlines=True
-                )
+            exe.extend(
+                [
+                    "-v",
+                    src + ":/Dockerfile",
+                    "hadolint/hadolint",
+                    "hadolint",
+                ]
+            )
+            exe.extend(flags)
+            exe.append("Dockerfile")
+            return subprocess.check_output(
+                exe, stderr=subprocess.STDOUT, universal_newlines=True
+            )
+
+        try:
+            json_dict = []
+            for src, result in self.run_per_file(run_docker, files):
+                output = result.result()
                 if output:
                     output = output.replace(
                         '"file":"Dockerfile"', '"file":"' + src + '"'
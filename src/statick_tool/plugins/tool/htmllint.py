@@ -65,12 +65,17 @@ class HTMLLintToolPlugin(ToolPlugin):
 
         total_output: list[str] = []
 
-        for src in files:
+        def check_file(src: str) -> str:
+            """Run the tool on a single file."""
+            return subprocess.check_output(
+                [tool_bin] + flags + [src],
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+
+        for _, result in self.run_per_file(check_file, files):
             try:
-                exe = [tool_bin] + flags + [src]
-                output = subprocess.check_output(
-                    exe, stderr=subprocess.STDOUT, universal_newlines=True
-                )
+                output = result.result()
                 total_output.append(output)
 
             except subprocess.CalledProcessError as ex:
@@ -23,6 +23,24 @@ class IsortToolPlugin(ToolPlugin):
         """
         return "isort"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, isort results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return [".isort.cfg", "pyproject.toml", "setup.cfg", "tox.ini", ".editorconfig"]
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -52,10 +70,7 @@ class IsortToolPlugin(ToolPlugin):
         total_output: list[str] = []
 
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
-            )
+            output = self.check_output_batched([tool_bin] + flags, files)
             total_output.append(output)
 
         except (IOError, OSError) as ex:
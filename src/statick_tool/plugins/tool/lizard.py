@@ -2,9 +2,10 @@
 
 import io
 import logging
+import os
 import re
 from contextlib import redirect_stdout
-from typing import Match, Pattern
+from typing import Pattern
 
 import lizard
 
@@ -20,6 +21,10 @@ class LizardToolPlugin(ToolPlugin):
     options are unsupported.
     """
 
+    PARSE_RE: Pattern[str] = re.compile(
+        r"^(.+):(\d+):[^\S\n](.+):[^\S\n](.+)", re.MULTILINE
+    )
+
     def get_name(self) -> str:
         """Get name of tool.
 
@@ -41,9 +46,19 @@ class LizardToolPlugin(ToolPlugin):
         if not package.path:
             return []
 
+        paths = [package.path]
+        if package.changed_files is not None:
+            paths = [
+                fname
+                for fname in sorted(package.changed_files)
+                if os.path.isfile(fname) and lizard.get_reader_for(fname)
+            ]
+            if not paths:
+                return []
+
         # The following is a modification of lizard.py's main().
         raw_user_flags = (
-            [lizard.__file__] + [package.path] + self.get_user_flags(level)
+            [lizard.__file__] + paths + self.get_user_flags(level)
         )  # Leading lizard file name is required.
 
         # Make sure we log warnings.
@@ -89,20 +104,21 @@ class LizardToolPlugin(ToolPlugin):
         Returns:
             List of issues found.
         """
-        lizard_re = r"(.+):(\d+):\s(.+):\s(.+)"
-        parse: Pattern[str] = re.compile(lizard_re)
-        matches = []
-        for line in output.splitlines():
-            match: Match[str] | None = parse.match(line)
-            if match:
-                matches.append(match.groups())
-
         issues: list[Issue] = []
-        for item in matches:
+        seen: set[Issue] = set()
+        for match in self.find_line_matches(self.PARSE_RE, output):
+            filename, line_number, issue_type, message = match.groups()
             issue = Issue(
-                item[0], int(item[1]), self.get_name(), item[2], 5, item[3], None
+                filename,
+                int(line_number),
+                self.get_name(),
+                issue_type,
+                5,
+                message,
+                None,
             )
-            if issue not in issues:
+            if issue not in seen:
+                seen.add(issue)
                 issues.append(issue)
 
         return issues
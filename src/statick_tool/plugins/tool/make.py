@@ -3,7 +3,7 @@
 import logging
 import re
 import subprocess
-from typing import Any, Match, Pattern
+from typing import Any, Iterable, Match, Pattern
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -13,6 +13,9 @@ from statick_tool.tool_plugin import ToolPlugin
 class MakeToolPlugin(ToolPlugin):
     """Apply Make tool and gather results."""
 
+    PARSE_RE: Pattern[str] = re.compile(r"(.+):(\d+):(\d+):\s(.+):\s(.+)")
+    WARNING_RE: Pattern[str] = re.compile(r".*\[(.+)\].*")
+
     def get_name(self) -> str:
         """Get name of tool.
 
@@ -35,21 +38,27 @@ class MakeToolPlugin(ToolPlugin):
             logging.info("  Skipping make. No targets.")
             return []
 
+        if package.changed_files is not None:
+            files: list[str] = list(package.get("cmake_src", []))
+            files += package.get("headers", [])
+            for target in package["make_targets"]:
+                files += target["src"]
+            if not package.get_changed_files(files):
+                logging.info("  Skipping make. No changed files.")
+                return []
+
         tool_bin = self.get_binary()
 
-        output = None
         make_args: list[str] = [tool_bin, "statick_cmake_target"]
 
         try:
-            output = subprocess.check_output(
-                [tool_bin, "clean"], universal_newlines=True
-            )
-            output = subprocess.check_output(
-                make_args, stderr=subprocess.STDOUT, universal_newlines=True
+            subprocess.check_output([tool_bin, "clean"], universal_newlines=True)
+            # The build output can be very large, so it is parsed as it is read.
+            issues: list[Issue] = self.parse_package_lines(
+                package, self.stream_output(make_args, self.get_log_file())
             )
 
         except subprocess.CalledProcessError as ex:
-            output = ex.output
             logging.warning("Make failed! Returncode = %d", ex.returncode)
             logging.warning("%s exception: %s", self.get_name(), ex.output)
             return None
@@ -58,13 +67,6 @@ class MakeToolPlugin(ToolPlugin):
             logging.warning("Couldn't find make executable! (%s)", ex)
             return None
 
-        logging.debug("%s", output)
-
-        if self.plugin_context and self.plugin_context.args.output_directory:
-            with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
-                fid.write(output)
-
-        issues: list[Issue] = self.parse_package_output(package, output)
         return issues
 
     @classmethod
@@ -112,9 +114,7 @@ class MakeToolPlugin(ToolPlugin):
             i += 1
         return result
 
-    def parse_package_output(  # pylint: disable=too-many-locals, too-many-branches
-        self, package: Package, output: str
-    ) -> list[Issue]:
+    def parse_package_output(self, package: Package, output: str) -> list[Issue]:
         """Parse tool output and report issues.
 
         Args:
@@ -124,23 +124,37 @@ class MakeToolPlugin(ToolPlugin):
         Returns:
             List of issues found.
         """
-        make_re = r"(.+):(\d+):(\d+):\s(.+):\s(.+)"
-        make_warning_re = r".*\[(.+)\].*"
-        parse: Pattern[str] = re.compile(make_re)
-        warning_parse: Pattern[str] = re.compile(make_warning_re)
+        return self.parse_package_lines(package, output.splitlines())
+
+    def parse_package_lines(  # pylint: disable=too-many-locals, too-many-branches
+        self, package: Package, lines: Iterable[str]
+    ) -> list[Issue]:
+        """Parse tool output one line at a time and report issues.
+
+        Args:
+            package: The package being processed.
+            lines: Lines of output from the tool, such as from stream_output().
+
+        Returns:
+            List of issues found.
+        """
         matches: Any = []
         # Load the plugin mapping if possible
         warnings_mapping = self.load_mapping()
-        for line in output.splitlines():
-            match: Match[str] | None = parse.match(line)
+        linker_failed = False
+        for line in lines:
+            match: Match[str] | None = self.PARSE_RE.match(line)
             if match and not self.check_for_exceptions(match):
                 matches.append(match.groups())
+            elif line == "collect2: ld returned 1 exit status":
+                linker_failed = True
 
         filtered_matches = self.filter_matches(matches, package)
         issues: list[Issue] = []
+        seen: set[Issue] = set()
         for item in filtered_matches:
             cert_reference = None
-            warning_list = warning_parse.match(item[4])
+            warning_list = self.WARNING_RE.match(item[4])
             if (
                 warning_list is not None
                 and warning_list.groups("1")[0] in warnings_mapping
@@ -174,11 +188,11 @@ class MakeToolPlugin(ToolPlugin):
                 item[4],
                 cert_reference,
             )
-            if issue not in issues:
+            if issue not in seen:
+                seen.add(issue)
                 issues.append(issue)
 
-        lines = output.splitlines()
-        if "collect2: ld returned 1 exit status" in lines:
+        if linker_failed:
             issues.append(
                 Issue(
                     "Linker",
@@ -21,6 +21,29 @@ class MarkdownlintToolPlugin(ToolPlugin):
         """
         return "markdownlint"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, markdownlint results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return [
+            ".markdownlint.json",
+            ".markdownlint.yaml",
+            ".markdownlint.yml",
+            ".markdownlintrc",
+        ]
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -66,10 +89,7 @@ class MarkdownlintToolPlugin(ToolPlugin):
         total_output: list[str] = []
 
         try:
-            exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                exe, stderr=subprocess.STDOUT, universal_newlines=True
-            )
+            output = self.check_output_batched([tool_bin] + flags, files)
             total_output.append(output)
 
         except subprocess.CalledProcessError as ex:
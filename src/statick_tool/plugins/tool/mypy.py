@@ -4,7 +4,7 @@ import logging
 import re
 import subprocess
 import sys
-from typing import Match, Pattern
+from typing import Pattern
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -14,6 +14,11 @@ from statick_tool.tool_plugin import ToolPlugin
 class MypyToolPlugin(ToolPlugin):
     """Apply mypy tool and gather results."""
 
+    # file:line: severity: msg type
+    PARSE_RE: Pattern[str] = re.compile(
+        r"^(.+):(\d+):[^\S\n](.+):[^\S\n](.+)[^\S\n](.+)", re.MULTILINE
+    )
+
     def get_name(self) -> str:
         """Get name of tool.
 
@@ -91,28 +96,22 @@ class MypyToolPlugin(ToolPlugin):
         Returns:
             List of issues found.
         """
-        # file:line: severity: msg type
-        tool_re = r"(.+):(\d+):\s(.+):\s(.+)\s(.+)"
-        parse: Pattern[str] = re.compile(tool_re)
         issues: list[Issue] = []
 
         for output in total_output:
-            lines = output.splitlines()
-            for line in lines:
-                if sys.platform != "win32" and not line.startswith("/"):
+            for match in self.find_line_matches(self.PARSE_RE, output):
+                filename, line_number, _, message, issue_type = match.groups()
+                if sys.platform != "win32" and not filename.startswith("/"):
                     continue
-                match: Match[str] | None = parse.match(line)
-                if match:
-                    issue_type = match.group(5).strip("[]")
-                    issues.append(
-                        Issue(
-                            match.group(1),
-                            int(match.group(2)),
-                            self.get_name(),
-                            issue_type,
-                            5,
-                            match.group(4),
-                            None,
-                        )
+                issues.append(
+                    Issue(
+                        filename,
+                        int(line_number),
+                        self.get_name(),
+                        issue_type.strip("[]"),
+                        5,
+                        message,
+                        None,
                     )
+                )
         return issues
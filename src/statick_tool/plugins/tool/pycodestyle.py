@@ -3,7 +3,7 @@
 import logging
 import re
 import subprocess
-from typing import Match, Pattern
+from typing import Pattern
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
@@ -13,6 +13,10 @@ from statick_tool.tool_plugin import ToolPlugin
 class PycodestyleToolPlugin(ToolPlugin):
     """Apply pycodestyle tool and gather results."""
 
+    PARSE_RE: Pattern[str] = re.compile(
+        r"^(.+):(\d+):[^\S\n]\[(.+)\][^\S\n](.+)", re.MULTILINE
+    )
+
     def get_name(self) -> str:
         """Get name of tool.
 
@@ -21,6 +25,24 @@ class PycodestyleToolPlugin(ToolPlugin):
         """
         return "pycodestyle"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, pycodestyle results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return ["setup.cfg", "tox.ini", ".pycodestyle"]
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -50,9 +72,8 @@ class PycodestyleToolPlugin(ToolPlugin):
 
         tool_bin = self.get_binary()
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output_batched(
+                [tool_bin] + flags, files, shards=self.get_shards(level)
             )
 
         except subprocess.CalledProcessError as ex:
@@ -86,51 +107,26 @@ class PycodestyleToolPlugin(ToolPlugin):
         Returns:
             A list of issues parsed from the output.
         """
-        tool_re = r"(.+):(\d+):\s\[(.+)\]\s(.+)"
-        parse: Pattern[str] = re.compile(tool_re)
         issues: list[Issue] = []
 
         for output in total_output:
-            for line in output.splitlines():
-                match: Match[str] | None = parse.match(line)
-                if match:
-                    if "," in match.group(3):
-                        parts = match.group(3).split(",")
-                        if parts[1].strip() == "":
-                            issues.append(
-                                Issue(
-                                    match.group(1),
-                                    int(match.group(2)),
-                                    self.get_name(),
-                                    parts[0],
-                                    5,
-                                    match.group(4),
-                                    None,
-                                )
-                            )
-                        else:
-                            issues.append(
-                                Issue(
-                                    match.group(1),
-                                    int(match.group(2)),
-                                    self.get_name(),
-                                    parts[0],
-                                    5,
-                                    parts[1].strip() + ": " + match.group(4),
-                                    None,
-                                )
-                            )
-                    else:
-                        issues.append(
-                            Issue(
-                                match.group(1),
-                                int(match.group(2)),
-                                self.get_name(),
-                                match.group(3),
-                                5,
-                                match.group(4),
-                                None,
-                            )
-                        )
+            for match in self.find_line_matches(self.PARSE_RE, output):
+                filename, line_number, issue_type, message = match.groups()
+                if "," in issue_type:
+                    parts = issue_type.split(",")
+                    issue_type = parts[0]
+                    if parts[1].strip() != "":
+                        message = parts[1].strip() + ": " + message
+                issues.append(
+                    Issue(
+                        filename,
+                        int(line_number),
+                        self.get_name(),
+                        issue_type,
+                        5,
+                        message,
+                        None,
+                    )
+                )
 
         return issues
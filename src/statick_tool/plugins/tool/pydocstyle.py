@@ -21,6 +21,32 @@ class PydocstyleToolPlugin(ToolPlugin):
         """
         return "pydocstyle"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, pydocstyle results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return [
+            "setup.cfg",
+            "tox.ini",
+            ".pydocstyle",
+            ".pydocstyle.ini",
+            ".pydocstylerc",
+            ".pydocstylerc.ini",
+            "pyproject.toml",
+        ]
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -50,9 +76,8 @@ class PydocstyleToolPlugin(ToolPlugin):
         tool_bin = self.get_binary()
 
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output_batched(
+                [tool_bin] + flags, files, shards=self.get_shards(level)
             )
 
         except subprocess.CalledProcessError as ex:
@@ -52,9 +52,8 @@ class RstcheckToolPlugin(ToolPlugin):
         total_output: list[str] = []
 
         try:
-            exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                exe, stderr=subprocess.STDOUT, universal_newlines=True
+            output = self.check_output_batched(
+                [tool_bin] + flags, files, shards=self.get_shards(level)
             )
             total_output.append(output)
 
@@ -25,6 +25,24 @@ class ShellcheckToolPlugin(ToolPlugin):
         """
         return "shellcheck"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, shellcheck results for a file do not depend on other files.
+        """
+        return True
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return [".shellcheckrc"]
+
     def gather_args(self, args: argparse.Namespace) -> None:
         """Gather arguments.
 
@@ -78,6 +96,12 @@ class ShellcheckToolPlugin(ToolPlugin):
         if "shell_src" in package:
             files += package["shell_src"]
 
+        cached_issues, files, cache_keys = self.load_cached_results(
+            package, level, files, flags
+        )
+        if not files:
+            return cached_issues
+
         try:
             subproc_args = [shellcheck_bin] + flags + files
             output = subprocess.check_output(
@@ -103,7 +127,8 @@ class ShellcheckToolPlugin(ToolPlugin):
                 fid.write(output)
 
         issues: list[Issue] = self.parse_json_output(json.loads(output))
-        return issues
+        self.store_cached_results(cache_keys, issues)
+        return cached_issues + issues
 
     def parse_json_output(self, output: Any) -> list[Issue]:
         """Parse tool output and report issues.
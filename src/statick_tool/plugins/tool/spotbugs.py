@@ -50,6 +50,13 @@ class SpotbugsToolPlugin(ToolPlugin):
         if self.plugin_context is None:
             return None
 
+        if package.changed_files is not None:
+            files: list[str] = list(package.get("java_src", []))
+            files += package.get("all_poms", [])
+            if not package.get_changed_files(files):
+                logging.info("  Skipping spotbugs. No changed files.")
+                return []
+
         flags: list[str] = [
             "-Dspotbugs.effort=Max",
             "-Dspotbugs.threshold=Low",
@@ -84,42 +84,45 @@ class UncrustifyToolPlugin(ToolPlugin):
                 files += target["src"]
         if "headers" in package:
             files += package["headers"]
+        files = package.get_changed_files(files)
 
         total_output: list[str] = []
 
+        format_file_name = self.plugin_context.resources.get_file("uncrustify.cfg")
+
+        def check_file(src: str) -> bool:
+            """Check whether uncrustify would change a single file."""
+            cmd = [uncrustify_bin, "-c", format_file_name, "-f", src]
+            output = subprocess.check_output(
+                cmd,  # type: ignore
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+            src_cmd = ["cat", src]
+            src_output = subprocess.check_output(
+                src_cmd, stderr=subprocess.STDOUT, universal_newlines=True
+            )
+            diff = difflib.context_diff(output.splitlines(), src_output.splitlines())
+            found_diff = False
+            output = output.split("\n", 1)[1]
+            for line in diff:
+                if (
+                    line.startswith("---")
+                    or line.startswith("***")
+                    or line.startswith("! Parsing")
+                    or src in line
+                    or line.isspace()
+                ):
+                    continue
+                # This is a bug I can't figure out yet.
+                if "#ifndef" in line or "#define" in line:
+                    continue
+                found_diff = True
+            return found_diff
+
         try:
-            format_file_name = self.plugin_context.resources.get_file("uncrustify.cfg")
-
-            for src in files:
-                cmd = [uncrustify_bin, "-c", format_file_name, "-f", src]
-                output = subprocess.check_output(
-                    cmd,  # type: ignore
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                )
-                src_cmd = ["cat", src]
-                src_output = subprocess.check_output(
-                    src_cmd, stderr=subprocess.STDOUT, universal_newlines=True
-                )
-                diff = difflib.context_diff(
-                    output.splitlines(), src_output.splitlines()
-                )
-                found_diff = False
-                output = output.split("\n", 1)[1]
-                for line in diff:
-                    if (
-                        line.startswith("---")
-                        or line.startswith("***")
-                        or line.startswith("! Parsing")
-                        or src in line
-                        or line.isspace()
-                    ):
-                        continue
-                    # This is a bug I can't figure out yet.
-                    if "#ifndef" in line or "#define" in line:
-                        continue
-                    found_diff = True
-                if found_diff:
+            for src, result in self.run_per_file(check_file, files):
+                if result.result():
                     total_output.append(src)
 
         except subprocess.CalledProcessError as ex:
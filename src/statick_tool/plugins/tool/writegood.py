@@ -69,10 +69,7 @@ class WriteGoodToolPlugin(ToolPlugin):
         total_output: list[str] = []
 
         try:
-            exe = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                exe, stderr=subprocess.STDOUT, universal_newlines=True
-            )
+            output = self.check_output_batched([tool_bin] + flags, files)
             total_output.append(output)
 
         except subprocess.CalledProcessError as ex:
@@ -21,6 +21,15 @@ class XmllintToolPlugin(ToolPlugin):
         """
         return "xmllint"
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Returns:
+            True, xmllint results for a file do not depend on other files.
+        """
+        return True
+
     def get_file_types(self) -> list[str]:
         """Return a list of file types the plugin can scan.
 
@@ -50,10 +59,7 @@ class XmllintToolPlugin(ToolPlugin):
         total_output: list[str] = []
 
         try:
-            subproc_args = [tool_bin] + flags + files
-            output = subprocess.check_output(
-                subproc_args, stderr=subprocess.STDOUT, universal_newlines=True
-            )
+            output = self.check_output_batched([tool_bin] + flags, files)
 
         except subprocess.CalledProcessError as ex:
             if ex.returncode == 1:
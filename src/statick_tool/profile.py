@@ -2,8 +2,6 @@
 
 from typing import Any
 
-import yaml
-
 from statick_tool.package import Package
 
 
@@ -18,9 +16,13 @@ class Profile:  # pylint: disable=too-few-public-methods
         """
         if not filename:
             raise ValueError(f"{filename} is not a valid file")
+        import yaml  # pylint: disable=import-outside-toplevel
+
         with open(filename, encoding="utf8") as fname:
             try:
-                self.profile = yaml.safe_load(fname)
+                # The LibYAML loader is much faster, if PyYAML was built with it.
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                self.profile = yaml.load(fname, Loader=loader)  # nosec B506
             except yaml.YAMLError as ex:
                 raise ValueError("f{filename} is not a valid YAML file: {ex}") from ex
             if self.profile is None:
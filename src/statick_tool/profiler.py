@@ -0,0 +1,286 @@
+"""Process-wide profiling of the stages of a scan.
+
+Every stage of a scan can be measured as a span: a package, a stage of a package
+(discovery, tools and reporting), a plugin, and a tool process run by a plugin. Spans
+nest, so a tool process is recorded inside the plugin that ran it, even when the
+plugin runs it from another thread.
+
+Wall time is measured with time.perf_counter(). When profiling is enabled, each span
+also records the CPU time used by Statick itself and by finished child processes, the
+largest resident set size of any child process so far, the size of the tool output in
+characters and the number of files. Resource usage is counted for the whole process,
+so spans that run at the same time share each other's usage.
+
+Spans can be written as JSON, or as Chrome trace events that can be loaded in
+chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import contextvars
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+if sys.platform != "win32":
+    import resource
+
+Span = NamedTuple(
+    "Span",
+    [
+        ("span_id", str),
+        ("parent_id", str | None),
+        ("name", str),
+        ("category", str),
+        ("pid", int),
+        ("thread_id", int),
+        ("start", float),
+        ("duration", float),
+        ("cpu_user", float),
+        ("cpu_system", float),
+        ("child_cpu_user", float),
+        ("child_cpu_system", float),
+        ("child_max_rss_kb", int),
+        ("output_chars", int),
+        ("file_count", int),
+    ],
+)
+
+
+class ActiveSpan:
+    """A span that is being measured."""
+
+    def __init__(self, span_id: str, parent_id: str | None, start: float) -> None:
+        """Initialize the span.
+
+        Args:
+            span_id: Identifier of the span, unique across processes.
+            parent_id: Identifier of the enclosing span, or None.
+            start: Start of the span, from time.perf_counter().
+        """
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = start
+        self.duration = 0.0
+        self.output_chars = 0
+        self.file_count = 0
+
+
+def get_usage() -> tuple[float, float, float, float, int]:
+    """Get the resource usage of this process and of its finished children.
+
+    Returns:
+        User and system CPU time of this process and of its children in seconds, and
+        the largest resident set size of any child in kilobytes.
+    """
+    if sys.platform == "win32":  # pragma: no cover
+        # Resource usage is not available on Windows.
+        return 0.0, 0.0, 0.0, 0.0, 0
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    max_rss = children.ru_maxrss
+    if sys.platform == "darwin":  # pragma: no cover
+        # macOS reports bytes instead of kilobytes.
+        max_rss //= 1024
+    return own.ru_utime, own.ru_stime, children.ru_utime, children.ru_stime, max_rss
+
+
+class Profiler:
+    """Process-wide profiling of the stages of a scan."""
+
+    _lock = threading.Lock()
+    _enabled = False
+    _spans: list[Span] = []
+    _ids = itertools.count(1)
+    _current: contextvars.ContextVar[ActiveSpan | None] = contextvars.ContextVar(
+        "statick_profiler_span", default=None
+    )
+
+    @classmethod
+    def enable(cls, enabled: bool = True) -> None:
+        """Turn recording of spans on or off.
+
+        Args:
+            enabled: Whether to record spans.
+        """
+        with cls._lock:
+            cls._enabled = enabled
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Check whether spans are recorded.
+
+        Returns:
+            True if spans are recorded.
+        """
+        return cls._enabled
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget all recorded spans."""
+        with cls._lock:
+            cls._spans = []
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, category: str) -> Iterator[ActiveSpan]:
+        """Measure a stage of a scan.
+
+        The wall time of the span is always measured, and is available from the
+        duration of the yielded span once it ends. Everything else is only measured
+        and recorded if profiling is enabled.
+
+        Args:
+            name: Name of the stage, such as the name of a plugin.
+            category: Kind of stage: package, stage, plugin or subprocess.
+
+        Yields:
+            The active span.
+        """
+        parent = cls._current.get()
+        enabled = cls._enabled
+        usage = get_usage() if enabled else None
+        active = ActiveSpan(
+            f"{os.getpid()}-{next(cls._ids)}",
+            None if parent is None else parent.span_id,
+            0.0,
+        )
+        token = cls._current.set(active)
+        active.start = time.perf_counter()
+        try:
+            yield active
+        finally:
+            active.duration = time.perf_counter() - active.start
+            cls._current.reset(token)
+            if usage is not None:
+                end_usage = get_usage()
+                span = Span(
+                    active.span_id,
+                    active.parent_id,
+                    name,
+                    category,
+                    os.getpid(),
+                    threading.get_ident(),
+                    active.start,
+                    active.duration,
+                    end_usage[0] - usage[0],
+                    end_usage[1] - usage[1],
+                    end_usage[2] - usage[2],
+                    end_usage[3] - usage[3],
+                    end_usage[4],
+                    active.output_chars,
+                    active.file_count,
+                )
+                with cls._lock:
+                    cls._spans.append(span)
+
+    @classmethod
+    def add_counts(cls, output_chars: int = 0, file_count: int = 0) -> None:
+        """Count tool output and files in the innermost active span.
+
+        Args:
+            output_chars: Characters of decoded tool output.
+            file_count: Number of files.
+        """
+        active = cls._current.get()
+        if active is not None:
+            active.output_chars += output_chars
+            active.file_count += file_count
+
+    @classmethod
+    def pop_spans(cls) -> list[Span]:
+        """Remove and return the spans recorded by this process.
+
+        A worker process inherits the spans of its parent when it is forked, and only
+        hands back the spans it recorded itself.
+
+        Returns:
+            Spans recorded by this process.
+        """
+        pid = os.getpid()
+        with cls._lock:
+            spans = [span for span in cls._spans if span.pid == pid]
+            cls._spans = [span for span in cls._spans if span.pid != pid]
+        return spans
+
+    @classmethod
+    def add_spans(cls, spans: list[Span]) -> None:
+        """Add spans recorded by another process.
+
+        Args:
+            spans: Spans to add.
+        """
+        with cls._lock:
+            cls._spans += spans
+
+    @classmethod
+    def get_spans(cls) -> list[Span]:
+        """Get all recorded spans, in start order.
+
+        Returns:
+            Recorded spans.
+        """
+        with cls._lock:
+            return sorted(cls._spans, key=lambda span: span.start)
+
+    @classmethod
+    def to_json(cls) -> dict[str, Any]:
+        """Get the recorded spans as JSON.
+
+        Start times are in seconds from the start of the first span.
+
+        Returns:
+            Recorded spans.
+        """
+        spans = cls.get_spans()
+        origin = spans[0].start if spans else 0.0
+        return {
+            "spans": [dict(span._asdict(), start=span.start - origin) for span in spans]
+        }
+
+    @classmethod
+    def to_chrome_trace(cls) -> dict[str, Any]:
+        """Get the recorded spans as Chrome trace events.
+
+        Returns:
+            Trace with one complete event per span, in microseconds.
+        """
+        spans = cls.get_spans()
+        origin = spans[0].start if spans else 0.0
+        events: list[dict[str, Any]] = []
+        for span in spans:
+            args = span._asdict()
+            for key in ("name", "category", "pid", "thread_id", "start", "duration"):
+                del args[key]
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round((span.start - origin) * 1e6, 3),
+                    "dur": round(span.duration * 1e6, 3),
+                    "pid": span.pid,
+                    "tid": span.thread_id,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    @classmethod
+    def write(cls, json_file: str | None, trace_file: str | None) -> None:
+        """Write the recorded spans to files.
+
+        Args:
+            json_file: File to write the spans to as JSON, or None.
+            trace_file: File to write the spans to as Chrome trace events, or None.
+        """
+        if json_file is not None:
+            with open(json_file, "w", encoding="utf8") as fid:
+                json.dump(cls.to_json(), fid, indent=2)
+        if trace_file is not None:
+            with open(trace_file, "w", encoding="utf8") as fid:
+                json.dump(cls.to_chrome_trace(), fid)
@@ -1,12 +1,13 @@
 """Result reporting plugin."""
 
 import argparse
-import logging
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
+from statick_tool.resource_cache import ResourceCache
 
 
 class ReportingPlugin:
@@ -29,7 +30,7 @@ class ReportingPlugin:
         """
 
     def report(  # type: ignore[empty-body]
-        self, package: Package, issues: dict[str, list[Issue]], level: str
+        self, package: Package, issues: Mapping[str, Sequence[Issue]], level: str
     ) -> tuple[None, bool]:  # pyright: ignore
         """Run the report generator.
 
@@ -80,14 +81,4 @@ class ReportingPlugin:
 
         if full_path is None:
             return {}
-        warning_mapping: dict[str, str] = {}
-        with open(full_path, "r", encoding="utf8") as mapping_file:
-            for line in mapping_file.readlines():
-                split_line = line.strip().split(":")
-                if len(split_line) != 2:
-                    logging.warning(
-                        "Invalid line %s in mapping file %s", line, file_name
-                    )
-                    continue
-                warning_mapping[split_line[0]] = split_line[1]
-        return warning_mapping
+        return ResourceCache.get_mapping(full_path, file_name)
@@ -0,0 +1,137 @@
+"""Process-wide cache of resource file lookups and parsed resource files.
+
+Statick looks up the same resource files, warning mappings and profile for every
+package it scans. Finding a file checks every resource path, and mappings and profiles
+are read and parsed again each time. Lookups and parsed files are kept for the life of
+the process.
+
+A file lookup is kept until one of the directories it searched changes, so adding or
+removing a resource file is noticed. A parsed file is kept until its modification time
+or size changes.
+"""
+
+import logging
+import os
+import threading
+from typing import Any
+
+from statick_tool.profile import Profile
+
+
+class ResourceCache:
+    """Process-wide cache of resource file lookups and parsed resource files."""
+
+    _lock = threading.Lock()
+    _files: dict[tuple[tuple[str, ...], str], tuple[Any, str | None]] = {}
+    _mappings: dict[str, tuple[Any, dict[str, str]]] = {}
+    _profiles: dict[str, tuple[Any, Profile]] = {}
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget all lookups and parsed files kept in memory."""
+        with cls._lock:
+            cls._files.clear()
+            cls._mappings.clear()
+            cls._profiles.clear()
+
+    @staticmethod
+    def get_file_key(path: str) -> tuple[int, int] | None:
+        """Get a key that changes whenever a file or directory changes.
+
+        Args:
+            path: Path of the file or directory.
+
+        Returns:
+            Modification time and size of the file, or None if it does not exist.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def find_file(cls, paths: list[str], filename: str) -> str | None:
+        """Find a file in the rsc directory of the first resource path that has it.
+
+        Args:
+            paths: Resource paths to search, in order.
+            filename: Name of file to find, relative to the rsc directories.
+
+        Returns:
+            Full path to file or None if not found.
+        """
+        candidates = [os.path.join(path, "rsc", filename) for path in paths]
+        dir_keys = tuple(
+            cls.get_file_key(os.path.dirname(candidate)) for candidate in candidates
+        )
+        key = (tuple(paths), filename)
+        with cls._lock:
+            if key in cls._files and cls._files[key][0] == dir_keys:
+                return cls._files[key][1]
+
+        full_filename: str | None = None
+        for candidate, dir_key in zip(candidates, dir_keys):
+            if dir_key is not None and os.path.isfile(candidate):
+                full_filename = candidate
+                break
+
+        with cls._lock:
+            cls._files[key] = (dir_keys, full_filename)
+        return full_filename
+
+    @classmethod
+    def get_mapping(cls, full_path: str, file_name: str) -> dict[str, str]:
+        """Get the mapping between warnings and identifiers in a mapping file.
+
+        Args:
+            full_path: Full path to the mapping file.
+            file_name: Name of the mapping file to use in messages.
+
+        Returns:
+            Mapping between warnings and identifiers.
+        """
+        file_key = cls.get_file_key(full_path)
+        with cls._lock:
+            if full_path in cls._mappings and cls._mappings[full_path][0] == file_key:
+                return dict(cls._mappings[full_path][1])
+
+        warning_mapping: dict[str, str] = {}
+        with open(full_path, "r", encoding="utf8") as mapping_file:
+            for line in mapping_file.readlines():
+                split_line = line.strip().split(":")
+                if len(split_line) != 2:
+                    logging.warning(
+                        "Invalid line %s in mapping file %s", line, file_name
+                    )
+                    continue
+                warning_mapping[split_line[0]] = split_line[1]
+
+        with cls._lock:
+            cls._mappings[full_path] = (file_key, warning_mapping)
+        return dict(warning_mapping)
+
+    @classmethod
+    def get_profile(cls, full_path: str) -> Profile:
+        """Get a parsed profile file.
+
+        Args:
+            full_path: Full path to the profile file.
+
+        Returns:
+            The profile.
+
+        Raises:
+            OSError: If the profile file can not be read.
+            ValueError: If the profile file is not a valid profile.
+        """
+        file_key = cls.get_file_key(full_path)
+        with cls._lock:
+            if full_path in cls._profiles and cls._profiles[full_path][0] == file_key:
+                return cls._profiles[full_path][1]
+
+        profile = Profile(full_path)
+
+        with cls._lock:
+            cls._profiles[full_path] = (file_key, profile)
+        return profile
@@ -6,6 +6,8 @@ Handles chaining user directories and the default statick resource directory.
 import logging
 import os
 
+from statick_tool.resource_cache import ResourceCache
+
 
 class Resources:
     """Manages plugin and file lookup chaining.
@@ -49,14 +51,12 @@ class Resources:
     def get_file(self, filename: str) -> str | None:
         """Get full path to file for default and user-defined resource paths.
 
+        Lookups are kept in the resource cache until a searched directory changes.
+
         Args:
             filename: Name of file to find.
 
         Returns:
             Full path to file or None if not found.
         """
-        for path in self.paths:
-            full_filename = os.path.join(path, "rsc", filename)
-            if os.path.exists(full_filename) and os.path.isfile(full_filename):
-                return full_filename
-        return None
+        return ResourceCache.find_file(self.paths, filename)
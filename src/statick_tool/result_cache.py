@@ -0,0 +1,198 @@
+"""On-disk cache of tool results for individual files.
+
+Results are stored per file and keyed by the contents of the file along with everything
+else that can change what a tool reports for it: the tool name and version, the flags
+passed to the tool, the scan level and the contents of tool configuration files. Only
+tools that report issues for each file independently of other files can use the cache.
+
+The cache is bounded in size. Once a run is done, entries that have not been used
+recently are evicted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any
+
+from statick_tool.issue import Issue
+
+
+class ResultCache:
+    """On-disk cache of tool results for individual files."""
+
+    DEFAULT_MAX_SIZE_MB = 256
+
+    def __init__(self, cache_dir: str, max_size_mb: int | None = None) -> None:
+        """Initialize the result cache.
+
+        Args:
+            cache_dir: Directory to store cached results in.
+            max_size_mb: Maximum size of the cache in megabytes.
+        """
+        self.cache_dir = os.path.join(os.path.abspath(cache_dir), "results")
+        if max_size_mb is None:
+            max_size_mb = self.DEFAULT_MAX_SIZE_MB
+        self.max_size = max_size_mb * 1024 * 1024
+
+    @staticmethod
+    def get_statick_version() -> str:
+        """Get the installed version of Statick.
+
+        Plugins change between releases, so cached results are only reused with the
+        same version of Statick.
+
+        Returns:
+            Version of Statick.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            return version("statick")
+        except PackageNotFoundError:
+            return "unknown"
+
+    @staticmethod
+    def hash_file(path: str) -> str | None:
+        """Get a hash of the contents of a file.
+
+        Args:
+            path: Path to the file.
+
+        Returns:
+            Hash of the file contents, or None if the file can not be read.
+        """
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as fid:
+                for chunk in iter(lambda: fid.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    @classmethod
+    def get_key(cls, context: list[Any], path: str) -> str | None:
+        """Get the cache key for running a tool on a file.
+
+        Args:
+            context: Everything besides the file contents that changes the results.
+            path: Path to the file.
+
+        Returns:
+            Cache key, or None if the file can not be read.
+        """
+        file_hash = cls.hash_file(path)
+        if file_hash is None:
+            return None
+        key_data = json.dumps(context + [file_hash], sort_keys=True)
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, key: str) -> str:
+        """Get the path of the file holding a cache entry.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Path of the cache entry.
+        """
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def load(self, key: str, path: str) -> list[Issue] | None:
+        """Load cached issues for a file.
+
+        Args:
+            key: Cache key.
+            path: Path to the file the issues belong to.
+
+        Returns:
+            Cached issues, or None if there is no usable entry.
+        """
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, encoding="utf8") as fid:
+                entries = json.load(fid)
+            # Mark the entry as recently used.
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            return [
+                Issue(
+                    path,
+                    int(entry[0]),
+                    entry[1],
+                    entry[2],
+                    int(entry[3]),
+                    entry[4],
+                    entry[5],
+                )
+                for entry in entries
+            ]
+        except (IndexError, TypeError, ValueError):
+            logging.debug("Ignoring invalid result cache entry %s", entry_path)
+            return None
+
+    def store(self, key: str, issues: list[Issue]) -> None:
+        """Store issues for a file.
+
+        The filename is not stored so that entries can be reused for files with the
+        same contents at a different path.
+
+        Args:
+            key: Cache key.
+            issues: Issues found in the file.
+        """
+        entry_path = self.get_entry_path(key)
+        entries = [
+            [
+                issue.line_number,
+                issue.tool,
+                issue.issue_type,
+                issue.severity,
+                issue.message,
+                issue.cert_reference,
+            ]
+            for issue in issues
+        ]
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # Write to a temporary file first so that concurrent readers never see a
+            # partially written entry.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path))
+            with os.fdopen(fd, "w", encoding="utf8") as fid:
+                json.dump(entries, fid)
+            os.replace(tmp_path, entry_path)
+        except OSError as ex:
+            logging.warning("Unable to write result cache entry %s: %s", entry_path, ex)
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits its size limit."""
+        entries: list[tuple[float, int, str]] = []
+        total_size = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for fname in files:
+                entry_path = os.path.join(root, fname)
+                try:
+                    stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= self.max_size:
+                break
@@ -4,8 +4,7 @@
 import argparse
 import sys
 import time
-
-from tabulate import tabulate
+from typing import Any
 
 from statick_tool.args import Args
 from statick_tool.statick_tool import Statick
@@ -35,18 +34,34 @@ def run(
     return success
 
 
+def print_table(rows: list[Any], tablefmt: str) -> None:  # pragma: no cover
+    """Print rows of named tuples as a table.
+
+    Tabulate is only imported when a table is printed, as it is slow to import.
+
+    Args:
+        rows: Rows of the table.
+        tablefmt: Format of the table.
+    """
+    from tabulate import tabulate  # pylint: disable=import-outside-toplevel
+
+    print(tabulate(rows, headers="keys", tablefmt=tablefmt))
+
+
 def main() -> None:  # pragma: no cover
     """Run Statick."""
     start_time: float = time.time()
     args = Args("Statick tool")
     args.parser.add_argument("path", help="Path of package or workspace to scan")
 
-    statick = Statick(args.get_user_paths())
+    statick = Statick(args.get_user_paths(), args.get_cache_dir())
     statick.gather_args(args.parser)
     parsed_args = args.get_args()
     statick.set_logging_level(parsed_args)
     statick.get_config(parsed_args)
     statick.get_exceptions(parsed_args)
+    statick.set_tool_probe_cache(parsed_args)
+    statick.set_profiling(parsed_args)
 
     if parsed_args.show_all_tool_versions:
         success = statick.collect_tool_versions(parsed_args)
@@ -54,14 +69,15 @@ def main() -> None:  # pragma: no cover
         _, success = statick.run_workspace(parsed_args, start_time)
     else:
         success = run(statick, parsed_args, start_time)
+    statick.evict_result_cache(parsed_args)
 
+    statick.write_profiling(parsed_args)
     timings = statick.get_timings()
     if parsed_args.timings:
-        print(tabulate(timings, headers="keys", tablefmt="pretty"))
+        print_table(timings, "pretty")
 
     if parsed_args.show_all_tool_versions or parsed_args.show_run_tool_versions:
-        tool_versions = statick.get_tool_versions()
-        print(tabulate(tool_versions, headers="keys", tablefmt="grid"))
+        print_table(statick.get_tool_versions(), "grid")
 
     if parsed_args.check and not success:
         statick.print_exit_status(False)
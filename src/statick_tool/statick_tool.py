@@ -1,63 +1,65 @@
 """Code analysis front-end."""
 
 import argparse
-import copy
+import contextvars
 import io
 import logging
 import multiprocessing
 import os
+import subprocess
 import sys
 import time
-from importlib.metadata import version
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from logging.handlers import MemoryHandler
 from typing import Any
 
+from statick_tool.args import VersionAction
 from statick_tool.config import Config
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.exceptions import Exceptions
 from statick_tool.issue import Issue
+from statick_tool.issue_store import IssueStore
 from statick_tool.package import Package
+from statick_tool.package_scheduler import PackageScheduler
 from statick_tool.plugin_context import PluginContext
-from statick_tool.profile import Profile
+from statick_tool.plugin_index import PluginIndex
+from statick_tool.profiler import Profiler, Span
+from statick_tool.resource_cache import ResourceCache
 from statick_tool.resources import Resources
+from statick_tool.result_cache import ResultCache
 from statick_tool.timing import Timing
+from statick_tool.tool_probe import ToolProbe
 from statick_tool.tool_version import ToolVersion
-
-if sys.version_info < (3, 10):
-    from importlib_metadata import entry_points
-else:
-    from importlib.metadata import entry_points
+from statick_tool.workspace_index import WorkspaceIndex
 
 
 class Statick:  # pylint: disable=too-many-instance-attributes
     """Code analysis front-end."""
 
-    def __init__(self, user_paths: list[str]) -> None:
+    def __init__(self, user_paths: list[str], cache_dir: str | None = None) -> None:
         """Initialize Statick.
 
+        Plugins are found when Statick is initialized, but only loaded when they are
+        used.
+
         Args:
             user_paths: List of paths to search for resource files.
+            cache_dir: Directory to keep the entry points and arguments of plugins in
+                between runs.
         """
         self.default_level = "default"
         self.resources = Resources(user_paths)
-
-        self.discovery_plugins: dict[str, Any] = {}
-        plugins = entry_points(group="statick_tool.plugins.discovery")
-        for plugin_type in plugins:
-            plugin = plugin_type.load()
-            self.discovery_plugins[plugin_type.name] = plugin()
-
-        self.reporting_plugins: dict[str, Any] = {}
-        plugins = entry_points(group="statick_tool.plugins.reporting")
-        for plugin_type in plugins:
-            plugin = plugin_type.load()
-            self.reporting_plugins[plugin_type.name] = plugin()
-
-        self.tool_plugins: dict[str, Any] = {}
-        plugins = entry_points(group="statick_tool.plugins.tool")
-        for plugin_type in plugins:
-            plugin = plugin_type.load()
-            self.tool_plugins[plugin_type.name] = plugin()
+        self.cache_dir = cache_dir
+
+        groups = [
+            "statick_tool.plugins.discovery",
+            "statick_tool.plugins.reporting",
+            "statick_tool.plugins.tool",
+        ]
+        entry_points = PluginIndex.find_entry_points(groups, cache_dir)
+        self.discovery_plugins = PluginIndex(groups[0], entry_points[groups[0]])
+        self.reporting_plugins = PluginIndex(groups[1], entry_points[groups[1]])
+        self.tool_plugins = PluginIndex(groups[2], entry_points[groups[2]])
 
         self.config: Config | None = None
         self.exceptions: Exceptions | None = None
@@ -151,6 +153,66 @@ class Statick:  # pylint: disable=too-many-instance-attributes
         except ValueError as ex:
             logging.error("Exceptions file %s has errors: %s", exceptions_filename, ex)
 
+    @staticmethod
+    def set_tool_probe_cache(args: argparse.Namespace) -> None:
+        """Keep tool versions on disk between runs if a cache directory is set.
+
+        Args:
+            args: The parsed command line arguments.
+        """
+        cache_dir = None
+        if "cache_dir" in args and not ("no_cache" in args and args.no_cache):
+            cache_dir = args.cache_dir
+        ToolProbe.set_cache_dir(cache_dir)
+
+    @staticmethod
+    def evict_result_cache(args: argparse.Namespace) -> None:
+        """Bring the result cache back within its size limit after a run.
+
+        Args:
+            args: The parsed command line arguments.
+        """
+        if "cache_dir" not in args or args.cache_dir is None:
+            return
+        if "no_cache" in args and args.no_cache:
+            return
+        max_size = None
+        if "cache_max_size" in args:
+            max_size = args.cache_max_size
+        ResultCache(args.cache_dir, max_size).evict()
+
+    @staticmethod
+    def set_profiling(args: argparse.Namespace) -> None:
+        """Record profiling spans if a profiling output file is set.
+
+        Args:
+            args: The parsed command line arguments.
+        """
+        Profiler.enable(
+            ("profiling_json" in args and args.profiling_json is not None)
+            or ("profiling_trace" in args and args.profiling_trace is not None)
+        )
+
+    @staticmethod
+    def write_profiling(args: argparse.Namespace) -> None:
+        """Write the recorded profiling spans to the files set on the command line.
+
+        Args:
+            args: The parsed command line arguments.
+        """
+        if not Profiler.is_enabled():
+            return
+        json_file = None
+        if "profiling_json" in args:
+            json_file = args.profiling_json
+        trace_file = None
+        if "profiling_trace" in args:
+            trace_file = args.profiling_trace
+        try:
+            Profiler.write(json_file, trace_file)
+        except OSError as ex:
+            logging.warning("Unable to write profiling output: %s", ex)
+
     def get_ignore_packages(self) -> list[str]:
         """Get packages to ignore during scan process.
 
@@ -216,8 +278,8 @@ class Statick:  # pylint: disable=too-many-instance-attributes
         )
         args.add_argument(
             "--version",
-            action="version",
-            version=f"%(prog)s {version('statick')}",
+            action=VersionAction,
+            help="Show the version of Statick and exit",
         )
         args.add_argument(
             "--tool-versions-all",
@@ -243,6 +305,69 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             action="store_true",
             help="Enable printing timing information to stdout",
         )
+        args.add_argument(
+            "--profiling-json",
+            dest="profiling_json",
+            type=str,
+            help="Write wall time, CPU time, memory and output size of every package, "
+            "stage, plugin and tool process to this JSON file",
+        )
+        args.add_argument(
+            "--profiling-trace",
+            dest="profiling_trace",
+            type=str,
+            help="Write the same profiling information as Chrome trace events to this "
+            "file, to be loaded in chrome://tracing or Perfetto",
+        )
+        args.add_argument(
+            "--tool-jobs",
+            dest="tool_jobs",
+            type=self.set_cpu_count,
+            default=1,
+            help="Maximum number of tool plugins to run at the same time for each "
+            "package. Tool dependencies are always run first. Setting to -1 will "
+            "cause Statick to use all available CPU cores",
+        )
+        args.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            type=str,
+            help="Directory to cache results of file-local tools and tool versions "
+            "in. Results are reused for files and tools that have not changed",
+        )
+        args.add_argument(
+            "--no-cache",
+            dest="no_cache",
+            action="store_true",
+            help="Do not use the result cache, even if a cache directory is set",
+        )
+        args.add_argument(
+            "--cache-max-size",
+            dest="cache_max_size",
+            type=int,
+            default=ResultCache.DEFAULT_MAX_SIZE_MB,
+            help="Maximum size of the result cache in megabytes. Least recently "
+            "used results are removed first. Defaults to "
+            f"{ResultCache.DEFAULT_MAX_SIZE_MB}",
+        )
+        args.add_argument(
+            "--changed-since",
+            dest="changed_since",
+            type=str,
+            help="Only scan files that changed since the given git revision",
+        )
+        args.add_argument(
+            "--include-untracked",
+            dest="include_untracked",
+            action="store_true",
+            help="Also scan untracked files, only used with --changed-since",
+        )
+        args.add_argument(
+            "--use-gitignore",
+            dest="use_gitignore",
+            action="store_true",
+            help="Do not discover files that are ignored by git",
+        )
 
         # Statick workspace arguments.
         args.add_argument(
@@ -273,14 +398,18 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             help="List packages and levels, only used when running on a workspace",
         )
 
-        for _, plugin in list(self.discovery_plugins.items()):
-            plugin.gather_args(args)
-
-        for _, plugin in list(self.reporting_plugins.items()):
-            plugin.gather_args(args)
-
-        for _, plugin in list(self.tool_plugins.items()):
-            plugin.gather_args(args)
+        cached_arguments: dict[str, Any] = {}
+        if self.cache_dir is not None:
+            cached_arguments = PluginIndex.load_arguments(self.cache_dir)
+        plugin_arguments: dict[str, Any] = {}
+        for plugins in (
+            self.discovery_plugins,
+            self.reporting_plugins,
+            self.tool_plugins,
+        ):
+            plugin_arguments.update(plugins.gather_args(args, cached_arguments))
+        if self.cache_dir is not None and plugin_arguments != cached_arguments:
+            PluginIndex.store_arguments(self.cache_dir, plugin_arguments)
 
     def get_level(self, path: str, args: argparse.Namespace) -> str | None:
         """Get level to scan package at.
@@ -305,7 +434,7 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             logging.error("Could not find profile file %s!", profile_filename)
             return None
         try:
-            profile = Profile(profile_resource)
+            profile = ResourceCache.get_profile(profile_resource)
         except OSError as ex:
             # This isn't quite redundant with the profile_resource check: it's possible
             # that something else triggers an OSError, like permissions.
@@ -403,6 +532,22 @@ class Statick:  # pylint: disable=too-many-instance-attributes
     ) -> tuple[dict[str, list[Issue]] | None, bool]:
         """Run scan tools against targets on path.
 
+        Args:
+            path: Path to the target.
+            args: Arguments from command line.
+            start_time: Start time of the scan.
+
+        Returns:
+            Issues found and success status.
+        """
+        with Profiler.span(os.path.basename(os.path.abspath(path)), "package"):
+            return self.run_package(path, args, start_time)
+
+    def run_package(
+        self, path: str, args: argparse.Namespace, start_time: float | None = None
+    ) -> tuple[dict[str, list[Issue]] | None, bool]:
+        """Run scan tools against targets on path, one stage after another.
+
         Args:
             path: Path to the target.
             args: Arguments from command line.
@@ -431,6 +576,19 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             logging.error("Can't find specified level %s in config!", level)
             return None, False
 
+        if "changed_since" in args and args.changed_since is not None:
+            include_untracked = "include_untracked" in args and args.include_untracked
+            package.changed_files = self.get_changed_files(
+                path, args.changed_since, include_untracked
+            )
+            if package.changed_files is None:
+                return None, False
+            logging.info(
+                "%d files changed since %s.",
+                len(package.changed_files),
+                args.changed_since,
+            )
+
         orig_path = os.getcwd()
         if args.output_directory:
             if not os.path.isdir(args.output_directory):
@@ -474,125 +632,93 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         plugin_context = PluginContext(args, self.resources, self.config)
 
-        logging.info("---Discovery---")
-        if not DiscoveryPlugin.file_command_exists():
-            logging.info(
-                "file command isn't available, discovery plugins will be less effective"
-            )
-
-        discovery_plugins = self.config.get_enabled_discovery_plugins(level)
-        if not discovery_plugins:
-            discovery_plugins = list(self.discovery_plugins)
-        # Get timing information for finding files for discovery plugins.
-        dummy_plugin = DiscoveryPlugin()
-        plugin_start = time.time()
-        dummy_plugin.find_files(package)
-        duration = format(time.time() - plugin_start, ".4f")
-        timing = Timing(package.name, "find files", "Discovery", duration)
-        self.timings.append(timing)
-
-        plugins_ran: list[Any] = []
-        for plugin_name in discovery_plugins:
-            if plugin_name not in self.discovery_plugins:
-                logging.error("Can't find specified discovery plugin %s!", plugin_name)
-                return None, False
-
-            plugin = self.discovery_plugins[plugin_name]
-            dependencies = plugin.get_discovery_dependencies()
-            for dependency_name in dependencies:
-                dependency_plugin = self.discovery_plugins[dependency_name]
-                if dependency_plugin.get_name() in plugins_ran:
-                    continue
-                dependency_plugin.set_plugin_context(plugin_context)
+        with Profiler.span("discovery", "stage"):
+            logging.info("---Discovery---")
+            if not DiscoveryPlugin.file_command_exists():
                 logging.info(
-                    "Running %s discovery plugin...", dependency_plugin.get_name()
+                    "file command isn't available, discovery plugins will be less"
+                    " effective"
                 )
-                plugin_start = time.time()
-                dependency_plugin.scan(package, level, self.exceptions)
-                duration = format(time.time() - plugin_start, ".4f")
-                timing = Timing(
-                    package.name, dependency_plugin.get_name(), "Discovery", duration
-                )
-                self.timings.append(timing)
-                logging.info("%s discovery plugin done.", dependency_plugin.get_name())
-                plugins_ran.append(dependency_plugin.get_name())
 
-            if plugin.get_name() not in plugins_ran:
-                plugin.set_plugin_context(plugin_context)
-                logging.info("Running %s discovery plugin...", plugin.get_name())
-                plugin_start = time.time()
-                plugin.scan(package, level, self.exceptions)
-                duration = format(time.time() - plugin_start, ".4f")
-                timing = Timing(package.name, plugin.get_name(), "Discovery", duration)
-                self.timings.append(timing)
-                logging.info("%s discovery plugin done.", plugin.get_name())
-                plugins_ran.append(plugin.get_name())
-        logging.info("---Discovery---")
-
-        logging.info("---Tools---")
-        enabled_plugins = self.config.get_enabled_tool_plugins(level)
-        if not enabled_plugins:
-            enabled_plugins = list(self.tool_plugins)
-        plugins_to_run = copy.copy(enabled_plugins)
-        plugins_ran = []
-        plugin_dependencies: list[str] = []
-        while plugins_to_run:
-            plugin_name = plugins_to_run[0]
+            discovery_plugins = self.config.get_enabled_discovery_plugins(level)
+            if not discovery_plugins:
+                discovery_plugins = list(self.discovery_plugins)
+            # Get timing information for finding files for discovery plugins.
+            dummy_plugin = DiscoveryPlugin()
+            dummy_plugin.set_plugin_context(plugin_context)
+            with Profiler.span("find files", "plugin") as span:
+                dummy_plugin.find_files(package, self.exceptions)
+            duration = format(span.duration, ".4f")
+            timing = Timing(package.name, "find files", "Discovery", duration)
+            self.timings.append(timing)
 
-            if plugin_name not in self.tool_plugins:
-                logging.error("Can't find specified tool plugin %s!", plugin_name)
-                return None, False
+            plugins_ran: list[Any] = []
+            for plugin_name in discovery_plugins:
+                if plugin_name not in self.discovery_plugins:
+                    logging.error(
+                        "Can't find specified discovery plugin %s!", plugin_name
+                    )
+                    return None, False
 
-            if args.force_tool_list is not None:
-                force_tool_list = args.force_tool_list.split(",")
-                if (
-                    plugin_name not in force_tool_list
-                    and plugin_name not in plugin_dependencies
-                ):
-                    logging.info("Skipping plugin not in force list %s!", plugin_name)
-                    plugins_to_run.remove(plugin_name)
-                    continue
+                plugin = self.discovery_plugins[plugin_name]
+                dependencies = plugin.get_discovery_dependencies()
+                for dependency_name in dependencies:
+                    dependency_plugin = self.discovery_plugins[dependency_name]
+                    if dependency_plugin.get_name() in plugins_ran:
+                        continue
+                    dependency_plugin.set_plugin_context(plugin_context)
+                    logging.info(
+                        "Running %s discovery plugin...", dependency_plugin.get_name()
+                    )
+                    with Profiler.span(dependency_plugin.get_name(), "plugin") as span:
+                        dependency_plugin.scan(package, level, self.exceptions)
+                    duration = format(span.duration, ".4f")
+                    timing = Timing(
+                        package.name,
+                        dependency_plugin.get_name(),
+                        "Discovery",
+                        duration,
+                    )
+                    self.timings.append(timing)
+                    logging.info(
+                        "%s discovery plugin done.", dependency_plugin.get_name()
+                    )
+                    plugins_ran.append(dependency_plugin.get_name())
+
+                if plugin.get_name() not in plugins_ran:
+                    plugin.set_plugin_context(plugin_context)
+                    logging.info("Running %s discovery plugin...", plugin.get_name())
+                    with Profiler.span(plugin.get_name(), "plugin") as span:
+                        plugin.scan(package, level, self.exceptions)
+                    duration = format(span.duration, ".4f")
+                    timing = Timing(
+                        package.name, plugin.get_name(), "Discovery", duration
+                    )
+                    self.timings.append(timing)
+                    logging.info("%s discovery plugin done.", plugin.get_name())
+                    plugins_ran.append(plugin.get_name())
+        logging.info("---Discovery---")
 
-            plugin = self.tool_plugins[plugin_name]
-            plugin.set_plugin_context(plugin_context)
+        with Profiler.span("tools", "stage"):
+            logging.info("---Tools---")
+            enabled_plugins = self.config.get_enabled_tool_plugins(level)
+            if not enabled_plugins:
+                enabled_plugins = list(self.tool_plugins)
+            tool_graph = self.get_tool_graph(enabled_plugins, args.force_tool_list)
+            if tool_graph is None:
+                return None, False
 
-            dependencies = plugin.get_tool_dependencies()
-            dependencies_met = True
-            for dependency_name in dependencies:
-                if dependency_name not in plugins_ran:
-                    if dependency_name not in enabled_plugins:
-                        logging.error(
-                            "Plugin %s depends on plugin %s which isn't enabled!",
-                            plugin_name,
-                            dependency_name,
-                        )
-                        return None, False
-                    plugin_dependencies.append(dependency_name)
-                    if dependency_name in plugins_to_run:
-                        plugins_to_run.remove(dependency_name)
-                    plugins_to_run.insert(0, dependency_name)
-                    dependencies_met = False
-
-            if not dependencies_met:
-                continue
+            for plugin_name in tool_graph:
+                self.tool_plugins[plugin_name].set_plugin_context(plugin_context)
 
-            logging.info("Running %s tool plugin...", plugin.get_name())
-            plugin_start = time.time()
-            tool_issues = plugin.scan(package, level)
-            duration = format(time.time() - plugin_start, ".4f")
-            timing = Timing(package.name, plugin.get_name(), "Tool", duration)
-            self.timings.append(timing)
-            self.add_tool_version(plugin.get_name(), plugin.get_version())
-            if tool_issues is not None:
-                issues[plugin_name] = tool_issues
-                logging.info("%s tool plugin done.", plugin.get_name())
-            else:
-                logging.error("%s tool plugin failed", plugin.get_name())
+            tool_jobs = 1
+            if "tool_jobs" in args and args.tool_jobs is not None:
+                tool_jobs = args.tool_jobs
+            issues, tools_success = self.run_tool_plugins(
+                package, level, tool_graph, tool_jobs
+            )
+            if not tools_success:
                 success = False
-
-            plugins_to_run.remove(plugin_name)
-            plugins_ran.append(plugin_name)
-
         logging.info("---Tools---")
 
         if self.exceptions is not None:
@@ -600,27 +726,30 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         os.chdir(orig_path)
 
-        logging.info("---Reporting---")
-        reporting_plugins = self.config.get_enabled_reporting_plugins(level)
-        if not reporting_plugins:
-            if "print_to_console" in self.reporting_plugins:
-                reporting_plugins = ["print_to_console"]
-            else:
-                reporting_plugins = list(self.reporting_plugins)
-        for plugin_name in reporting_plugins:
-            if plugin_name not in self.reporting_plugins:
-                logging.error("Can't find specified reporting plugin %s!", plugin_name)
-                return None, False
+        with Profiler.span("reporting", "stage"):
+            logging.info("---Reporting---")
+            reporting_plugins = self.config.get_enabled_reporting_plugins(level)
+            if not reporting_plugins:
+                if "print_to_console" in self.reporting_plugins:
+                    reporting_plugins = ["print_to_console"]
+                else:
+                    reporting_plugins = list(self.reporting_plugins)
+            for plugin_name in reporting_plugins:
+                if plugin_name not in self.reporting_plugins:
+                    logging.error(
+                        "Can't find specified reporting plugin %s!", plugin_name
+                    )
+                    return None, False
 
-            plugin = self.reporting_plugins[plugin_name]
-            plugin.set_plugin_context(plugin_context)
-            logging.info("Running %s reporting plugin...", plugin.get_name())
-            plugin_start = time.time()
-            plugin.report(package, issues, level)
-            duration = format(time.time() - plugin_start, ".4f")
-            timing = Timing(package.name, plugin.get_name(), "Reporting", duration)
-            self.timings.append(timing)
-            logging.info("%s reporting plugin done.", plugin.get_name())
+                plugin = self.reporting_plugins[plugin_name]
+                plugin.set_plugin_context(plugin_context)
+                logging.info("Running %s reporting plugin...", plugin.get_name())
+                with Profiler.span(plugin.get_name(), "plugin") as span:
+                    plugin.report(package, issues, level)
+                duration = format(span.duration, ".4f")
+                timing = Timing(package.name, plugin.get_name(), "Reporting", duration)
+                self.timings.append(timing)
+                logging.info("%s reporting plugin done.", plugin.get_name())
         logging.info("---Reporting---")
 
         if start_time is not None:
@@ -631,10 +760,211 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         return issues, success
 
+    def get_tool_graph(
+        self, enabled_plugins: list[str], force_tool_list: str | None = None
+    ) -> dict[str, list[str]] | None:
+        """Resolve which tool plugins to run and what each of them depends on.
+
+        Plugins missing from the force list are skipped unless another plugin that
+        will run depends on them.
+
+        Args:
+            enabled_plugins: Tool plugins enabled for the current level.
+            force_tool_list: Comma separated list of the only tools to run.
+
+        Returns:
+            Tool plugins to run, in enabled order, mapped to their dependencies. None
+            if a plugin or one of its dependencies is not available.
+        """
+        for plugin_name in enabled_plugins:
+            if plugin_name not in self.tool_plugins:
+                logging.error("Can't find specified tool plugin %s!", plugin_name)
+                return None
+
+        plugins_to_run = enabled_plugins
+        if force_tool_list is not None:
+            force_tools = force_tool_list.split(",")
+            plugins_to_run = [
+                plugin_name
+                for plugin_name in enabled_plugins
+                if plugin_name in force_tools
+            ]
+
+        graph: dict[str, list[str]] = {}
+        while plugins_to_run:
+            plugin_name = plugins_to_run[0]
+            plugins_to_run = plugins_to_run[1:]
+            if plugin_name in graph:
+                continue
+            dependencies = list(self.tool_plugins[plugin_name].get_tool_dependencies())
+            for dependency_name in dependencies:
+                if dependency_name not in enabled_plugins:
+                    logging.error(
+                        "Plugin %s depends on plugin %s which isn't enabled!",
+                        plugin_name,
+                        dependency_name,
+                    )
+                    return None
+            graph[plugin_name] = dependencies
+            plugins_to_run += dependencies
+
+        for plugin_name in enabled_plugins:
+            if plugin_name not in graph:
+                logging.info("Skipping plugin not in force list %s!", plugin_name)
+
+        return {
+            plugin_name: graph[plugin_name]
+            for plugin_name in enabled_plugins
+            if plugin_name in graph
+        }
+
+    def run_tool_plugins(
+        self,
+        package: Package,
+        level: str,
+        tool_graph: dict[str, list[str]],
+        tool_jobs: int = 1,
+    ) -> tuple[dict[str, list[Issue]], bool]:
+        """Run tool plugins, starting each one as soon as its dependencies are done.
+
+        Up to `tool_jobs` plugins run at the same time. Plugins that are ready at the
+        same time are started in the order of the tool graph.
+
+        Args:
+            package: Package to scan.
+            level: Level at which to scan.
+            tool_graph: Tool plugins to run mapped to their dependencies.
+            tool_jobs: Maximum number of tool plugins to run at the same time.
+
+        Returns:
+            Issues found by each tool plugin and success status.
+        """
+        success = True
+        results: dict[str, list[Issue] | None] = {}
+        remaining = dict(tool_graph)
+        running: dict[Future[tuple[list[Issue] | None, str, str]], str] = {}
+        with ThreadPoolExecutor(max_workers=max(tool_jobs, 1)) as executor:
+            while remaining or running:
+                ready = [
+                    plugin_name
+                    for plugin_name, dependencies in remaining.items()
+                    if all(dependency in results for dependency in dependencies)
+                ]
+                for plugin_name in ready[: max(tool_jobs - len(running), 0)]:
+                    del remaining[plugin_name]
+                    # Copy the context so that the plugin span nests in the stage.
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self.run_tool_plugin,
+                        package,
+                        level,
+                        plugin_name,
+                    )
+                    running[future] = plugin_name
+
+                if not running:
+                    logging.error(
+                        "Tool plugins %s have circular dependencies!",
+                        ", ".join(remaining),
+                    )
+                    success = False
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plugin_name = running.pop(future)
+                    tool_issues, duration, tool_version = future.result()
+                    plugin = self.tool_plugins[plugin_name]
+                    timing = Timing(package.name, plugin.get_name(), "Tool", duration)
+                    self.timings.append(timing)
+                    self.add_tool_version(plugin.get_name(), tool_version)
+                    results[plugin_name] = tool_issues
+                    if tool_issues is not None:
+                        logging.info("%s tool plugin done.", plugin.get_name())
+                    else:
+                        logging.error("%s tool plugin failed", plugin.get_name())
+                        success = False
+
+        issues: dict[str, list[Issue]] = {}
+        for plugin_name in tool_graph:
+            tool_issues = results.get(plugin_name)
+            if tool_issues is not None:
+                issues[plugin_name] = tool_issues
+        return issues, success
+
+    def run_tool_plugin(
+        self, package: Package, level: str, plugin_name: str
+    ) -> tuple[list[Issue] | None, str, str]:
+        """Run a single tool plugin against a package.
+
+        Args:
+            package: Package to scan.
+            level: Level at which to scan.
+            plugin_name: Name of the tool plugin to run.
+
+        Returns:
+            Issues found by the tool (None on failure), duration and tool version.
+        """
+        plugin = self.tool_plugins[plugin_name]
+        logging.info("Running %s tool plugin...", plugin.get_name())
+        with Profiler.span(plugin.get_name(), "plugin") as span:
+            tool_issues = plugin.scan(package, level)
+        duration = format(span.duration, ".4f")
+        return tool_issues, duration, plugin.get_version()
+
+    @staticmethod
+    def get_changed_files(
+        path: str, revision: str, include_untracked: bool = False
+    ) -> set[str] | None:
+        """Get the files below a path that changed since a git revision.
+
+        Args:
+            path: Path inside a git repository.
+            revision: Git revision to compare against.
+            include_untracked: Whether to include untracked files.
+
+        Returns:
+            Absolute paths of changed files, or None if git failed.
+        """
+        commands = [
+            [
+                "git",
+                "diff",
+                "--name-only",
+                "--relative",
+                "--diff-filter=d",
+                "-z",
+                revision,
+                "--",
+            ]
+        ]
+        if include_untracked:
+            commands.append(["git", "ls-files", "--others", "--exclude-standard", "-z"])
+
+        changed_files: set[str] = set()
+        for command in commands:
+            try:
+                output = subprocess.check_output(
+                    command, cwd=path, stderr=subprocess.PIPE, universal_newlines=True
+                )
+            except subprocess.CalledProcessError as ex:
+                logging.error(
+                    "Unable to get files changed since %s: %s", revision, ex.stderr
+                )
+                return None
+            except OSError as ex:
+                logging.error("Couldn't find git executable! (%s)", ex)
+                return None
+            changed_files.update(
+                os.path.join(path, fname) for fname in output.split("\0") if fname
+            )
+
+        return changed_files
+
     def run_workspace(
         self, parsed_args: argparse.Namespace, start_time: float | None = None
     ) -> tuple[
-        dict[str, list[Issue]] | None, bool
+        dict[str, IssueStore] | None, bool
     ]:  # pylint: disable=too-many-locals, too-many-branches, too-many-statements
         """Run statick on a workspace.
 
@@ -657,23 +987,16 @@ class Statick:  # pylint: disable=too-many-instance-attributes
                     return None, False
 
         ignore_packages = self.get_ignore_packages()
-        ignore_files = ["AMENT_IGNORE", "CATKIN_IGNORE", "COLCON_IGNORE"]
-        package_indicators = ["package.xml", "setup.py", "pyproject.toml"]
+        cache_dir = None
+        if "cache_dir" in parsed_args and not (
+            "no_cache" in parsed_args and parsed_args.no_cache
+        ):
+            cache_dir = parsed_args.cache_dir
 
-        packages = []
-        for root, dirs, files in os.walk(parsed_args.path):
-            if any(item in files for item in ignore_files):
-                dirs.clear()
-                continue
-            for sub_dir in dirs:
-                full_dir = os.path.join(root, sub_dir)
-                files = os.listdir(full_dir)
-                if any(item in package_indicators for item in files) and not any(
-                    item in files for item in ignore_files
-                ):
-                    if ignore_packages and sub_dir in ignore_packages:
-                        continue
-                    packages.append(Package(sub_dir, full_dir))
+        packages, package_sizes = WorkspaceIndex.find_packages(parsed_args.path)
+        packages = [
+            package for package in packages if package.name not in ignore_packages
+        ]
 
         if parsed_args.packages_file is not None:
             packages_file_list = []
@@ -702,20 +1025,41 @@ class Statick:  # pylint: disable=too-many-instance-attributes
         count = 0
         total_issues: list[Any] = []
         num_packages = len(packages)
-        mp_args = []
+        scheduler = PackageScheduler(cache_dir)
         if multiprocessing.get_start_method() == "fork":
+            # Probe tool versions once so that every worker process inherits them.
+            self.probe_tool_versions(packages, parsed_args)
             logging.info("-- Scanning %d packages --", num_packages)
-            for package in packages:
+            # Start the longest packages first, but combine results in walk order so
+            # that reports do not depend on which package finished first. A single
+            # worker takes the same time in any order.
+            indices = {id(package): index for index, package in enumerate(packages)}
+            ordered_packages = packages
+            if parsed_args.max_procs > 1:
+                ordered_packages = scheduler.get_order(packages, package_sizes)
+            mp_args = []
+            for package in ordered_packages:
                 count += 1
-                mp_args.append((parsed_args, count, package, num_packages))
+                mp_args.append(
+                    (indices[id(package)], parsed_args, count, package, num_packages)
+                )
 
+            results: list[Any] = [None] * num_packages
+            all_timings: list[list[Timing]] = [[] for _ in packages]
             with multiprocessing.Pool(parsed_args.max_procs) as pool:
-                total_issues, all_timings = zip(  # type: ignore
-                    *pool.starmap(self.scan_package, mp_args)
-                )
-                for timings in all_timings:
-                    for timing in timings:
-                        self.timings.append(timing)
+                for done, result in enumerate(
+                    pool.imap_unordered(self.scan_package_timed, mp_args), 1
+                ):
+                    index, pkg_issues, pkg_timings, pkg_duration, pkg_spans = result
+                    results[index] = pkg_issues
+                    Profiler.add_spans(pkg_spans)
+                    all_timings[index] = pkg_timings
+                    scheduler.record(packages[index], pkg_duration)
+                    logging.info("-- %d of %d packages done --", done, num_packages)
+            total_issues = results
+            for timings in all_timings:
+                for timing in timings:
+                    self.timings.append(timing)
         else:
             logging.warning(
                 "Statick's plugin manager does not currently support multiprocessing"
@@ -724,30 +1068,32 @@ class Statick:  # pylint: disable=too-many-instance-attributes
             logging.info("-- Scanning %d packages --", num_packages)
             for package in packages:
                 count += 1
-                pkg_issues, pkg_timings = self.scan_package(
-                    parsed_args, count, package, num_packages
+                _, pkg_issues, pkg_timings, pkg_duration, pkg_spans = (
+                    self.scan_package_timed(
+                        (count - 1, parsed_args, count, package, num_packages)
+                    )
                 )
+                Profiler.add_spans(pkg_spans)
+                scheduler.record(package, pkg_duration)
                 total_issues.append(pkg_issues)
                 for timing in pkg_timings:
                     self.timings.append(timing)
                     break
 
+        scheduler.save_durations()
         logging.info("-- All packages run --")
         logging.info("-- overall report --")
 
         success = True
-        issues: dict[str, list[Issue]] = {}
+        issues: dict[str, IssueStore] = {}
         for issue in total_issues:
             if issue is not None:
                 for key, value in list(issue.items()):
-                    if key in issues:
-                        issues[key] += value
-                        if value:
-                            success = False
-                    else:
-                        issues[key] = value
-                        if value:
-                            success = False
+                    if key not in issues:
+                        issues[key] = IssueStore()
+                    issues[key].extend(value)
+                    if value:
+                        success = False
 
         enabled_reporting_plugins: list[str] = []
 
@@ -788,6 +1134,42 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         return issues, success
 
+    def probe_tool_versions(
+        self, packages: list[Package], args: argparse.Namespace
+    ) -> None:
+        """Probe the versions of tools that are enabled for any of the packages.
+
+        Args:
+            packages: Packages that will be scanned.
+            args: Arguments from command line.
+        """
+        if self.config is None:
+            return
+
+        plugin_names: list[str] = []
+        levels = {self.get_level(package.path, args) for package in packages}
+        for level in levels:
+            if level is None or (
+                level != self.default_level and not self.config.has_level(level)
+            ):
+                continue
+            enabled_plugins = self.config.get_enabled_tool_plugins(level)
+            if not enabled_plugins:
+                enabled_plugins = list(self.tool_plugins)
+            for plugin_name in enabled_plugins:
+                if plugin_name in self.tool_plugins and plugin_name not in plugin_names:
+                    plugin_names.append(plugin_name)
+
+        if "force_tool_list" in args and args.force_tool_list is not None:
+            force_tool_list = args.force_tool_list.split(",")
+            plugin_names = [name for name in plugin_names if name in force_tool_list]
+
+        plugin_context = PluginContext(args, self.resources, self.config)
+        for plugin_name in plugin_names:
+            plugin = self.tool_plugins[plugin_name]
+            plugin.set_plugin_context(plugin_context)
+            plugin.get_version()
+
     def scan_package(
         self,
         parsed_args: argparse.Namespace,
@@ -849,6 +1231,31 @@ class Statick:  # pylint: disable=too-many-instance-attributes
 
         return issues, timings
 
+    def scan_package_timed(
+        self, scan_args: tuple[int, argparse.Namespace, int, Package, int]
+    ) -> tuple[int, dict[str, IssueStore] | None, list[Timing], float, list[Span]]:
+        """Scan a package and measure how long the scan took.
+
+        Issues are returned in compact stores, which are much smaller to send back
+        from a worker process than lists of issues.
+
+        Args:
+            scan_args: Index of the package in the workspace, followed by the
+                arguments of scan_package.
+
+        Returns:
+            Index of the package, issues found, timings, duration in seconds and the
+            profiling spans recorded by this process.
+        """
+        index, parsed_args, count, package, num_packages = scan_args
+        start = time.perf_counter()
+        issues, timings = self.scan_package(parsed_args, count, package, num_packages)
+        stores = None
+        if issues is not None:
+            stores = {key: IssueStore(value) for key, value in issues.items()}
+        duration = time.perf_counter() - start
+        return index, stores, timings, duration, Profiler.pop_spans()
+
     @staticmethod
     def print_no_issues() -> None:
         """Print that no information about issues was found."""
@@ -1,16 +1,29 @@
 """Tool plugin."""
 
 import argparse
+import collections
+import contextvars
+import heapq
 import logging
 import os
 import re
 import shlex
 import subprocess
-from typing import Any, Match, Pattern
+import sys
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Iterator, Match, Pattern, TypeVar
 
 from statick_tool.issue import Issue
 from statick_tool.package import Package
 from statick_tool.plugin_context import PluginContext
+from statick_tool.profiler import Profiler
+from statick_tool.resource_cache import ResourceCache
+from statick_tool.result_cache import ResultCache
+from statick_tool.tool_probe import ToolProbe
+
+S = TypeVar("S")
+T = TypeVar("T")
 
 
 class ToolPlugin:
@@ -19,6 +32,10 @@ class ToolPlugin:
     plugin_context = None
     TOOL_MISSING_STR = "Not installed"
     TOOL_UNKNOWN_STR = "Unknown"
+    # Number of lines of streamed output kept for the error of a failed command.
+    STREAM_TAIL_LINES = 100
+    # Characters besides \n that str.splitlines() treats as line breaks.
+    OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
 
     def get_name(self) -> str:  # type: ignore[empty-body]
         """Get name of tool.
@@ -37,6 +54,29 @@ class ToolPlugin:
         """
         return []
 
+    @classmethod
+    def is_file_local(cls) -> bool:
+        """Return whether the tool reports issues for each file on its own.
+
+        Results for file-local tools only depend on the contents of each file, so they
+        can be stored in the result cache and reused for unchanged files.
+
+        Returns:
+            True if the tool results for a file do not depend on other files.
+        """
+        return False
+
+    @classmethod
+    def get_config_file_names(cls) -> list[str]:
+        """Get names of configuration files the tool reads from the package root.
+
+        Changes to these files invalidate cached results.
+
+        Returns:
+            List of file names relative to the package path.
+        """
+        return []
+
     def gather_args(self, args: argparse.Namespace) -> None:
         """Gather arguments.
 
@@ -69,7 +109,8 @@ class ToolPlugin:
     def get_version(self) -> str:
         """Figure out and return the version of the tool that's installed.
 
-        If no version is found the function returns "Unknown".
+        If no version is found the function returns "Unknown". The version is only
+        probed once for each build of the tool.
 
         Returns:
             Version of the tool that's installed.
@@ -78,16 +119,15 @@ class ToolPlugin:
         if not tool_bin:
             return self.TOOL_UNKNOWN_STR
 
-        try:
-            output = subprocess.check_output(
-                [tool_bin, "--version"], stderr=subprocess.STDOUT
-            )
-            return output.decode("utf-8")
-        except subprocess.CalledProcessError:  # NOLINT
-            return self.TOOL_UNKNOWN_STR
-        except FileNotFoundError:  # NOLINT
+        exe_path = ToolProbe.find_executable(tool_bin)
+        if exe_path is None:
             return self.TOOL_MISSING_STR
 
+        output = ToolProbe.get_output([tool_bin, "--version"], exe_path)
+        if output is None:
+            return self.TOOL_UNKNOWN_STR
+        return output
+
     def get_version_from_pkg(self, subproc_args: list[str], ver_re_str: str) -> str:
         """Figure out and return the version of the tool that's installed.
 
@@ -102,15 +142,8 @@ class ToolPlugin:
         """
         version = self.TOOL_MISSING_STR
 
-        try:
-            output = subprocess.check_output(
-                subproc_args,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-            )
-        except subprocess.CalledProcessError:  # NOLINT
-            return self.TOOL_UNKNOWN_STR
-        except FileNotFoundError:  # NOLINT
+        output = ToolProbe.get_output(subproc_args)
+        if output is None:
             return self.TOOL_UNKNOWN_STR
 
         parse: Pattern[str] = re.compile(ver_re_str)
@@ -185,21 +218,143 @@ class ToolPlugin:
                 files += package[file_type]
 
         if files:
+            user_flags = self.get_user_flags(level)
+            cached_issues, files, cache_keys = self.load_cached_results(
+                package, level, files, user_flags
+            )
+            if not files:
+                return cached_issues
+
             total_output = (  # pylint: disable=assignment-from-no-return
-                self.process_files(package, level, files, self.get_user_flags(level))
+                self.process_files(package, level, files, user_flags)
             )
             if total_output is not None:
-                if self.plugin_context and self.plugin_context.args.output_directory:
-                    with open(self.get_name() + ".log", "w", encoding="utf8") as fid:
+                Profiler.add_counts(
+                    sum(len(output) for output in total_output), len(files)
+                )
+                log_file = self.get_log_file()
+                if log_file is not None:
+                    with open(log_file, "w", encoding="utf8") as fid:
                         for output in total_output:
                             fid.write(output)
 
-                return self.parse_output(total_output, package)
+                issues = self.parse_output(total_output, package)
+                self.store_cached_results(cache_keys, issues)
+                return cached_issues + issues
 
             return None
 
         return []
 
+    def get_result_cache(self) -> ResultCache | None:
+        """Get the result cache to use for this tool.
+
+        Returns:
+            Result cache, or None if caching is disabled or not supported by the tool.
+        """
+        if self.plugin_context is None or not self.is_file_local():
+            return None
+        args = self.plugin_context.args
+        if "cache_dir" not in args or args.cache_dir is None:
+            return None
+        if "no_cache" in args and args.no_cache:
+            return None
+        max_size = None
+        if "cache_max_size" in args:
+            max_size = args.cache_max_size
+        return ResultCache(args.cache_dir, max_size)
+
+    def load_cached_results(
+        self, package: Package, level: str, files: list[str], user_flags: list[str]
+    ) -> tuple[list[Issue], list[str], dict[str, str]]:
+        """Look up cached results for files.
+
+        Args:
+            package: Package being scanned.
+            level: Level at which to scan.
+            files: Files to scan.
+            user_flags: User-defined flags.
+
+        Returns:
+            Cached issues, files that still have to be scanned and the cache keys to
+            store the results for those files under.
+        """
+        cache = self.get_result_cache()
+        if cache is None:
+            return [], files, {}
+
+        tool_version = self.get_version()
+        if tool_version in (self.TOOL_MISSING_STR, self.TOOL_UNKNOWN_STR):
+            return [], files, {}
+
+        config_hashes: list[str | None] = []
+        for config_file in self.get_config_file_names():
+            config_hashes.append(
+                ResultCache.hash_file(os.path.join(package.path, config_file))
+            )
+        context = [
+            ResultCache.get_statick_version(),
+            self.get_name(),
+            self.get_binary(level, package),
+            tool_version,
+            user_flags,
+            level,
+            config_hashes,
+        ]
+
+        cached_issues: list[Issue] = []
+        uncached_files: list[str] = []
+        cache_keys: dict[str, str] = {}
+        for fname in files:
+            key = ResultCache.get_key(context, fname)
+            file_issues = None
+            if key is not None:
+                file_issues = cache.load(key, fname)
+            if file_issues is None:
+                uncached_files.append(fname)
+                if key is not None:
+                    cache_keys[os.path.abspath(fname)] = key
+            else:
+                cached_issues += file_issues
+
+        logging.info(
+            "  %s: %d of %d files found in result cache.",
+            self.get_name(),
+            len(files) - len(uncached_files),
+            len(files),
+        )
+        return cached_issues, uncached_files, cache_keys
+
+    def store_cached_results(
+        self, cache_keys: dict[str, str], issues: list[Issue]
+    ) -> None:
+        """Store results for scanned files in the result cache.
+
+        Nothing is stored if an issue can not be matched to one of the scanned files.
+
+        Args:
+            cache_keys: Cache keys for the scanned files.
+            issues: Issues found in the scanned files.
+        """
+        cache = self.get_result_cache()
+        if cache is None or not cache_keys:
+            return
+
+        file_issues: dict[str, list[Issue]] = {fname: [] for fname in cache_keys}
+        for issue in issues:
+            fname = os.path.abspath(issue.filename)
+            if fname not in file_issues:
+                logging.debug(
+                    "  %s: Not caching results, issue for unexpected file %s.",
+                    self.get_name(),
+                    issue.filename,
+                )
+                return
+            file_issues[fname].append(issue)
+
+        for fname, key in cache_keys.items():
+            cache.store(key, file_issues[fname])
+
     def process_files(
         self, package: Package, level: str, files: list[str], user_flags: list[str]
     ) -> list[str] | None:
@@ -215,6 +370,483 @@ class ToolPlugin:
             List of output from tool.
         """
 
+    def get_max_procs(self) -> int:
+        """Get the number of processes the tool may run at the same time.
+
+        Returns:
+            Value of --max-procs, or 1 if it is not set.
+        """
+        if (
+            self.plugin_context is not None
+            and "max_procs" in self.plugin_context.args
+            and self.plugin_context.args.max_procs
+        ):
+            return max(1, int(self.plugin_context.args.max_procs))
+        return 1
+
+    def run_per_file(
+        self, func: Callable[[S], T], files: list[S]
+    ) -> Iterator[tuple[S, "Future[T]"]]:
+        """Call a function for each file on a bounded pool of threads.
+
+        This is for tools that are run once per file, so that several runs of the tool
+        happen at the same time. At most get_max_procs() calls run at once. Results
+        are yielded in the order of the files, and an exception raised by a call is
+        raised again by the result of its future. Calls that have not started are
+        cancelled if the caller stops early.
+
+        Args:
+            func: Function to call with each file, usually running the tool.
+            files: Files, or batches of files, to call the function with.
+
+        Yields:
+            Each file along with the future holding the result of its call.
+        """
+        max_workers = min(self.get_max_procs(), len(files))
+        if max_workers <= 1:
+            for src in files:
+                future: Future[T] = Future()
+                try:
+                    future.set_result(func(src))
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    future.set_exception(ex)
+                yield src, future
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            # Copy the context so that profiling spans nest in the calling plugin.
+            futures = [
+                executor.submit(contextvars.copy_context().run, func, src)
+                for src in files
+            ]
+            yield from zip(files, futures)
+        except GeneratorExit:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def get_arg_max() -> int:
+        """Get the number of bytes available for the arguments of a command.
+
+        The environment is passed along with the arguments, so its size is subtracted
+        from the system limit.
+
+        Returns:
+            Number of bytes available for arguments.
+        """
+        if sys.platform == "win32":
+            # The command line of CreateProcess is limited to 32767 characters.
+            return 32767 - 2048
+        try:
+            arg_max = os.sysconf("SC_ARG_MAX")
+        except (AttributeError, OSError, ValueError):
+            arg_max = -1
+        if arg_max <= 0:
+            arg_max = 128 * 1024
+        env_size = sum(
+            len(key) + len(value) + 2 + 8 for key, value in os.environ.items()
+        )
+        return max(4096, arg_max - env_size - 4096)
+
+    @classmethod
+    def batch_files(
+        cls, command: list[str], files: list[str], arg_max: int | None = None
+    ) -> list[list[str]]:
+        """Split files into batches that fit on the command line of a command.
+
+        Args:
+            command: Command the files are appended to.
+            files: Files to split.
+            arg_max: Number of bytes available for arguments, or None to use the
+                system limit.
+
+        Returns:
+            Batches of files, in the original order.
+        """
+        if arg_max is None:
+            arg_max = cls.get_arg_max()
+
+        def arg_size(arg: str) -> int:
+            # Each argument also takes a terminating null byte and a pointer.
+            return len(os.fsencode(arg)) + 1 + 8
+
+        available = arg_max - sum(arg_size(arg) for arg in command)
+        batches: list[list[str]] = []
+        batch: list[str] = []
+        batch_size = 0
+        for src in files:
+            size = arg_size(src)
+            if batch and batch_size + size > available:
+                batches.append(batch)
+                batch = []
+                batch_size = 0
+            batch.append(src)
+            batch_size += size
+        if batch or not batches:
+            batches.append(batch)
+        return batches
+
+    def get_shards(self, level: str) -> int:
+        """Get the number of shards to split the files of the tool into.
+
+        Sharding is enabled with the `shards` key of the tool in the level config.
+        It can be set to a number, or to `auto` to use --max-procs shards.
+
+        Args:
+            level: Level at which to scan.
+
+        Returns:
+            Number of shards, which is 1 if sharding is not enabled.
+        """
+        if self.plugin_context is None or self.plugin_context.config is None:
+            return 1
+        shards = self.plugin_context.config.get_tool_config(
+            self.get_name(), level, "shards"
+        )
+        if shards is None:
+            return 1
+        if shards == "auto":
+            return self.get_max_procs()
+        try:
+            return max(1, int(shards))
+        except ValueError:
+            logging.warning("Invalid shards for %s: %s", self.get_name(), shards)
+            return 1
+
+    @staticmethod
+    def shard_files(files: list[str], shards: int) -> list[list[str]]:
+        """Split files into shards with about the same total size.
+
+        Args:
+            files: Files to split.
+            shards: Number of shards.
+
+        Returns:
+            Shards of files. Files keep their original order within each shard.
+        """
+        sizes: dict[str, int] = {}
+        for src in files:
+            try:
+                sizes[src] = os.path.getsize(src)
+            except OSError:
+                sizes[src] = 0
+
+        shards = max(1, min(shards, len(files)))
+        # Place the largest files first, each in the shard that is smallest so far.
+        shard_sizes = [(0, index) for index in range(shards)]
+        shard_of: dict[str, int] = {}
+        for src in sorted(files, key=lambda src: sizes[src], reverse=True):
+            size, index = heapq.heappop(shard_sizes)
+            shard_of[src] = index
+            heapq.heappush(shard_sizes, (size + sizes[src], index))
+
+        sharded: list[list[str]] = [[] for _ in range(shards)]
+        for src in files:
+            sharded[shard_of[src]].append(src)
+        return [shard for shard in sharded if shard]
+
+    @staticmethod
+    def check_output_profiled(command: list[str], file_count: int = 0) -> str:
+        """Run a command as with subprocess.check_output, in a profiling span.
+
+        Args:
+            command: Command to run.
+            file_count: Number of files the command runs on.
+
+        Returns:
+            Output of the command, with stderr included.
+
+        Raises:
+            subprocess.CalledProcessError: The command failed.
+        """
+        with Profiler.span(os.path.basename(command[0]), "subprocess"):
+            try:
+                output = subprocess.check_output(
+                    command, stderr=subprocess.STDOUT, universal_newlines=True
+                )
+            except subprocess.CalledProcessError as ex:
+                Profiler.add_counts(len(ex.output or ""), file_count)
+                raise
+            Profiler.add_counts(len(output), file_count)
+        return output
+
+    def check_output_batched(
+        self,
+        command: list[str],
+        files: list[str],
+        file_list_flag: str | None = None,
+        shards: int = 1,
+    ) -> str:
+        """Run a command on files, splitting the files if they do not fit in one run.
+
+        If all of the files fit on the command line, the command is run once, exactly
+        as with subprocess.check_output. Otherwise, if the tool can read files from a
+        list, the files are written to a temporary list. If not, the files are split
+        into batches which are run at the same time, up to get_max_procs(). The output
+        of the batches is joined in order, and if any batch fails then
+        subprocess.CalledProcessError is raised with the highest return code, or the
+        return code of a batch killed by a signal.
+
+        Files can also be split into shards of about the same size on purpose, so that
+        a single-threaded tool uses several processes.
+
+        Args:
+            command: Command to run, without the files.
+            files: Files to run the command on.
+            file_list_flag: Flag the file list is appended to, such as "--file-list=",
+                if the tool can read files from a list.
+            shards: Number of shards to split the files into, as from get_shards().
+
+        Returns:
+            Output of the command, with stderr included.
+
+        Raises:
+            subprocess.CalledProcessError: A run of the command failed.
+        """
+        if shards > 1 and len(files) > 1:
+            batches = [
+                batch
+                for shard in self.shard_files(files, shards)
+                for batch in self.batch_files(command, shard)
+            ]
+        else:
+            batches = self.batch_files(command, files)
+        if len(batches) == 1:
+            return self.check_output_profiled(command + files, len(files))
+
+        if file_list_flag is not None and shards <= 1:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                file_list = os.path.join(tmp_dir, "files.txt")
+                with open(file_list, "w", encoding="utf8") as fid:
+                    fid.write("\n".join(files) + "\n")
+                return self.check_output_profiled(
+                    command + [file_list_flag + file_list], len(files)
+                )
+
+        logging.info(
+            "Running %s in %d batches of files.", self.get_name(), len(batches)
+        )
+
+        def run_batch(batch: list[str]) -> tuple[int, str]:
+            """Run the command on a batch of files."""
+            try:
+                return 0, self.check_output_profiled(command + batch, len(batch))
+            except subprocess.CalledProcessError as ex:
+                return ex.returncode, ex.output
+
+        returncode = 0
+        outputs: list[str] = []
+        for _, result in self.run_per_file(run_batch, batches):
+            batch_returncode, output = result.result()
+            # A batch killed by a signal has a negative return code.
+            if batch_returncode < 0 or 0 <= returncode < batch_returncode:
+                returncode = batch_returncode
+            outputs.append(output)
+        output = "".join(outputs)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, output)
+        return output
+
+    def get_log_file(self) -> str | None:
+        """Get the file to write the raw output of the tool to.
+
+        Returns:
+            Name of the log file, or None if there is no output directory.
+        """
+        if self.plugin_context and self.plugin_context.args.output_directory:
+            return self.get_name() + ".log"
+        return None
+
+    def stream_output(
+        self, command: list[str], log_file: str | None = None
+    ) -> Iterator[str]:
+        """Run a command and yield its output one line at a time.
+
+        Unlike subprocess.check_output, the output is never held in memory as a whole,
+        so tools with very large output can be parsed as they run. The raw output is
+        written to the log file as it is read. Stopping early kills the command.
+
+        Args:
+            command: Command to run.
+            log_file: File to write the raw output to, or None.
+
+        Yields:
+            Lines of output, with stderr included, without line endings.
+
+        Raises:
+            subprocess.CalledProcessError: The command failed. The output of the error
+                only holds the last STREAM_TAIL_LINES lines.
+        """
+        yield from self.stream_output_batched(command, [], log_file, batch=False)
+
+    def stream_output_batched(
+        self,
+        command: list[str],
+        files: list[str],
+        log_file: str | None = None,
+        batch: bool = True,
+        shards: int = 1,
+    ) -> Iterator[str]:
+        """Run a command on files and yield its output one line at a time.
+
+        This is the streaming version of check_output_batched(). If the files do not fit
+        in one run, or are split into shards, the batches run at the same time, up to
+        get_max_procs(), with their output written to temporary files that are then
+        read in order.
+
+        Args:
+            command: Command to run, without the files.
+            files: Files to run the command on.
+            log_file: File to write the raw output to, or None.
+            batch: Whether to split the files into batches.
+            shards: Number of shards to split the files into, as from get_shards().
+
+        Yields:
+            Lines of output, with stderr included, without line endings.
+
+        Raises:
+            subprocess.CalledProcessError: A run of the command failed. The output of
+                the error only holds the last STREAM_TAIL_LINES lines.
+        """
+        batches = [files]
+        if batch and shards > 1 and len(files) > 1:
+            batches = [
+                shard_batch
+                for shard in self.shard_files(files, shards)
+                for shard_batch in self.batch_files(command, shard)
+            ]
+        elif batch:
+            batches = self.batch_files(command, files)
+        tail: collections.deque[str] = collections.deque(maxlen=self.STREAM_TAIL_LINES)
+        returncode = 0
+        log = None
+        if log_file is not None:
+            # pylint: disable-next=consider-using-with
+            log = open(log_file, "w", encoding="utf8")
+        try:
+            if len(batches) == 1:
+                with subprocess.Popen(
+                    command + batches[0],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                    errors="replace",
+                ) as proc:
+                    output_chars = 0
+                    try:
+                        for line in proc.stdout:  # type: ignore[union-attr]
+                            if log is not None:
+                                log.write(line)
+                            tail.append(line)
+                            output_chars += len(line)
+                            yield line.rstrip("\n")
+                    except GeneratorExit:
+                        proc.kill()
+                        raise
+                returncode = proc.returncode
+                Profiler.add_counts(output_chars, len(files))
+            else:
+                logging.info(
+                    "Running %s in %d batches of files.", self.get_name(), len(batches)
+                )
+
+                def run_batch(files: list[str]) -> tuple[int, IO[str]]:
+                    """Run the command on a batch of files, keeping its output on disk."""
+                    # pylint: disable-next=consider-using-with
+                    output = tempfile.TemporaryFile("w+", errors="replace")
+                    with Profiler.span(os.path.basename(command[0]), "subprocess"):
+                        batch_returncode = subprocess.call(
+                            command + files, stdout=output, stderr=subprocess.STDOUT
+                        )
+                        Profiler.add_counts(output.seek(0, os.SEEK_END), len(files))
+                    output.seek(0)
+                    return batch_returncode, output
+
+                for _, result in self.run_per_file(run_batch, batches):
+                    batch_returncode, output = result.result()
+                    # A batch killed by a signal has a negative return code.
+                    if batch_returncode < 0 or 0 <= returncode < batch_returncode:
+                        returncode = batch_returncode
+                    with output:
+                        for line in output:
+                            if log is not None:
+                                log.write(line)
+                            tail.append(line)
+                            yield line.rstrip("\n")
+        finally:
+            if log is not None:
+                log.close()
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, "".join(tail))
+
+    @classmethod
+    def find_line_matches(
+        cls, pattern: Pattern[str], output: str, prefix: str | None = None
+    ) -> Iterator[Match[str]]:
+        """Find the lines of tool output that match a pattern, in a single pass.
+
+        The matches are the same as from calling pattern.match() on each line from
+        output.splitlines(), without a call for every line. For that, the pattern must
+        be compiled with re.MULTILINE, start with ^ and never match a line break, so
+        whitespace is matched with [^\\S\\n] instead of \\s. Output whose lines only
+        end with \\n is searched without being copied.
+
+        If every line the pattern matches starts with the same text, passing it as
+        prefix skips the other lines without running the pattern on them.
+
+        Args:
+            pattern: Pattern to match at the start of each line.
+            output: Output of a tool.
+            prefix: Text that every matching line starts with.
+
+        Returns:
+            Matches in the order of the lines.
+        """
+        if any(char in output for char in cls.OTHER_LINE_BREAKS):
+            output = "\n".join(output.splitlines())
+        if prefix is None:
+            return pattern.finditer(output)
+        return cls.find_prefixed_line_matches(pattern, output, prefix)
+
+    @staticmethod
+    def find_prefixed_line_matches(
+        pattern: Pattern[str], output: str, prefix: str
+    ) -> Iterator[Match[str]]:
+        """Match a pattern against the lines of output that start with a prefix.
+
+        Lines are only separated by \\n. The next line with the prefix is found with
+        str.find, so lines without it are never looked at one by one.
+
+        Args:
+            pattern: Pattern to match at the start of each line.
+            output: Output of a tool.
+            prefix: Text that every matching line starts with.
+
+        Yields:
+            Matches in the order of the lines.
+        """
+        line_prefix = "\n" + prefix
+        if output.startswith(prefix):
+            start = 0
+        else:
+            start = output.find(line_prefix) + 1
+            if start == 0:
+                return
+        while True:
+            end = output.find("\n", start)
+            if end < 0:
+                end = len(output)
+            match = pattern.match(output, start, end)
+            if match is not None:
+                yield match
+            start = output.find(line_prefix, end) + 1
+            if start == 0:
+                return
+
     def parse_output(  # type: ignore[empty-body]
         self, total_output: list[str], package: Package | None = None
     ) -> list[Issue]:  # pyright: ignore
@@ -265,17 +897,7 @@ class ToolPlugin:
 
         if full_path is None:
             return {}
-        warning_mapping: dict[str, str] = {}
-        with open(full_path, "r", encoding="utf8") as mapping_file:
-            for line in mapping_file.readlines():
-                split_line = line.strip().split(":")
-                if len(split_line) != 2:
-                    logging.warning(
-                        "Invalid line %s in mapping file %s", line, file_name
-                    )
-                    continue
-                warning_mapping[split_line[0]] = split_line[1]
-        return warning_mapping
+        return ResourceCache.get_mapping(full_path, file_name)
 
     def get_user_flags(self, level: str, name: str | None = None) -> list[str]:
         """Get the user-defined extra flags for a specific tool/level combination.
@@ -313,42 +935,18 @@ class ToolPlugin:
         Returns:
             True if the path is a valid executable, False otherwise
         """
-        # On Windows, PATHEXT contains a list of extensions which can be
-        # appended to a program name when searching PATH.
-        extensions = os.environ.get("PATHEXT", None)
-        _, path_ext = os.path.splitext(path)
-        if path_ext or not extensions:
-            return os.path.isfile(path) and os.access(path, os.X_OK)
-
-        extensions_list = extensions.split(";")
-        # Add "" (no extension) as a possibility.
-        extensions_list.insert(0, "")
-        for ext in extensions_list:
-            extended_path = path + ext
-            if os.path.isfile(extended_path) and os.access(extended_path, os.X_OK):
-                return True
-
-        return False
+        return ToolProbe.get_executable_path(path) is not None
 
     @staticmethod
     def command_exists(command: str) -> bool:
         """Return whether a particular command is available on $PATH.
 
+        Lookups are cached for the life of the process.
+
         Args:
             command: Command to check for.
 
         Returns:
             True if the command is available on $PATH, False otherwise.
         """
-        fpath, _ = os.path.split(command)
-
-        if fpath:
-            # Contains a path, not just a command, so don't search PATH
-            return ToolPlugin.is_valid_executable(command)
-
-        for path in os.environ["PATH"].split(os.pathsep):
-            exe_path = os.path.join(path, command)
-            if ToolPlugin.is_valid_executable(exe_path):
-                return True
-
-        return False
+        return ToolProbe.find_executable(command) is not None
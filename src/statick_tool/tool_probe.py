@@ -0,0 +1,239 @@
+"""Process-wide cache of tool executable lookups and version probes.
+
+Statick looks up the same executables on $PATH and asks the same tools for their
+versions for every package it scans. Version probes spawn at least one process, and
+tools installed with npm spawn several. The results of those probes are kept for the
+life of the process.
+
+The output of running an executable can also be kept on disk so that later runs do not
+probe it again. Entries on disk are keyed by the resolved path, modification time and
+size of the executable, so upgrading a tool invalidates its entry.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+
+
+class ToolProbe:
+    """Process-wide cache of tool executable lookups and version probes."""
+
+    CACHE_FILE_NAME = "tool_versions.json"
+
+    _lock = threading.Lock()
+    _executables: dict[tuple[str, str, str], str | None] = {}
+    _outputs: dict[str, str | None] = {}
+    _cache_file: str | None = None
+    _disk_outputs: dict[str, str] | None = None
+
+    @classmethod
+    def set_cache_dir(cls, cache_dir: str | None) -> None:
+        """Set the directory to keep probe results in between runs.
+
+        Args:
+            cache_dir: Directory to keep probe results in, or None to only keep them in
+                memory.
+        """
+        with cls._lock:
+            cls._cache_file = None
+            if cache_dir is not None:
+                cls._cache_file = os.path.join(
+                    os.path.abspath(cache_dir), cls.CACHE_FILE_NAME
+                )
+            cls._disk_outputs = None
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget all probe results kept in memory."""
+        with cls._lock:
+            cls._executables.clear()
+            cls._outputs.clear()
+            cls._disk_outputs = None
+
+    @staticmethod
+    def get_executable_path(path: str) -> str | None:
+        """Get the path of an executable file, trying common extensions.
+
+        If the provided path has an extension on it, don't change it, otherwise try
+        adding common extensions.
+
+        Args:
+            path: Path to tool binary.
+
+        Returns:
+            Path of the executable, or None if it does not exist or is not executable.
+        """
+        # On Windows, PATHEXT contains a list of extensions which can be
+        # appended to a program name when searching PATH.
+        extensions = os.environ.get("PATHEXT", None)
+        _, path_ext = os.path.splitext(path)
+        if path_ext or not extensions:
+            if os.path.isfile(path) and os.access(path, os.X_OK):
+                return path
+            return None
+
+        extensions_list = extensions.split(";")
+        # Add "" (no extension) as a possibility.
+        extensions_list.insert(0, "")
+        for ext in extensions_list:
+            extended_path = path + ext
+            if os.path.isfile(extended_path) and os.access(extended_path, os.X_OK):
+                return extended_path
+
+        return None
+
+    @classmethod
+    def find_executable(cls, command: str) -> str | None:
+        """Find the executable for a command, searching $PATH if needed.
+
+        Results are kept for each value of $PATH and $PATHEXT.
+
+        Args:
+            command: Command to find.
+
+        Returns:
+            Path of the executable, or None if it can not be found.
+        """
+        key = (command, os.environ.get("PATH", ""), os.environ.get("PATHEXT", ""))
+        with cls._lock:
+            if key in cls._executables:
+                return cls._executables[key]
+
+        exe_path: str | None = None
+        if os.path.dirname(command):
+            # Contains a path, not just a command, so don't search PATH
+            exe_path = cls.get_executable_path(command)
+        else:
+            for path in key[1].split(os.pathsep):
+                exe_path = cls.get_executable_path(os.path.join(path, command))
+                if exe_path is not None:
+                    break
+
+        with cls._lock:
+            cls._executables[key] = exe_path
+        return exe_path
+
+    @staticmethod
+    def get_binary_key(exe_path: str) -> str | None:
+        """Get a key that changes whenever an executable is replaced.
+
+        Args:
+            exe_path: Path of the executable.
+
+        Returns:
+            Resolved path, modification time and size of the executable, or None if it
+            can not be read.
+        """
+        real_path = os.path.realpath(exe_path)
+        try:
+            stat = os.stat(real_path)
+        except OSError:
+            return None
+        return f"{real_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    @classmethod
+    def get_output(cls, args: list[str], exe_path: str | None = None) -> str | None:
+        """Run a probe command once and return its output.
+
+        Args:
+            args: Command to run.
+            exe_path: Executable whose output is probed. If set, the output is also
+                kept on disk until the executable changes.
+
+        Returns:
+            Output of the command, or None if the command failed.
+        """
+        binary_key = None
+        if exe_path is not None:
+            binary_key = cls.get_binary_key(exe_path)
+        key = json.dumps([binary_key] + args)
+        with cls._lock:
+            if key in cls._outputs:
+                return cls._outputs[key]
+
+        disk_key = None
+        if binary_key is not None:
+            disk_key = json.dumps([binary_key] + args[1:])
+            disk_outputs = cls.load_disk_outputs()
+            if disk_key in disk_outputs:
+                with cls._lock:
+                    cls._outputs[key] = disk_outputs[disk_key]
+                return disk_outputs[disk_key]
+
+        output: str | None = None
+        try:
+            output = subprocess.check_output(args, stderr=subprocess.STDOUT).decode(
+                "utf-8", errors="replace"
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):  # NOLINT
+            output = None
+
+        with cls._lock:
+            cls._outputs[key] = output
+        # Failures may be temporary, so only successful probes are kept on disk.
+        if disk_key is not None and output is not None:
+            cls.store_disk_output(disk_key, output)
+        return output
+
+    @classmethod
+    def load_disk_outputs(cls) -> dict[str, str]:
+        """Load probe outputs kept on disk.
+
+        Returns:
+            Probe outputs keyed by executable and arguments.
+        """
+        with cls._lock:
+            if cls._disk_outputs is not None:
+                return cls._disk_outputs
+            cache_file = cls._cache_file
+
+        disk_outputs: dict[str, str] = {}
+        if cache_file is not None:
+            try:
+                with open(cache_file, encoding="utf8") as fid:
+                    disk_outputs = json.load(fid)
+            except (OSError, ValueError):
+                disk_outputs = {}
+            if not isinstance(disk_outputs, dict):
+                disk_outputs = {}
+
+        with cls._lock:
+            cls._disk_outputs = disk_outputs
+        return disk_outputs
+
+    @classmethod
+    def store_disk_output(cls, disk_key: str, output: str) -> None:
+        """Keep the output of a probe on disk.
+
+        Args:
+            disk_key: Key for the executable and arguments that were probed.
+            output: Output of the probe.
+        """
+        with cls._lock:
+            cache_file = cls._cache_file
+            if cls._disk_outputs is not None:
+                cls._disk_outputs[disk_key] = output
+        if cache_file is None:
+            return
+
+        try:
+            with open(cache_file, encoding="utf8") as fid:
+                disk_outputs = json.load(fid)
+            if not isinstance(disk_outputs, dict):
+                disk_outputs = {}
+        except (OSError, ValueError):
+            disk_outputs = {}
+        disk_outputs[disk_key] = output
+
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            # Other processes may read the file at the same time.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+            with os.fdopen(fd, "w", encoding="utf8") as fid:
+                json.dump(disk_outputs, fid)
+            os.replace(tmp_path, cache_file)
+        except OSError as ex:
+            logging.warning("Unable to write tool version cache %s: %s", cache_file, ex)
@@ -0,0 +1,89 @@
+"""Find the packages in a workspace.
+
+A workspace is walked once. Each directory is listed a single time, and the listing
+both decides whether the directory is a package and which subdirectories to walk next.
+Packages are not searched for nested packages, and directories that never hold
+packages (VCS directories, dependency caches, virtual environments and CMake build
+trees) are not walked.
+"""
+
+import os
+
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.package import Package
+
+
+class WorkspaceIndex:
+    """Find the packages in a workspace."""
+
+    # Directories holding one of these files, and everything below them, are skipped.
+    IGNORE_FILES = frozenset(["AMENT_IGNORE", "CATKIN_IGNORE", "COLCON_IGNORE"])
+
+    # Directories holding one of these files are packages.
+    PACKAGE_INDICATORS = frozenset(["package.xml", "setup.py", "pyproject.toml"])
+
+    @classmethod
+    def find_packages(cls, path: str) -> tuple[list[Package], dict[str, int]]:
+        """Find the packages in a workspace.
+
+        The top directory itself is never a package. Directories are walked in name
+        order.
+
+        Args:
+            path: Path of the workspace.
+
+        Returns:
+            Packages in the workspace, and the number of entries in the directory of
+            each package keyed by package path.
+        """
+        packages: list[Package] = []
+        entry_counts: dict[str, int] = {}
+        dirs_to_walk = [path]
+        while dirs_to_walk:
+            top = dirs_to_walk.pop()
+            try:
+                with os.scandir(top) as scan_it:
+                    entries = sorted(scan_it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            names = {entry.name for entry in entries}
+            if not names.isdisjoint(cls.IGNORE_FILES):
+                continue
+            if top != path:
+                if not names.isdisjoint(cls.PACKAGE_INDICATORS):
+                    packages.append(Package(os.path.basename(top), top))
+                    entry_counts[top] = len(entries)
+                    continue
+                if (
+                    not names.isdisjoint(DiscoveryPlugin.BUILD_TREE_MARKERS)
+                    and "CMakeLists.txt" not in names
+                ):
+                    continue
+
+            sub_dirs: list[str] = []
+            for entry in entries:
+                if entry.name in DiscoveryPlugin.IGNORED_DIRECTORIES:
+                    continue
+                try:
+                    if not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                if entry.is_symlink():
+                    # Links to packages are still found, but are not walked further.
+                    try:
+                        link_names = set(os.listdir(entry.path))
+                    except OSError:
+                        continue
+                    if link_names.isdisjoint(
+                        cls.IGNORE_FILES
+                    ) and not link_names.isdisjoint(cls.PACKAGE_INDICATORS):
+                        packages.append(Package(entry.name, entry.path))
+                        entry_counts[entry.path] = len(link_names)
+                    continue
+                sub_dirs.append(entry.path)
+
+            dirs_to_walk += reversed(sub_dirs)
+
+        return packages, entry_counts
@@ -94,3 +94,14 @@ def test_args_user_paths_present():
         ["--user-paths", os.path.join(os.path.dirname(__file__), "test")]
     )
     assert user_paths == [os.path.join(os.path.dirname(__file__), "test")]
+
+
+def test_args_cache_dir():
+    """Test getting the cache directory before parsing other arguments.
+
+    Expected result: the cache directory, or None if caching is turned off
+    """
+    args = Args("test")
+    assert args.get_cache_dir(["--level", "sei_cert"]) is None
+    assert args.get_cache_dir(["--cache-dir", "cache", "path"]) == "cache"
+    assert args.get_cache_dir(["--cache-dir", "cache", "--no-cache"]) is None
@@ -0,0 +1,772 @@
+"""Benchmark the hot paths of Statick on synthetic workspaces.
+
+Each hot path is timed on its own: walking packages to find files, the scan of every
+discovery plugin, filtering issues with exceptions, parsing tool output and every
+reporting plugin. A scan of a whole workspace with the do_nothing tool measures
+everything around the tools. Startup benchmarks run Statick in new processes to measure
+import time, `statick --help` and the time to finish a scan of one package.
+
+Results are written as JSON. When a baseline from an earlier run is given, benchmarks
+that got slower than the tolerance allows are listed and the exit status is 1.
+
+Run from the root of the repository:
+
+    python tests/benchmark/benchmark.py --output benchmark.json
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Mapping
+from importlib.metadata import entry_points, version
+from typing import Any, NamedTuple
+
+import yaml
+from workspace_generator import (
+    DEFAULT_FILE_COUNTS,
+    LANGUAGES,
+    generate_exceptions,
+    generate_issues,
+    generate_tool_output,
+    generate_workspace,
+)
+
+from statick_tool.args import Args
+from statick_tool.config import Config
+from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.exceptions import Exceptions
+from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.plugins.tool.clang_tidy import ClangTidyToolPlugin
+from statick_tool.plugins.tool.cppcheck import CppcheckToolPlugin
+from statick_tool.plugins.tool.cpplint import CpplintToolPlugin
+from statick_tool.plugins.tool.lizard import LizardToolPlugin
+from statick_tool.plugins.tool.make import MakeToolPlugin
+from statick_tool.plugins.tool.mypy import MypyToolPlugin
+from statick_tool.plugins.tool.pycodestyle import PycodestyleToolPlugin
+from statick_tool.plugins.tool.pylint import PylintToolPlugin
+from statick_tool.resources import Resources
+from statick_tool.statick_tool import Statick
+
+BenchmarkResult = NamedTuple(
+    "BenchmarkResult",
+    [
+        ("name", str),
+        ("group", str),
+        ("repeat", int),
+        ("items", int),
+        ("min", float),
+        ("median", float),
+        ("mean", float),
+    ],
+)
+
+LEVEL = "benchmark"
+
+CONFIG_FILE = "benchmark-config.yaml"
+EXCEPTIONS_FILE = "benchmark-exceptions.yaml"
+
+# Level used by the benchmarks. Reports are only written to files.
+USER_CONFIG = {
+    "levels": {
+        LEVEL: {
+            "tool": {"do_nothing": None},
+            "reporting": {
+                "code_climate": {"files": "true"},
+                "do_nothing": None,
+                "json": {"files": "true"},
+                "print_to_console": None,
+                "write_jenkins_warnings_ng": None,
+            },
+        }
+    }
+}
+
+# Parsers fed generated tool output, with how each is called.
+PARSERS: dict[str, Callable[[Any, Package, str], Any]] = {
+    "clang-tidy": lambda plugin, package, output: plugin.parse_tool_output(output),
+    "cppcheck": lambda plugin, package, output: plugin.parse_tool_output(output),
+    "cpplint": lambda plugin, package, output: plugin.parse_tool_output(output),
+    "lizard": lambda plugin, package, output: plugin.parse_tool_output(output),
+    "make": lambda plugin, package, output: plugin.parse_package_output(
+        package, output
+    ),
+    "mypy": lambda plugin, package, output: plugin.parse_output([output], package),
+    "pycodestyle": lambda plugin, package, output: plugin.parse_output(
+        [output], package
+    ),
+    "pylint": lambda plugin, package, output: plugin.parse_output([output], package),
+}
+
+# Modules that are slow to import and are only needed by some runs of Statick.
+DEFERRED_IMPORTS = ["importlib.metadata", "tabulate", "yaml"]
+
+PARSER_PLUGINS = {
+    "clang-tidy": ClangTidyToolPlugin,
+    "cppcheck": CppcheckToolPlugin,
+    "cpplint": CpplintToolPlugin,
+    "lizard": LizardToolPlugin,
+    "make": MakeToolPlugin,
+    "mypy": MypyToolPlugin,
+    "pycodestyle": PycodestyleToolPlugin,
+    "pylint": PylintToolPlugin,
+}
+
+
+def time_call(
+    func: Callable[[], Any],
+    repeat: int,
+    setup: Callable[[], Any] | None = None,
+) -> list[float]:
+    """Time a function.
+
+    Args:
+        func: Function to time.
+        repeat: Number of times to call the function.
+        setup: Function called before each call, which is not timed.
+
+    Returns:
+        Duration of each call in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def get_result(
+    name: str, group: str, items: int, durations: list[float]
+) -> BenchmarkResult:
+    """Summarize the durations of a benchmark.
+
+    Args:
+        name: Name of the benchmark.
+        group: Hot path the benchmark belongs to.
+        items: Number of files, issues or lines handled in each call.
+        durations: Duration of each call in seconds.
+
+    Returns:
+        Result of the benchmark.
+    """
+    return BenchmarkResult(
+        name,
+        group,
+        len(durations),
+        items,
+        min(durations),
+        statistics.median(durations),
+        statistics.mean(durations),
+    )
+
+
+class BenchmarkWorkspace:
+    """A synthetic workspace with everything the benchmarks need."""
+
+    def __init__(self, path: str, args: argparse.Namespace) -> None:
+        """Generate the workspace.
+
+        Args:
+            path: Directory to generate the workspace in.
+            args: Parameters of the workspace.
+        """
+        self.args = args
+        self.path = os.path.join(path, "workspace")
+        self.file_counts = get_file_counts(args)
+        self.packages = generate_workspace(
+            self.path, args.packages, self.file_counts, args.lines_per_file
+        )
+
+        # Resources are looked up in the rsc directory of each user path.
+        self.user_dir = os.path.join(path, "user")
+        os.makedirs(os.path.join(self.user_dir, "rsc"))
+        with open(
+            os.path.join(self.user_dir, "rsc", CONFIG_FILE), "w", encoding="utf8"
+        ) as fid:
+            yaml.safe_dump(USER_CONFIG, fid)
+        self.exceptions_file = os.path.join(self.user_dir, "rsc", EXCEPTIONS_FILE)
+        generate_exceptions(self.exceptions_file, self.packages, args.exceptions_size)
+
+        self.output_dir = os.path.join(path, "output")
+        os.makedirs(self.output_dir)
+        self.resources = Resources([self.user_dir])
+        self.config = Config(
+            self.resources.get_file("config.yaml"),
+            self.resources.get_file(CONFIG_FILE),
+        )
+        self.plugin_context = PluginContext(
+            argparse.Namespace(
+                output_directory=self.output_dir, mapping_file_suffix=None
+            ),
+            self.resources,
+            self.config,
+        )
+        self.exceptions = Exceptions(self.exceptions_file)
+
+    def get_package(self, index: int = 0) -> Package:
+        """Get a fresh copy of a package, which has not been walked yet.
+
+        Args:
+            index: Index of the package.
+
+        Returns:
+            The package.
+        """
+        return Package(self.packages[index].name, self.packages[index].path)
+
+    def get_walked_package(self, index: int = 0) -> Package:
+        """Get a fresh copy of a package, with its files already found.
+
+        Args:
+            index: Index of the package.
+
+        Returns:
+            The package.
+        """
+        package = self.get_package(index)
+        plugin = DiscoveryPlugin()
+        plugin.set_plugin_context(self.plugin_context)
+        plugin.find_files(package, self.exceptions)
+        return package
+
+
+def get_file_counts(args: argparse.Namespace) -> dict[str, int]:
+    """Get the number of files of each language in a package.
+
+    Args:
+        args: Parameters of the workspace.
+
+    Returns:
+        Number of files of each language.
+    """
+    file_counts = dict(DEFAULT_FILE_COUNTS)
+    for item in args.files or []:
+        language, _, count = item.partition("=")
+        if language not in LANGUAGES or not count.isdigit():
+            raise ValueError(f"Invalid file count {item}")
+        file_counts[language] = int(count)
+    return file_counts
+
+
+def benchmark_find_files(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark walking a package to find its files.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    plugin = DiscoveryPlugin()
+    plugin.set_plugin_context(workspace.plugin_context)
+    packages: list[Package] = []
+
+    def setup() -> None:
+        packages[:] = [workspace.get_package()]
+
+    durations = time_call(
+        lambda: plugin.find_files(packages[0], workspace.exceptions),
+        workspace.args.repeat,
+        setup,
+    )
+    return [
+        get_result(
+            "find_files", "discovery", sum(workspace.file_counts.values()), durations
+        )
+    ]
+
+
+def benchmark_discovery(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark the scan of every discovery plugin, after files have been found.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    results = []
+    package = workspace.get_walked_package()
+    for plugin_type in sorted(
+        entry_points(group="statick_tool.plugins.discovery"),
+        key=lambda plugin_type: plugin_type.name,
+    ):
+        if plugin_type.name == "cmake":
+            # CMake discovery runs cmake, which is not part of the hot path.
+            continue
+        plugin = plugin_type.load()()
+        plugin.set_plugin_context(workspace.plugin_context)
+        durations = time_call(
+            lambda: plugin.scan(package, LEVEL, workspace.exceptions),
+            workspace.args.repeat,
+        )
+        results.append(
+            get_result(
+                f"scan {plugin_type.name}", "discovery", len(package.files), durations
+            )
+        )
+    return results
+
+
+def benchmark_filter_issues(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark filtering the issues of a package with exceptions.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    package = workspace.packages[-1]
+    issues = generate_issues(
+        package, workspace.args.issue_density, workspace.args.lines_per_file
+    )
+    exceptions: list[Exceptions] = []
+
+    def setup() -> None:
+        # Start without compiled exceptions or cached NOLINT lines, as a new run would.
+        exceptions[:] = [Exceptions(workspace.exceptions_file)]
+
+    durations = time_call(
+        lambda: exceptions[0].filter_issues(
+            package, {tool: list(value) for tool, value in issues.items()}
+        ),
+        workspace.args.repeat,
+        setup,
+    )
+    return [
+        get_result(
+            "filter_issues",
+            "exceptions",
+            sum(len(value) for value in issues.values()),
+            durations,
+        )
+    ]
+
+
+def benchmark_parsers(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark parsing the output of tools.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    results = []
+    package = workspace.get_package()
+    for tool, parse in sorted(PARSERS.items()):
+        output = generate_tool_output(
+            tool, package, workspace.args.issue_density, workspace.args.lines_per_file
+        )
+        plugin = PARSER_PLUGINS[tool]()
+        plugin.set_plugin_context(workspace.plugin_context)
+        durations = time_call(
+            lambda plugin=plugin, parse=parse, output=output: parse(
+                plugin, package, output
+            ),
+            workspace.args.repeat,
+        )
+        results.append(
+            get_result(f"parse {tool}", "parsers", output.count("\n"), durations)
+        )
+    return results
+
+
+def benchmark_reporting(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark every reporting plugin.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    results = []
+    package = workspace.packages[0]
+    issues = generate_issues(
+        package, workspace.args.issue_density, workspace.args.lines_per_file
+    )
+    os.makedirs(os.path.join(workspace.output_dir, f"{package.name}-{LEVEL}"))
+    for plugin_type in sorted(
+        entry_points(group="statick_tool.plugins.reporting"),
+        key=lambda plugin_type: plugin_type.name,
+    ):
+        plugin = plugin_type.load()()
+        plugin.set_plugin_context(workspace.plugin_context)
+        with open(os.devnull, "w", encoding="utf8") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                durations = time_call(
+                    lambda plugin=plugin: plugin.report(package, issues, LEVEL),
+                    workspace.args.repeat,
+                )
+        results.append(
+            get_result(
+                f"report {plugin_type.name}",
+                "reporting",
+                sum(len(value) for value in issues.values()),
+                durations,
+            )
+        )
+    return results
+
+
+def benchmark_run_workspace(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark a scan of the whole workspace with the do_nothing tool.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    argv = [
+        "--user-paths",
+        workspace.user_dir,
+        "--config",
+        CONFIG_FILE,
+        "--level",
+        LEVEL,
+        "--exceptions",
+        EXCEPTIONS_FILE,
+        "--max-procs",
+        str(workspace.args.max_procs),
+        "--output-directory",
+        os.path.join(workspace.output_dir, "run_workspace"),
+        "-ws",
+        workspace.path,
+    ]
+    args = Args("Statick benchmark")
+    args.parser.add_argument("path")
+    statick = Statick(args.get_user_paths(argv))
+    statick.gather_args(args.parser)
+    parsed_args = args.get_args(argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    orig_path = os.getcwd()
+    try:
+        with open(os.devnull, "w", encoding="utf8") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                durations = time_call(
+                    lambda: statick.run_workspace(parsed_args), workspace.args.repeat
+                )
+    finally:
+        os.chdir(orig_path)
+    return [
+        get_result(
+            "run_workspace",
+            "end to end",
+            len(workspace.packages) * sum(workspace.file_counts.values()),
+            durations,
+        )
+    ]
+
+
+def parse_importtime(output: str) -> dict[str, float]:
+    """Parse the import times written by python -X importtime.
+
+    Args:
+        output: Standard error of the Python process.
+
+    Returns:
+        Cumulative import time of each module in seconds, including the modules it
+        imported.
+    """
+    import_times: dict[str, float] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        import_times.setdefault(fields[2].strip(), int(fields[1]) / 1e6)
+    return import_times
+
+
+def time_process(argv: list[str], repeat: int) -> list[float]:
+    """Time a Python process running Statick.
+
+    Args:
+        argv: Arguments of the Python interpreter.
+        repeat: Number of times to run the process.
+
+    Returns:
+        Duration of each run in seconds.
+
+    Raises:
+        CalledProcessError: If the process fails, as its duration would not be the
+            duration of a working run.
+    """
+    return time_call(
+        lambda: subprocess.run(
+            [sys.executable] + argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True,
+        ),
+        repeat,
+    )
+
+
+def benchmark_startup(workspace: BenchmarkWorkspace) -> list[BenchmarkResult]:
+    """Benchmark starting Statick in a new process.
+
+    Importing Statick is measured with python -X importtime, along with the part of it
+    spent importing each module in DEFERRED_IMPORTS, which is 0 when the module is not
+    imported. `statick --help` and a scan of one package with the do_nothing tool are
+    timed from start to exit. A cache directory is used, and filled before timing.
+
+    Args:
+        workspace: Workspace to benchmark.
+
+    Returns:
+        Results of the benchmark.
+    """
+    import_durations: list[float] = []
+    deferred_durations: dict[str, list[float]] = {
+        module: [] for module in DEFERRED_IMPORTS
+    }
+    for _ in range(workspace.args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import statick_tool.statick"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stderr
+        import_times = parse_importtime(output)
+        import_durations.append(import_times["statick_tool.statick"])
+        for module, durations in deferred_durations.items():
+            durations.append(import_times.get(module, 0.0))
+
+    cache_dir = os.path.join(workspace.output_dir, "startup_cache")
+    help_argv = ["-m", "statick_tool.statick", "--cache-dir", cache_dir, "--help"]
+    scan_argv = [
+        "-m",
+        "statick_tool.statick",
+        "--user-paths",
+        workspace.user_dir,
+        "--config",
+        CONFIG_FILE,
+        "--level",
+        LEVEL,
+        "--exceptions",
+        EXCEPTIONS_FILE,
+        "--cache-dir",
+        cache_dir,
+        "--output-directory",
+        workspace.output_dir,
+        workspace.packages[0].path,
+    ]
+    time_process(help_argv, 1)
+    results = [
+        get_result("import statick_tool.statick", "startup", 1, import_durations),
+    ]
+    results += [
+        get_result(f"import {module}", "startup", 1, durations)
+        for module, durations in deferred_durations.items()
+    ]
+    results.append(
+        get_result(
+            "statick --help",
+            "startup",
+            1,
+            time_process(help_argv, workspace.args.repeat),
+        )
+    )
+    results.append(
+        get_result(
+            "scan one package",
+            "startup",
+            sum(workspace.file_counts.values()),
+            time_process(scan_argv, workspace.args.repeat),
+        )
+    )
+    return results
+
+
+BENCHMARKS: dict[str, Callable[[BenchmarkWorkspace], list[BenchmarkResult]]] = {
+    "find_files": benchmark_find_files,
+    "discovery": benchmark_discovery,
+    "filter_issues": benchmark_filter_issues,
+    "parsers": benchmark_parsers,
+    "reporting": benchmark_reporting,
+    "run_workspace": benchmark_run_workspace,
+    "startup": benchmark_startup,
+}
+
+
+def run_benchmarks(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the selected benchmarks on a synthetic workspace.
+
+    Args:
+        args: Parameters of the workspace and benchmarks to run.
+
+    Returns:
+        Parameters, environment and results of the benchmarks.
+    """
+    results: list[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workspace = BenchmarkWorkspace(tmp_dir, args)
+        for name in args.benchmarks or list(BENCHMARKS):
+            logging.info("Running %s benchmarks", name)
+            results += BENCHMARKS[name](workspace)
+
+    return {
+        "parameters": {
+            "packages": args.packages,
+            "files": get_file_counts(args),
+            "lines_per_file": args.lines_per_file,
+            "issue_density": args.issue_density,
+            "exceptions_size": args.exceptions_size,
+            "repeat": args.repeat,
+            "max_procs": args.max_procs,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "statick": version("statick"),
+        },
+        "benchmarks": [result._asdict() for result in results],
+    }
+
+
+def compare(
+    results: Mapping[str, Any], baseline: Mapping[str, Any], tolerance: float
+) -> list[str]:
+    """Find benchmarks that got slower than a baseline.
+
+    Medians are compared, for benchmarks found in both results.
+
+    Args:
+        results: Results of this run.
+        baseline: Results of an earlier run.
+        tolerance: Fraction by which a benchmark can be slower than the baseline.
+
+    Returns:
+        Description of each benchmark that got slower.
+    """
+    baseline_medians = {
+        benchmark["name"]: benchmark["median"] for benchmark in baseline["benchmarks"]
+    }
+    regressions = []
+    for benchmark in results["benchmarks"]:
+        baseline_median = baseline_medians.get(benchmark["name"])
+        if baseline_median is None:
+            continue
+        if benchmark["median"] > baseline_median * (1 + tolerance):
+            regressions.append(
+                f"{benchmark['name']}: {benchmark['median']:.6f} s "
+                f"(baseline {baseline_median:.6f} s)"
+            )
+    return regressions
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get the parser of the command line arguments.
+
+    Returns:
+        Parser of the command line arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--packages", type=int, default=20, help="Number of packages in the workspace"
+    )
+    parser.add_argument(
+        "--files",
+        nargs="*",
+        metavar="LANGUAGE=COUNT",
+        help="Number of files of a language in each package. Languages are "
+        + ", ".join(sorted(LANGUAGES)),
+    )
+    parser.add_argument(
+        "--lines-per-file", type=int, default=50, help="Number of lines in each file"
+    )
+    parser.add_argument(
+        "--issue-density",
+        type=float,
+        default=2.0,
+        help="Average number of issues in each file",
+    )
+    parser.add_argument(
+        "--exceptions-size",
+        type=int,
+        default=100,
+        help="Number of exceptions in exceptions.yaml",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of times to run each benchmark"
+    )
+    parser.add_argument(
+        "--max-procs",
+        type=int,
+        default=1,
+        help="Number of processes for the run_workspace benchmark",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="*",
+        choices=list(BENCHMARKS),
+        help="Benchmarks to run, all by default",
+    )
+    parser.add_argument("--output", help="File to write the results to as JSON")
+    parser.add_argument(
+        "--baseline", help="Results of an earlier run to compare the results with"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fraction by which a benchmark can be slower than the baseline",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Exit status, 1 if a benchmark got slower than the baseline allows.
+    """
+    args = get_parser().parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    results = run_benchmarks(args)
+
+    for benchmark in results["benchmarks"]:
+        print(
+            f"{benchmark['group']:<12} {benchmark['name']:<36} "
+            f"median {benchmark['median'] * 1000:10.3f} ms "
+            f"min {benchmark['min'] * 1000:10.3f} ms ({benchmark['items']} items)"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as fid:
+            json.dump(results, fid, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as fid:
+            baseline = json.load(fid)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Slower than baseline: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
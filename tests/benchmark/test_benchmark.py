@@ -0,0 +1,163 @@
+"""Tests for the benchmark suite and the synthetic workspace generator."""
+
+import json
+import os
+import subprocess
+from tempfile import TemporaryDirectory
+
+import benchmark
+import pytest
+from workspace_generator import (
+    generate_exceptions,
+    generate_issues,
+    generate_tool_output,
+    generate_workspace,
+)
+
+from statick_tool.exceptions import Exceptions
+
+
+def test_generate_workspace():
+    """Test that a workspace is generated with the requested files and issues.
+
+    Expected result: every package holds the requested files, and issues and tool
+    output are the same for the same seed
+    """
+    with TemporaryDirectory() as tmp_dir:
+        packages = generate_workspace(tmp_dir, 3, {"python": 20, "cpp": 1}, 10)
+        assert [package.name for package in packages] == [
+            "package_0",
+            "package_1",
+            "package_2",
+        ]
+        file_count = sum(
+            len(files) for _, _, files in os.walk(os.path.join(packages[0].path))
+        )
+        assert file_count == 22
+
+        issues = generate_issues(packages[0], 1.5, 10)
+        assert 20 <= len(issues["pylint"]) <= 40
+        assert issues == generate_issues(packages[0], 1.5, 10)
+        assert issues != generate_issues(packages[0], 1.5, 10, seed=1)
+
+        output = generate_tool_output("pylint", packages[0], 3, 10)
+        assert output == generate_tool_output("pylint", packages[0], 3, 10)
+        assert output.count(packages[0].path) == 60
+
+        exceptions_file = os.path.join(tmp_dir, "exceptions.yaml")
+        generate_exceptions(exceptions_file, packages, 40)
+        exceptions = Exceptions(exceptions_file).get_exceptions(packages[0])
+        assert exceptions["file"]
+        assert exceptions["message_regex"]
+
+
+def test_benchmark_main():
+    """Test that every benchmark runs and writes its results.
+
+    Expected result: results are written as JSON and no benchmark is slower than its
+    own results
+    """
+    with TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "benchmark.json")
+        status = benchmark.main(
+            [
+                "--packages",
+                "2",
+                "--files",
+                "python=2",
+                "cpp=2",
+                "--repeat",
+                "1",
+                "--exceptions-size",
+                "10",
+                "--output",
+                output,
+            ]
+        )
+        assert status == 0
+        with open(output, encoding="utf8") as fid:
+            results = json.load(fid)
+
+    names = {result["name"] for result in results["benchmarks"]}
+    assert {
+        "find_files",
+        "scan python",
+        "filter_issues",
+        "parse make",
+        "report json",
+        "run_workspace",
+        "statick --help",
+        "import yaml",
+    } <= names
+    assert "scan cmake" not in names
+    assert results["parameters"]["files"]["python"] == 2
+    assert all(result["median"] >= 0 for result in results["benchmarks"])
+    assert benchmark.compare(results, results, 0.0) == []
+
+
+def test_benchmark_parsers():
+    """Test that the parsers find the issues in the generated tool output.
+
+    Expected result: every line of output that is not noise is an issue
+    """
+    args = benchmark.get_parser().parse_args(["--packages", "1", "--files", "cpp=3"])
+    with TemporaryDirectory() as tmp_dir:
+        workspace = benchmark.BenchmarkWorkspace(tmp_dir, args)
+        package = workspace.get_package()
+        for tool, parse in benchmark.PARSERS.items():
+            output = generate_tool_output(tool, package, 4)
+            plugin = benchmark.PARSER_PLUGINS[tool]()
+            plugin.set_plugin_context(workspace.plugin_context)
+            issues = parse(plugin, package, output)
+            assert len(issues) == output.count(package.path), tool
+
+
+def test_benchmark_parse_importtime():
+    """Test that cumulative import times are read from python -X importtime.
+
+    Expected result: times are in seconds, and other lines are skipped
+    """
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   yaml.reader\n"
+        "import time:      1500 |       2000 | yaml\n"
+        "Traceback (most recent call last):\n"
+    )
+    assert benchmark.parse_importtime(output) == {
+        "yaml.reader": 0.00012,
+        "yaml": 0.002,
+    }
+
+
+def test_benchmark_compare():
+    """Test that benchmarks slower than the baseline are found.
+
+    Expected result: only benchmarks slower than the tolerance allows are listed
+    """
+    baseline = {
+        "benchmarks": [
+            {"name": "fast", "median": 1.0},
+            {"name": "slow", "median": 1.0},
+            {"name": "removed", "median": 1.0},
+        ]
+    }
+    results = {
+        "benchmarks": [
+            {"name": "fast", "median": 1.1},
+            {"name": "slow", "median": 1.5},
+            {"name": "new", "median": 10.0},
+        ]
+    }
+    regressions = benchmark.compare(results, baseline, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow: ")
+
+
+def test_benchmark_time_process():
+    """Test that a failing process is not timed as a valid run.
+
+    Expected result: a working process is timed, and a failing one raises an error
+    """
+    assert len(benchmark.time_process(["-c", "pass"], 2)) == 2
+    with pytest.raises(subprocess.CalledProcessError):
+        benchmark.time_process(["-c", "import sys; sys.exit(1)"], 1)
@@ -0,0 +1,371 @@
+"""Generate synthetic packages, workspaces, exceptions, issues and tool output.
+
+Everything is generated from a seed, so the same parameters always give the same files
+and the same issues. Benchmarks built on them measure the same work from run to run.
+"""
+
+import os
+import random
+from collections.abc import Mapping
+from typing import Any
+
+import yaml
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+
+# Extension and directory of the files generated for each language.
+LANGUAGES = {
+    "python": (".py", "src"),
+    "cpp": (".cpp", "src"),
+    "header": (".h", "include"),
+    "shell": (".sh", "scripts"),
+    "yaml": (".yaml", "config"),
+    "xml": (".xml", "launch"),
+    "markdown": (".md", "doc"),
+    "rst": (".rst", "doc"),
+    "javascript": (".js", "web"),
+    "java": (".java", "java"),
+}
+
+DEFAULT_FILE_COUNTS = {
+    "python": 20,
+    "cpp": 20,
+    "header": 10,
+    "shell": 2,
+    "yaml": 4,
+    "xml": 2,
+    "markdown": 2,
+    "rst": 2,
+    "javascript": 2,
+    "java": 2,
+}
+
+# Most directories of real packages hold a handful of files.
+FILES_PER_DIRECTORY = 16
+
+# Lines written to a file of each language, formatted with the line number.
+LINE_TEMPLATES = {
+    "python": "value_{0} = compute({0}, 'argument')  # comment on line {0}",
+    "cpp": "  int value_{0} = compute({0});  // comment on line {0}",
+    "header": "int function_{0}(int argument);",
+    "shell": 'echo "line {0}" > /dev/null',
+    "yaml": "key_{0}: value {0}",
+    "xml": '  <param name="param_{0}" value="{0}"/>',
+    "markdown": "Paragraph {0} of the synthetic documentation.",
+    "rst": "Paragraph {0} of the synthetic documentation.",
+    "javascript": "const value{0} = compute({0});",
+    "java": "    int value{0} = compute({0});",
+}
+
+# Tools that report issues for files of each language, with sample issue types and
+# messages.
+LANGUAGE_TOOLS = {
+    "python": ("pylint", "C0301", "Line too long (120/100)"),
+    "cpp": ("cppcheck", "style/variableScope", "The scope can be reduced."),
+    "header": ("cpplint", "build/include_order", "Found C system header after C++"),
+    "shell": ("shellcheck", "SC2086", "Double quote to prevent globbing."),
+    "yaml": ("yamllint", "line-length", "line too long (90 > 80 characters)"),
+    "xml": ("xmllint", "parser", "Opening and ending tag mismatch"),
+    "markdown": ("markdownlint", "MD013", "Line length"),
+    "rst": ("rstcheck", "error", "Title underline too short."),
+    "javascript": ("eslint", "no-unused-vars", "'value' is never used."),
+    "java": ("spotbugs", "DLS_DEAD_LOCAL_STORE", "Dead store to local variable"),
+}
+
+# One line of output in the format of each tool, formatted with the file path, line
+# number and a counter. Formats follow the outputs the tool plugins are tested with.
+TOOL_OUTPUT_FORMATS = {
+    "clang-tidy": (
+        "cpp",
+        "{path}:{line}:{count}: warning: use nullptr [modernize-use-nullptr]",
+    ),
+    "cppcheck": (
+        "cpp",
+        "[{path}:{line}]: (style variableScope) The scope of the variable "
+        "'value_{count}' can be reduced.",
+    ),
+    "cpplint": (
+        "cpp",
+        "{path}:{line}:  Using C-style cast.  Use static_cast<int>(...) instead"
+        "  [readability/casting] [4]",
+    ),
+    "lizard": (
+        "cpp",
+        "{path}:{line}: warning: function_{count} has 16 CCN and 1 params "
+        "(29 NLOC, 88 tokens)",
+    ),
+    "make": (
+        "cpp",
+        "{path}:{line}:{count}: warning: unused variable 'value_{count}' "
+        "[-Wunused-variable]",
+    ),
+    "mypy": (
+        "python",
+        '{path}:{line}: error: Incompatible return value type (got "int", expected '
+        '"str")  [return-value]',
+    ),
+    "pycodestyle": ("python", "{path}:{line}: [E501] line too long (101 > 79)"),
+    "pylint": (
+        "python",
+        "{path}:{line}: [C0301(line-too-long), ] Line too long (120/100)",
+    ),
+}
+
+# Lines of tool output that are not issues, mixed in with the issues.
+NOISE_LINES = (
+    "In file included from the synthetic header:",
+    "      |     ^~~~~~~~~~~~~~~~~~~",
+    "Checking the synthetic package ...",
+)
+
+
+def get_file_lines(language: str, lines: int) -> str:
+    """Get the contents of a source file.
+
+    Every twentieth line of C++ carries a NOLINT comment, so that filtering issues on
+    NOLINT lines has files to read.
+
+    Args:
+        language: Language of the file.
+        lines: Number of lines in the file.
+
+    Returns:
+        Contents of the file.
+    """
+    template = LINE_TEMPLATES[language]
+    contents = []
+    for line in range(1, lines + 1):
+        text = template.format(line)
+        if language == "cpp" and line % 20 == 0:
+            text += "  // NOLINT"
+        contents.append(text)
+    return "\n".join(contents) + "\n"
+
+
+def generate_package(
+    path: str,
+    name: str,
+    file_counts: Mapping[str, int] | None = None,
+    lines_per_file: int = 50,
+) -> Package:
+    """Write a synthetic package.
+
+    Files are spread over directories named after their language, with at most
+    FILES_PER_DIRECTORY files in each directory.
+
+    Args:
+        path: Directory to write the package in, which is created if needed.
+        name: Name of the package.
+        file_counts: Number of files of each language in LANGUAGES.
+        lines_per_file: Number of lines in each file.
+
+    Returns:
+        The package.
+    """
+    if file_counts is None:
+        file_counts = DEFAULT_FILE_COUNTS
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "package.xml"), "w", encoding="utf8") as fid:
+        fid.write(
+            f'<?xml version="1.0"?>\n<package format="2">\n  <name>{name}</name>\n'
+            "  <version>0.0.0</version>\n</package>\n"
+        )
+    for language, count in file_counts.items():
+        extension, directory = LANGUAGES[language]
+        contents = get_file_lines(language, lines_per_file)
+        for index in range(count):
+            file_dir = os.path.join(
+                path, directory, f"{language}_{index // FILES_PER_DIRECTORY}"
+            )
+            os.makedirs(file_dir, exist_ok=True)
+            file_name = os.path.join(file_dir, f"{language}_{index}{extension}")
+            with open(file_name, "w", encoding="utf8") as fid:
+                fid.write(contents)
+    return Package(name, path)
+
+
+def generate_workspace(
+    path: str,
+    packages: int,
+    file_counts: Mapping[str, int] | None = None,
+    lines_per_file: int = 50,
+) -> list[Package]:
+    """Write a synthetic workspace.
+
+    Packages are split between two directories below the workspace, as in a workspace
+    with packages from more than one repository.
+
+    Args:
+        path: Directory to write the workspace in, which is created if needed.
+        packages: Number of packages in the workspace.
+        file_counts: Number of files of each language in each package.
+        lines_per_file: Number of lines in each file.
+
+    Returns:
+        The packages in the workspace.
+    """
+    return [
+        generate_package(
+            os.path.join(path, "src", f"repository_{index % 2}", f"package_{index}"),
+            f"package_{index}",
+            file_counts,
+            lines_per_file,
+        )
+        for index in range(packages)
+    ]
+
+
+def get_package_files(package: Package) -> dict[str, list[str]]:
+    """Get the generated files of a package by language.
+
+    Args:
+        package: Package written by generate_package.
+
+    Returns:
+        Absolute paths of the files of each language, in name order.
+    """
+    files: dict[str, list[str]] = {language: [] for language in LANGUAGES}
+    extensions = {extension: language for language, (extension, _) in LANGUAGES.items()}
+    for root, _, file_names in os.walk(package.path):
+        for file_name in file_names:
+            language = extensions.get(os.path.splitext(file_name)[1])
+            if language is not None:
+                files[language].append(os.path.abspath(os.path.join(root, file_name)))
+    for language_files in files.values():
+        language_files.sort()
+    return files
+
+
+def generate_issues(
+    package: Package, issue_density: float, lines_per_file: int = 50, seed: int = 0
+) -> dict[str, list[Issue]]:
+    """Generate issues for the files of a package.
+
+    Args:
+        package: Package written by generate_package.
+        issue_density: Average number of issues in each file.
+        lines_per_file: Number of lines in each file.
+        seed: Seed of the random numbers.
+
+    Returns:
+        Issues keyed by the tool that found them.
+    """
+    rng = random.Random(seed)
+    issues: dict[str, list[Issue]] = {}
+    for language, files in get_package_files(package).items():
+        tool, issue_type, message = LANGUAGE_TOOLS[language]
+        for file_name in files:
+            for _ in range(get_count(rng, issue_density)):
+                line = rng.randint(1, lines_per_file)
+                issues.setdefault(tool, []).append(
+                    Issue(
+                        file_name,
+                        line,
+                        tool,
+                        issue_type,
+                        rng.randint(1, 5),
+                        f"{message} (line {line})",
+                        None,
+                    )
+                )
+    return issues
+
+
+def get_count(rng: random.Random, density: float) -> int:
+    """Get a random count with a given average.
+
+    Args:
+        rng: Random number generator.
+        density: Average count.
+
+    Returns:
+        The whole part of the density, plus one with the chance of the fraction.
+    """
+    count = int(density)
+    if rng.random() < density - count:
+        count += 1
+    return count
+
+
+def generate_tool_output(
+    tool: str,
+    package: Package,
+    issue_density: float,
+    lines_per_file: int = 50,
+    seed: int = 0,
+) -> str:
+    """Generate output of a tool for the files of a package.
+
+    A line of output that is not an issue follows every fourth issue.
+
+    Args:
+        tool: Tool in TOOL_OUTPUT_FORMATS.
+        package: Package written by generate_package.
+        issue_density: Average number of issues in each file.
+        lines_per_file: Number of lines in each file.
+        seed: Seed of the random numbers.
+
+    Returns:
+        Output of the tool.
+    """
+    rng = random.Random(seed)
+    language, line_format = TOOL_OUTPUT_FORMATS[tool]
+    lines = []
+    count = 0
+    for file_name in get_package_files(package)[language]:
+        for _ in range(get_count(rng, issue_density)):
+            count += 1
+            lines.append(
+                line_format.format(
+                    path=file_name, line=rng.randint(1, lines_per_file), count=count
+                )
+            )
+            if count % 4 == 0:
+                lines.append(NOISE_LINES[count % len(NOISE_LINES)])
+    return "\n".join(lines) + "\n"
+
+
+def generate_exceptions(
+    file_name: str, packages: list[Package], size: int, seed: int = 0
+) -> None:
+    """Write a synthetic exceptions file.
+
+    Half of the exceptions are global and half belong to packages. Each half is split
+    between file exceptions and message regex exceptions, and some of the exceptions
+    match generated issues.
+
+    Args:
+        file_name: File to write the exceptions to.
+        packages: Packages the exceptions can belong to.
+        size: Number of exceptions.
+        seed: Seed of the random numbers.
+    """
+    rng = random.Random(seed)
+    tools = sorted({tool for tool, _, _ in LANGUAGE_TOOLS.values()})
+    exceptions: dict[str, Any] = {
+        "global": {"exceptions": {"file": [], "message_regex": []}}
+    }
+    for index in range(size):
+        if index % 2 == 0 or not packages:
+            target = exceptions["global"]
+        else:
+            package = rng.choice(packages)
+            target = exceptions.setdefault("packages", {}).setdefault(
+                package.name, {"exceptions": {"file": [], "message_regex": []}}
+            )
+        tool: Any = "all" if index % 5 == 0 else [rng.choice(tools)]
+        if index % 4 < 2:
+            language = rng.choice(sorted(LANGUAGES))
+            target["exceptions"]["file"].append(
+                {
+                    "tools": tool,
+                    "globs": [f"*/{language}_{rng.randint(0, 3)}/*_{index}.*"],
+                }
+            )
+        else:
+            target["exceptions"]["message_regex"].append(
+                {"tools": tool, "regex": f".*\\(line {rng.randint(1, 200)}\\)$"}
+            )
+    with open(file_name, "w", encoding="utf8") as fid:
+        yaml.safe_dump(exceptions, fid)
@@ -1,6 +1,7 @@
 """Unit tests for the Config module."""
 
 import os
+import pickle
 
 import mock
 import pytest
@@ -311,6 +312,60 @@ def test_config_extend_combine_base_level():
     assert "spotbugs" in plugins
 
 
+def test_config_flattened_levels():
+    """Test that levels are flattened with the levels they inherit from.
+
+    Expected result: plugins are combined, string settings are joined, other settings
+    come from the first inherited level and missing inherited levels are skipped
+    """
+    config_file = os.path.join(
+        os.path.dirname(__file__), "rsc", "multiple-inheritance.yaml"
+    )
+    config = Config(config_file)
+
+    assert config.get_enabled_plugins("combined", "tool") == [
+        "make",
+        "pylint",
+        "cppcheck",
+    ]
+    assert config.get_enabled_plugins("combined", "reporting") == ["print_to_console"]
+    assert config.get_tool_config("make", "combined", "flags") == "-Wall -Wextra"
+    assert config.get_plugin_config("tool", "make", "combined", "shards") == 4
+    assert config.get_tool_config("cppcheck", "combined", "flags", "") == ""
+    assert config.get_enabled_plugins("missing", "tool") == []
+
+
+def test_config_levels_read_only():
+    """Test that flattened levels can not be changed by callers.
+
+    Expected result: plugins and settings raise TypeError on assignment, and survive
+    pickling
+    """
+    config_file = os.path.join(
+        os.path.dirname(__file__), "rsc", "multiple-inheritance.yaml"
+    )
+    config = Config(config_file)
+    level_config = config.levels["combined"]
+    with pytest.raises(TypeError):
+        level_config.plugins["tool"] = ()
+    with pytest.raises(TypeError):
+        level_config.settings[("tool", "make", "flags")] = ""
+
+    config = pickle.loads(pickle.dumps(config))
+    assert config.get_tool_config("make", "combined", "flags") == "-Wall -Wextra"
+    with pytest.raises(TypeError):
+        config.levels["combined"].plugins["tool"] = ()
+
+
+def test_config_inheritance_cycle():
+    """Test for a Config with levels that inherit from each other.
+
+    Expected result: ValueError is thrown
+    """
+    with pytest.raises(ValueError):
+        Config(os.path.join(os.path.dirname(__file__), "rsc", "cycle.yaml"))
+
+
 def test_config_multi_line_yaml_flags():
     """Test that flags split across multiple lines are correctly parsed.
 
@@ -1,14 +1,19 @@
 """Tests for statick_tool.discovery_plugin."""
 
+import argparse
 import contextlib
 import os
+import shutil
 import subprocess
 
 import mock
 import pytest
 
 from statick_tool.discovery_plugin import DiscoveryPlugin
+from statick_tool.exceptions import Exceptions
 from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.plugins.discovery.c import CDiscoveryPlugin
 
 
 # From https://stackoverflow.com/questions/2059482/python-temporarily-modify-the-current-processs-environment
@@ -42,7 +47,10 @@ def modified_environ(*remove, **update):
 
 
 def test_discovery_plugin_find_files():
-    """Test calling find files."""
+    """Test calling find files.
+
+    The file command is only run on files whose type is not decided by their extension.
+    """
     dp = DiscoveryPlugin()
     if not dp.file_command_exists():
         pytest.skip("File command does not exist. Skipping test that requires it.")
@@ -56,7 +64,7 @@ def test_discovery_plugin_find_files():
         "test.sh",
     ]
     expected_fullpath = [os.path.join(package.path, filename) for filename in expected]
-    expected_file_cmd_out = [fullpath + ": empty\n" for fullpath in expected_fullpath]
+    expected_file_cmd_out = [expected_fullpath[0] + ": empty\n", "", "", ""]
     expected_dict = {}
     for i, filename in enumerate(expected):
         expected_dict[expected_fullpath[i]] = {
@@ -86,6 +94,142 @@ def test_discovery_plugin_find_files_multiple():
     assert package.files == expected_dict
 
 
+def make_tree(root, paths):
+    """Create empty files below a root directory."""
+    for path in paths:
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf8"):
+            pass
+
+
+def test_discovery_plugin_walk_package_order():
+    """Test that walking a package lists files in the same order as os.walk."""
+    dp = DiscoveryPlugin()
+    package_path = os.path.join(os.path.dirname(__file__), "valid_package")
+    package = Package("valid_package", package_path)
+    expected = [
+        os.path.join(root, fname)
+        for root, _, files in os.walk(package_path)
+        for fname in files
+    ]
+    assert dp.walk_package(package, []) == expected
+
+
+def test_discovery_plugin_find_files_pruned(tmp_path):
+    """Test that ignored directories and excepted files are not discovered."""
+    make_tree(
+        str(tmp_path),
+        [
+            "a.py",
+            os.path.join("node_modules", "x.js"),
+            os.path.join(".git", "config"),
+            os.path.join("env", "pyvenv.cfg"),
+            os.path.join("env", "lib.py"),
+            os.path.join("out", "CMakeCache.txt"),
+            os.path.join("out", "gen.cpp"),
+            os.path.join("src", "CMakeCache.txt"),
+            os.path.join("src", "CMakeLists.txt"),
+            os.path.join("src", "b.cpp"),
+            os.path.join("skipped", "c.py"),
+            os.path.join("src", "d_skip.py"),
+        ],
+    )
+    exceptions_file = os.path.join(str(tmp_path), "exceptions.yaml")
+    with open(exceptions_file, "w", encoding="utf8") as fid:
+        fid.write(
+            "global:\n"
+            "  exceptions:\n"
+            "    file:\n"
+            "      - tools: all\n"
+            "        globs: ['*/skipped/*', '*_skip.py', '*/exceptions.yaml']\n"
+        )
+    package = Package("pkg", str(tmp_path))
+
+    DiscoveryPlugin().find_files(package, Exceptions(exceptions_file))
+
+    assert sorted(package.files) == [
+        os.path.join(str(tmp_path), "a.py"),
+        os.path.join(str(tmp_path), "src", "CMakeCache.txt"),
+        os.path.join(str(tmp_path), "src", "CMakeLists.txt"),
+        os.path.join(str(tmp_path), "src", "b.cpp"),
+    ]
+
+
+def test_discovery_plugin_find_files_gitignore(tmp_path):
+    """Test that files ignored by git are not discovered when asked for."""
+    if shutil.which("git") is None:
+        pytest.skip("git does not exist. Skipping test that requires it.")
+    make_tree(
+        str(tmp_path),
+        ["a.py", "b.log", os.path.join("ignored", "c.py"), ".gitignore"],
+    )
+    with open(os.path.join(str(tmp_path), ".gitignore"), "w", encoding="utf8") as fid:
+        fid.write("*.log\nignored/\n")
+    subprocess.check_output(["git", "init", "-q"], cwd=str(tmp_path))
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--use-gitignore", dest="use_gitignore", action="store_true"
+    )
+    dp = DiscoveryPlugin()
+    dp.set_plugin_context(
+        PluginContext(arg_parser.parse_args(["--use-gitignore"]), None, None)
+    )
+    package = Package("pkg", str(tmp_path))
+
+    dp.find_files(package)
+
+    assert sorted(package.files) == [
+        os.path.join(str(tmp_path), ".gitignore"),
+        os.path.join(str(tmp_path), "a.py"),
+    ]
+
+
+def test_discovery_plugin_find_files_named_types(tmp_path):
+    """Test that files with a known extension are classified by name only.
+
+    Expected result: the file command is not run on a .js file with C contents, so the
+    C discovery plugin only finds the same contents in a file without an extension
+    """
+    if shutil.which("file") is None:
+        pytest.skip("File command does not exist. Skipping test that requires it.")
+    c_source = '#include <stdio.h>\n\nint main(void)\n{\n  printf("hi");\n}\n'
+    for fname in ["main.js", "main"]:
+        with open(os.path.join(str(tmp_path), fname), "w", encoding="utf8") as fid:
+            fid.write(c_source)
+    package = Package("pkg", str(tmp_path))
+
+    CDiscoveryPlugin().scan(package, "level")
+
+    js_file = os.path.join(str(tmp_path), "main.js")
+    c_file = os.path.join(str(tmp_path), "main")
+    assert package.files[js_file]["file_cmd_out"] == ""
+    assert "c source" in package.files[c_file]["file_cmd_out"]
+    assert package["c_src"] == [c_file]
+
+
+def test_discovery_plugin_find_files_changed_files():
+    """Test that find_files only records changed files when they are set."""
+    dp = DiscoveryPlugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    changed_file = os.path.join(package.path, "test.cpp")
+    package.changed_files = {
+        changed_file,
+        os.path.join(package.path, "deleted.cpp"),
+    }
+
+    dp.find_files(package)
+
+    assert package._walked  # pylint: disable=protected-access
+    assert list(package.files) == [changed_file]
+    assert package.files[changed_file]["name"] == "test.cpp"
+    assert package.get_changed_files(
+        [changed_file, os.path.join(package.path, "test.sh")]
+    ) == [changed_file]
+
+
 def test_discovery_plugin_get_file_cmd_output():
     """Test get_file_cmd_output."""
     dp = DiscoveryPlugin()
@@ -98,6 +242,38 @@ def test_discovery_plugin_get_file_cmd_output():
     assert filepath.lower() + ": empty\n" == dp.get_file_cmd_output(filepath)
 
 
+def test_discovery_plugin_get_file_cmd_outputs():
+    """Test that running the file command once matches running it on each file."""
+    dp = DiscoveryPlugin()
+    if not dp.file_command_exists():
+        pytest.skip("File command does not exist. Skipping test that requires it.")
+    package_path = os.path.join(os.path.dirname(__file__), "valid_package")
+    filepaths = [
+        os.path.join(package_path, filename)
+        for filename in ["CMakeLists.txt", "package.xml", "test.sh", "missing"]
+    ]
+    outputs = dp.get_file_cmd_outputs(filepaths)
+    assert outputs == {
+        filepath: dp.get_file_cmd_output(filepath) for filepath in filepaths
+    }
+
+
+@mock.patch("statick_tool.discovery_plugin.subprocess.check_output")
+def test_discovery_plugin_get_file_cmd_outputs_calledprocess_error(
+    mock_subprocess_check_output,
+):
+    """Test what happens when a CalledProcessError is raised for many files.
+
+    Expected result: no output is returned for any file.
+    """
+    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
+        1, "", output="mocked error"
+    )
+    dp = DiscoveryPlugin()
+    filepath = os.path.join(os.path.dirname(__file__), "valid_package", "test.sh")
+    assert not dp.get_file_cmd_outputs([filepath])
+
+
 def test_discovery_plugin_get_file_cmd_output_no_file_cmd():
     """Test get_file_cmd_output when file command does not exist."""
     with modified_environ(PATH=""):
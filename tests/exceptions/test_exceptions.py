@@ -1,9 +1,11 @@
 """Unit tests for the Exceptions module."""
 
+import fnmatch
 import os
 import tempfile
 from tempfile import TemporaryDirectory
 
+import mock
 import pytest
 
 from statick_tool.exceptions import Exceptions
@@ -492,3 +494,118 @@ def test_filter_issues_wildcard_exceptions():
 
     issues = exceptions.filter_issues(package, issues)
     assert len(issues["pylint"]) == 1
+
+
+def test_filter_issues_compiled_matches_fnmatch():
+    """Test that compiled exceptions remove the same issues as matching each pattern.
+
+    Expected result: exactly the issues matching a pattern or regex are removed
+    """
+    with TemporaryDirectory() as tmp_dir:
+        exceptions_path = os.path.join(tmp_dir, "exceptions.yaml")
+        with open(exceptions_path, "w", encoding="utf8") as fid:
+            fid.write(
+                "global:\n"
+                "  exceptions:\n"
+                "    file:\n"
+                "      - tools: all\n"
+                "        globs: ['*/third_party/*', 'gen_*.py']\n"
+                "      - tools: [pylint]\n"
+                "        globs: ['*/tests/*']\n"
+                "    message_regex:\n"
+                "      - tools: [pylint, flake8]\n"
+                "        regex: 'W0[0-9]+'\n"
+                "      - tools: all\n"
+                "        regex: '.*ignore me'\n"
+                "        globs: ['*/src/*']\n"
+            )
+        package = Package("package", tmp_dir)
+        exceptions = Exceptions(exceptions_path)
+
+        dirs = ["src", "tests", "third_party", "."]
+        names = ["a.py", "gen_b.py", "c.py"]
+        messages = ["W0102 dangerous default", "please ignore me", "E0001 error"]
+        issues = {}
+        for tool in ["pylint", "flake8", "bandit"]:
+            issues[tool] = [
+                Issue(
+                    os.path.normpath(os.path.join(tmp_dir, dirname, name)),
+                    line,
+                    tool,
+                    "type",
+                    3,
+                    message,
+                    None,
+                )
+                for dirname in dirs
+                for name in names
+                for line, message in enumerate(messages)
+            ]
+
+        def is_excepted(issue):
+            rel_path = os.path.relpath(issue.filename, tmp_dir)
+            if fnmatch.fnmatch(issue.filename, "*/third_party/*") or fnmatch.fnmatch(
+                rel_path, "gen_*.py"
+            ):
+                return True
+            if issue.tool == "pylint" and fnmatch.fnmatch(issue.filename, "*/tests/*"):
+                return True
+            if issue.tool != "bandit" and issue.message.startswith("W0"):
+                return True
+            return fnmatch.fnmatch(
+                issue.filename, "*/src/*"
+            ) and issue.message.endswith("ignore me")
+
+        expected = {
+            tool: [issue for issue in tool_issues if not is_excepted(issue)]
+            for tool, tool_issues in issues.items()
+        }
+        assert exceptions.filter_issues(package, issues) == expected
+        assert exceptions.get_compiled_exceptions(
+            package
+        ) is exceptions.get_compiled_exceptions(package)
+
+
+def test_filter_regex_exceptions_invalid_regex():
+    """Test that an invalid regex in an exception is skipped.
+
+    Expected result: only the valid regex is applied
+    """
+    issues = {
+        "pylint": [
+            Issue("x.py", 1, "pylint", "type", 3, "first", None),
+            Issue("x.py", 2, "pylint", "type", 3, "second", None),
+        ]
+    }
+    exceptions = [
+        {"tools": "all", "regex": "first["},
+        {"tools": "all", "regex": "sec"},
+    ]
+    issues = Exceptions.filter_regex_exceptions(exceptions, issues)
+    assert issues["pylint"] == [Issue("x.py", 1, "pylint", "type", 3, "first", None)]
+
+
+def test_filter_nolint_reads_file_once():
+    """Test that NOLINT filtering reads each file once for all issues and tools.
+
+    Expected result: issues on NOLINT lines are removed and the file is opened once
+    """
+    exceptions = Exceptions(
+        os.path.join(os.path.dirname(__file__), "valid_exceptions.yaml")
+    )
+    with TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "x.cpp")
+        with open(filename, "w", encoding="utf8") as fid:
+            fid.write("int a;\nint b;  // NOLINT\nint c;\r\nint d;  // NOLINT\n")
+        issues = {
+            tool: [
+                Issue(filename, line, tool, "type", 3, "message", None)
+                for line in range(1, 6)
+            ]
+            for tool in ["cppcheck", "clang-tidy"]
+        }
+        with mock.patch("builtins.open", wraps=open) as mock_open:
+            issues = exceptions.filter_nolint(issues)
+            assert mock_open.call_count == 1
+        for tool in ["cppcheck", "clang-tidy"]:
+            assert [issue.line_number for issue in issues[tool]] == [1, 3, 5]
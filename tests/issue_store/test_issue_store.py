@@ -0,0 +1,113 @@
+"""Tests for the issue store module."""
+
+import pickle
+
+import pytest
+
+from statick_tool.issue import Issue
+from statick_tool.issue_store import IssueStore
+
+
+def make_issues():
+    """Make issues that repeat file names, tools and types."""
+    return [
+        Issue("a.py", 1, "pylint", "W0611", 3, "Unused import os", None),
+        Issue("a.py", 2, "pylint", "W0611", 3, "Unused import sys", "CERT"),
+        Issue("b.py", 0, "black", "format", 1, "would reformat", None),
+    ]
+
+
+def test_issue_store_sequence():
+    """Test that the store reads back like a list of issues.
+
+    Expected result: the same issues in the same order, by index, slice and iteration
+    """
+    issues = make_issues()
+    store = IssueStore(issues)
+    assert len(store) == 3
+    assert list(store) == issues
+    assert store[1] == issues[1]
+    assert store[-1] == issues[-1]
+    assert store[1:] == issues[1:]
+    assert store == issues
+    assert store
+    assert not IssueStore()
+    with pytest.raises(IndexError):
+        store[3]  # pylint: disable=pointless-statement
+
+
+def test_issue_store_interns_strings():
+    """Test that repeated strings are kept once.
+
+    Expected result: the string table holds each distinct string once
+    """
+    store = IssueStore(make_issues() * 100)
+    assert len(store) == 300
+    assert sorted(store.strings) == sorted(
+        {
+            "a.py",
+            "b.py",
+            "pylint",
+            "black",
+            "W0611",
+            "format",
+            "Unused import os",
+            "Unused import sys",
+            "would reformat",
+            "CERT",
+        }
+    )
+
+
+def test_issue_store_extend():
+    """Test that stores with different string tables can be combined.
+
+    Expected result: issues of both stores, in order
+    """
+    first = IssueStore(make_issues()[:1])
+    second = IssueStore(make_issues()[1:])
+    first.extend(second)
+    assert first == make_issues()
+    first.extend(make_issues())
+    assert first == make_issues() * 2
+
+
+def test_issue_store_unusual_values():
+    """Test that values that do not fit in the typed columns are kept as they are.
+
+    Expected result: line numbers and severities given as strings are read back
+    """
+    issues = [
+        Issue("a.py", "12", "tool", "type", "3", "message", None),
+        Issue("b.py", 2**70, "tool", "type", 1000, "message", None),
+    ]
+    store = IssueStore(issues)
+    other = IssueStore(make_issues())
+    other.extend(store)
+    assert list(store) == issues
+    assert other[3:] == issues
+
+
+def test_issue_store_pickle():
+    """Test that a store survives pickling and is smaller than a list of issues.
+
+    Expected result: the same issues after unpickling, and new issues can be added
+    """
+    # Parsed issues hold their own copies of repeated strings.
+    lines = [
+        f"src/file{index % 10}.cpp:{index}:tool:type:message" for index in range(1000)
+    ]
+    issues = []
+    for line in lines:
+        filename, line_number, tool, issue_type, message = line.split(":")
+        issues.append(
+            Issue(filename, int(line_number), tool, issue_type, 3, message, None)
+        )
+    store = IssueStore(issues)
+    data = pickle.dumps(store)
+    assert len(data) < len(pickle.dumps(issues)) / 2
+    restored = pickle.loads(data)
+    assert restored == issues
+    restored.append(issues[0])
+    assert restored.strings == store.strings
+    assert restored[-1] == issues[0]
@@ -0,0 +1,62 @@
+"""Tests for the package scheduler module."""
+
+import os
+from tempfile import TemporaryDirectory
+
+from statick_tool.package import Package
+from statick_tool.package_scheduler import PackageScheduler
+
+
+def test_package_scheduler_order_by_size():
+    """Test that packages without recorded durations are ordered by size.
+
+    Expected result: largest package first, ties keep their order, and packages
+    without a size come last
+    """
+    small = Package("small", "small")
+    large = Package("large", "large")
+    other_small = Package("other_small", "other_small")
+    unknown = Package("unknown", "unknown")
+    sizes = {small.path: 1, large.path: 10, other_small.path: 1}
+    scheduler = PackageScheduler()
+    assert scheduler.get_order([unknown, small, large, other_small], sizes) == [
+        large,
+        small,
+        other_small,
+        unknown,
+    ]
+    assert scheduler.get_order([small, large]) == [small, large]
+
+
+def test_package_scheduler_order_by_duration():
+    """Test that recorded durations are kept on disk and used to order packages.
+
+    Expected result: packages without a duration first, then longest first
+    """
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as cache_dir:
+        fast = Package("fast", os.path.join(tmp_dir, "fast"))
+        slow = Package("slow", os.path.join(tmp_dir, "slow"))
+        new = Package("new", os.path.join(tmp_dir, "new"))
+        scheduler = PackageScheduler(cache_dir)
+        scheduler.record(fast, 1.0)
+        scheduler.record(slow, 30.0)
+        scheduler.save_durations()
+
+        scheduler = PackageScheduler(cache_dir)
+        sizes = {fast.path: 100, slow.path: 1, new.path: 1}
+        assert scheduler.get_order([fast, slow, new], sizes) == [new, slow, fast]
+
+
+def test_package_scheduler_invalid_cache_file():
+    """Test that an invalid durations file is ignored.
+
+    Expected result: no durations are loaded
+    """
+    with TemporaryDirectory() as cache_dir:
+        with open(
+            os.path.join(cache_dir, PackageScheduler.CACHE_FILE_NAME),
+            "w",
+            encoding="utf8",
+        ) as fid:
+            fid.write("[1, 2")
+        assert not PackageScheduler(cache_dir).durations
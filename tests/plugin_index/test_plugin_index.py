@@ -0,0 +1,259 @@
+"""Tests for the plugin index module."""
+
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+import mock
+import pytest
+
+from statick_tool.args import Args
+from statick_tool.plugin_index import ArgumentRecorder, PluginIndex
+from statick_tool.plugins.tool.pylint import PylintToolPlugin
+from statick_tool.statick_tool import Statick
+
+
+class CustomTypeToolPlugin(PylintToolPlugin):
+    """Tool plugin with an argument that can not be written as JSON."""
+
+    def gather_args(self, args):
+        """Add an argument with a custom type."""
+        args.add_argument("--custom-type", dest="custom_type", type=lambda x: x.upper())
+
+
+def test_plugin_index_lazy_loading():
+    """Test that plugins are only loaded when they are used.
+
+    Expected result: names are known without loading plugins, and a plugin is loaded
+    the first time it is looked up
+    """
+    index = PluginIndex("statick_tool.plugins.tool")
+    assert "pylint" in index
+    assert "nonexistent" not in index
+    assert "pylint" in list(index)
+    assert len(index) == len(index.entry_points)
+    assert not index.plugins
+
+    assert isinstance(index["pylint"], PylintToolPlugin)
+    assert index["pylint"] is index["pylint"]
+    assert index.is_loaded("pylint")
+    assert list(index.plugins) == ["pylint"]
+    with pytest.raises(KeyError):
+        index["nonexistent"]  # pylint: disable=pointless-statement
+
+    index["custom"] = CustomTypeToolPlugin()
+    assert index.is_loaded("custom")
+    del index["pylint"]
+    assert "pylint" not in index
+    with pytest.raises(KeyError):
+        del index["pylint"]
+
+    index = pickle.loads(pickle.dumps(index))
+    assert "custom" in index
+    assert not index.is_loaded("bandit")
+
+
+def test_plugin_index_cached_arguments():
+    """Test that arguments of plugins are added without loading them once cached.
+
+    Expected result: the second parser has the same arguments, and no plugin is loaded
+    to build it
+    """
+    with TemporaryDirectory() as cache_dir:
+        statick = Statick([], cache_dir)
+        parser = argparse.ArgumentParser()
+        statick.gather_args(parser)
+        assert os.path.isfile(os.path.join(cache_dir, PluginIndex.ARGUMENTS_FILE_NAME))
+        expected = parser.parse_args(["--clang-tidy-bin", "clang-tidy-14"])
+        assert expected.clang_format_raise_exception
+
+        statick = Statick([], cache_dir)
+        parser = argparse.ArgumentParser()
+        with mock.patch.object(PluginIndex, "store_arguments") as store_arguments:
+            statick.gather_args(parser)
+            store_arguments.assert_not_called()
+        assert not statick.tool_plugins.plugins
+        assert not statick.reporting_plugins.plugins
+        assert not statick.discovery_plugins.plugins
+        assert parser.parse_args(["--clang-tidy-bin", "clang-tidy-14"]) == expected
+
+
+def test_plugin_index_uncacheable_arguments():
+    """Test that plugins with arguments that can not be written as JSON still work.
+
+    Expected result: the argument is added with its type, and is not kept
+    """
+    recorder = ArgumentRecorder()
+    CustomTypeToolPlugin().gather_args(recorder)
+    assert recorder.get_declarations() is None
+
+    index = PluginIndex("statick_tool.plugins.tool")
+    for name in list(index):
+        del index[name]
+    index["custom"] = CustomTypeToolPlugin()
+    parser = argparse.ArgumentParser()
+    assert not index.gather_args(parser)
+    assert parser.parse_args(["--custom-type", "abc"]).custom_type == "ABC"
+
+
+def test_plugin_index_argument_types():
+    """Test that argument types are written by name and restored.
+
+    Expected result: the restored argument parses values with the original type
+    """
+    recorder = ArgumentRecorder()
+    recorder.add_argument("--count", dest="count", type=int, default=1)
+    recorder.set_defaults(count=2)
+    declarations = recorder.get_declarations()
+    assert declarations == [
+        ["add_argument", ["--count"], {"dest": "count", "type": "int", "default": 1}],
+        ["set_defaults", [], {"count": 2}],
+    ]
+
+    parser = argparse.ArgumentParser()
+    ArgumentRecorder.add_declarations(parser, declarations)
+    assert parser.parse_args([]).count == 2
+    assert parser.parse_args(["--count", "3"]).count == 3
+
+
+def test_plugin_index_level_plugins():
+    """Test that a scan only loads the plugins of the selected level.
+
+    Expected result: only the tool, discovery and reporting plugins of the level are
+    loaded
+    """
+    user_path = os.path.join(os.path.dirname(__file__), os.pardir, "statick_tool")
+    with TemporaryDirectory() as package_dir, TemporaryDirectory() as output_dir:
+        with open(os.path.join(package_dir, "test.py"), "w", encoding="utf8") as fid:
+            fid.write('"""Test module."""\n')
+        args = Args("Statick tool")
+        statick = Statick(args.get_user_paths(["--user-paths", user_path]))
+        statick.gather_args(args.parser)
+        parsed_args = args.get_args(
+            [
+                "--user-paths",
+                user_path,
+                "--output-directory",
+                output_dir,
+                "--profile",
+                os.path.join(user_path, "rsc", "profile-custom.yaml"),
+            ]
+        )
+        statick.get_config(parsed_args)
+        statick.get_exceptions(parsed_args)
+        statick.tool_plugins.plugins.clear()
+        statick.discovery_plugins.plugins.clear()
+        statick.reporting_plugins.plugins.clear()
+
+        statick.run(package_dir, parsed_args)
+        assert list(statick.tool_plugins.plugins) == ["pylint"]
+        assert list(statick.discovery_plugins.plugins) == ["python"]
+        assert list(statick.reporting_plugins.plugins) == ["print_to_console"]
+
+
+def test_plugin_index_cached_entry_points():
+    """Test that entry points are found again only when the search path changes.
+
+    Expected result: package metadata is not read while the search path is unchanged
+    """
+    groups = ["statick_tool.plugins.discovery", "statick_tool.plugins.tool"]
+    with TemporaryDirectory() as cache_dir:
+        entry_points = PluginIndex.find_entry_points(groups, cache_dir)
+        assert entry_points == PluginIndex.find_entry_points(groups)
+        assert (
+            entry_points["statick_tool.plugins.tool"]["pylint"]
+            == "statick_tool.plugins.tool.pylint:PylintToolPlugin"
+        )
+
+        with mock.patch("importlib.metadata.entry_points") as mock_entry_points:
+            assert PluginIndex.find_entry_points(groups, cache_dir) == entry_points
+            mock_entry_points.assert_not_called()
+
+            with mock.patch.object(
+                PluginIndex, "get_search_path_key", return_value=[["changed", 1]]
+            ):
+                PluginIndex.find_entry_points(groups, cache_dir)
+            mock_entry_points.assert_called()
+
+    assert (
+        PluginIndex.load_entry_point(
+            "statick_tool.plugins.tool.pylint:PylintToolPlugin [extra]"
+        )
+        is PylintToolPlugin
+    )
+
+
+def test_plugin_index_deferred_imports():
+    """Test that starting Statick with a warm cache skips slow imports.
+
+    Expected result: package metadata, tabulate and yaml are not imported
+    """
+    script = (
+        "import argparse, sys\n"
+        "from statick_tool.statick_tool import Statick\n"
+        "statick = Statick([], sys.argv[1])\n"
+        "statick.gather_args(argparse.ArgumentParser())\n"
+        "print(sorted({'importlib.metadata', 'tabulate', 'yaml'} & set(sys.modules)))\n"
+    )
+    # The working directory is on the search path, so the cache is kept elsewhere.
+    with TemporaryDirectory() as work_dir, TemporaryDirectory() as cache_dir:
+        subprocess.run(
+            [sys.executable, "-c", script, cache_dir], check=True, cwd=work_dir
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script, cache_dir],
+            check=True,
+            cwd=work_dir,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+    assert output.strip() == "[]"
+
+
+def test_plugin_index_declared_arguments():
+    """Test that the declared arguments match the arguments the plugins add.
+
+    Expected result: every plugin that comes with Statick has its arguments declared,
+    as the plugin records them
+    """
+    groups = [
+        "statick_tool.plugins.discovery",
+        "statick_tool.plugins.reporting",
+        "statick_tool.plugins.tool",
+    ]
+    expected = {}
+    for entry_points in PluginIndex.find_entry_points(groups).values():
+        for entry_point in entry_points.values():
+            recorder = ArgumentRecorder()
+            PluginIndex.load_entry_point(entry_point)().gather_args(recorder)
+            expected[entry_point] = recorder.get_declarations()
+    assert PluginIndex.load_declared_arguments() == expected
+
+
+def test_plugin_index_uncached_arguments():
+    """Test that building the argument parser without a cache loads no plugins.
+
+    Expected result: no plugin module is imported, and plugin arguments are added
+    """
+    script = (
+        "import argparse, sys\n"
+        "from statick_tool.statick_tool import Statick\n"
+        "parser = argparse.ArgumentParser()\n"
+        "Statick([]).gather_args(parser)\n"
+        "print(parser.parse_args(['--clang-tidy-bin', 'clang-tidy-14']).clang_tidy_bin)\n"
+        "print(sorted(name for name in sys.modules\n"
+        "             if name.startswith('statick_tool.plugins.')\n"
+        "             and name.count('.') > 2))\n"
+    )
+    with TemporaryDirectory() as work_dir:
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            cwd=work_dir,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+    assert output.split("\n")[:2] == ["clang-tidy-14", "[]"]
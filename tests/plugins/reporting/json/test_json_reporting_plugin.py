@@ -1,6 +1,7 @@
 """Unit tests for the JSON reporting plugin."""
 
 import argparse
+import json
 import os
 import sys
 
@@ -42,9 +43,7 @@ def test_json_reporting_plugin_found():
     for plugin_type in reporting_plugins:
         plugin = plugin_type.load()
         plugins[plugin_type.name] = plugin()
-    assert any(
-        plugin.get_name() == "json" for _, plugin in list(plugins.items())
-    )
+    assert any(plugin.get_name() == "json" for _, plugin in list(plugins.items()))
 
 
 def test_json_reporting_plugin_report_cert_reference():
@@ -114,3 +113,91 @@ def test_json_reporting_plugin_write_output_no_plugin_context():
         output_file = os.path.join(os.getcwd(), package.name + "-" + "level" + ".json")
         if os.path.exists(output_file):
             os.remove(output_file)
+
+
+def test_json_reporting_plugin_report_matches_json_dumps():
+    """Test that the streamed report is the same as encoding all issues at once.
+
+    Expected result: the report file holds the output of json.dumps
+    """
+    with TemporaryDirectory() as tmp_dir:
+        jrp = setup_json_reporting_plugin(tmp_dir)
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        issues = {
+            "tool_a": [
+                Issue("test.txt", 1, "tool_a", "type", 1, "This is a test", "CERT")
+            ],
+            "tool_b": [
+                Issue("b.txt", 2, "tool_b", "type", 3, 'Quote " here', None),
+                Issue("c.txt", 3, "tool_b", "type", 5, "Unicode é", None),
+            ],
+        }
+        _, success = jrp.report(package, issues, "level")
+        assert success
+        expected = {
+            "issues": [
+                jrp.get_issue_dict(issue)
+                for value in issues.values()
+                for issue in value
+            ]
+        }
+        with open(
+            os.path.join(
+                tmp_dir, "valid_package-level", "valid_package-level.statick.json"
+            ),
+            encoding="utf8",
+        ) as fid:
+            assert fid.read() == json.dumps(expected)
+
+        _, success = jrp.report(package, {}, "level")
+        assert success
+        with open(
+            os.path.join(
+                tmp_dir, "valid_package-level", "valid_package-level.statick.json"
+            ),
+            encoding="utf8",
+        ) as fid:
+            assert json.load(fid) == {"issues": []}
+
+
+def test_json_reporting_plugin_report_ndjson():
+    """Test the output of the reporting plugin in the ndjson format.
+
+    Expected result: one JSON object per issue on each line
+    """
+    with TemporaryDirectory() as tmp_dir:
+        jrp = setup_json_reporting_plugin(tmp_dir)
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        issues = {
+            "tool_a": [
+                Issue("a.txt", 1, "tool_a", "type", 1, "First", "CERT"),
+                Issue("b.txt", 2, "tool_a", "type", 1, "Second", None),
+            ]
+        }
+        _, success = jrp.report(package, issues, "ndjson")
+        assert success
+        with open(
+            os.path.join(
+                tmp_dir, "valid_package-ndjson", "valid_package-ndjson.statick.ndjson"
+            ),
+            encoding="utf8",
+        ) as fid:
+            lines = fid.read().splitlines()
+        assert [json.loads(line)["fileName"] for line in lines] == ["a.txt", "b.txt"]
+        assert json.loads(lines[0])["certReference"] == "CERT"
+
+
+def test_json_reporting_plugin_get_format_invalid():
+    """Test that an unknown report format falls back to json.
+
+    Expected result: json is used
+    """
+    with TemporaryDirectory() as tmp_dir:
+        jrp = setup_json_reporting_plugin(tmp_dir)
+        assert jrp.get_format("invalid_format") == "json"
+        assert jrp.get_format("ndjson") == "ndjson"
+        assert jrp.get_format("level") == "json"
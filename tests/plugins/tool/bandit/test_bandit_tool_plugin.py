@@ -48,9 +48,7 @@ def test_bandit_tool_plugin_found():
     for plugin_type in tool_plugins:
         plugin = plugin_type.load()
         plugins[plugin_type.name] = plugin()
-    assert any(
-        plugin.get_name() == "bandit" for _, plugin in list(plugins.items())
-    )
+    assert any(plugin.get_name() == "bandit" for _, plugin in list(plugins.items()))
 
 
 def test_bandit_tool_plugin_scan_valid():
@@ -176,6 +174,25 @@ def test_bandit_tool_plugin_parse_valid():
     assert issues[0].severity == 3
 
 
+def test_bandit_tool_plugin_parse_shards():
+    """Verify that we can parse the output of bandit run in several shards."""
+    btp = setup_bandit_tool_plugin()
+    header = "filename,test_name,test_id,issue_severity,issue_confidence,issue_text,line_number,line_range,more_info"
+    output = [
+        "[main]\tINFO\tprofile include tests: None",
+        header,
+        "a.py,blacklist,B404,LOW,HIGH,Consider subprocess.,1,[1],https://bandit.readthedocs.io",
+        "[main]\tINFO\tprofile include tests: None",
+        header,
+        "b.py,blacklist,B404,LOW,HIGH,Consider subprocess.,2,[2],https://bandit.readthedocs.io",
+    ]
+    issues = btp.parse_output(output)
+    assert [(issue.filename, issue.line_number) for issue in issues] == [
+        ("a.py", 1),
+        ("b.py", 2),
+    ]
+
+
 def test_bandit_tool_plugin_parse_invalid():
     """Verify that we don't return anything on bad input."""
     btp = setup_bandit_tool_plugin()
@@ -300,3 +300,35 @@ def test_cccc_tool_plugin_scan_filenotfound(mock_xmltodict_parse):
     ]
     issues = ctp.scan(package, "level")
     assert not issues
+
+
+@mock.patch("statick_tool.plugins.tool.cccc.subprocess.check_output")
+def test_cccc_tool_plugin_scan_output_dirs(mock_subprocess_check_output):
+    """Test that files with the same name are given their own output directories.
+
+    Expected result: each file has a distinct output directory, and a file listed twice
+    uses the same output directory both times
+    """
+    mock_subprocess_check_output.return_value = b""
+    ctp = setup_cccc_tool_plugin()
+    ctp.plugin_context.args.output_directory = None
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["c_src"] = [
+        os.path.join("a", "example.cpp"),
+        os.path.join("b", "example.cpp"),
+        os.path.join("a", "example.cpp"),
+        os.path.join("c", "example.cpp-2"),
+    ]
+    assert not ctp.scan(package, "level")
+
+    output_dirs = {}
+    for call in mock_subprocess_check_output.call_args_list:
+        command = call[0][0]
+        output_dirs.setdefault(command[-1], set()).add(command[-2])
+    assert output_dirs == {
+        os.path.join("a", "example.cpp"): {"--outdir=.cccc-example.cpp"},
+        os.path.join("b", "example.cpp"): {"--outdir=.cccc-example.cpp-2"},
+        os.path.join("c", "example.cpp-2"): {"--outdir=.cccc-example.cpp-2-2"},
+    }
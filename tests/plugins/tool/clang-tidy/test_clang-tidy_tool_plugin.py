@@ -1,6 +1,7 @@
 """Unit tests for the clang-tidy plugin."""
 
 import argparse
+import json
 import os
 import subprocess
 import sys
@@ -52,9 +53,7 @@ def test_clang_tidy_tool_plugin_found():
     for plugin_type in tool_plugins:
         plugin = plugin_type.load()
         plugins[plugin_type.name] = plugin()
-    assert any(
-        plugin.get_name() == "clang-tidy" for _, plugin in list(plugins.items())
-    )
+    assert any(plugin.get_name() == "clang-tidy" for _, plugin in list(plugins.items()))
 
 
 def test_clang_tidy_tool_plugin_scan_valid():
@@ -273,14 +272,16 @@ def test_clang_tidy_tool_plugin_scan_missing_fields():
     assert not issues
 
 
-@mock.patch("statick_tool.plugins.tool.clang_tidy.subprocess.check_output")
-def test_clang_tidy_tool_plugin_scan_oserror(mock_subprocess_check_output):
+@mock.patch(
+    "statick_tool.plugins.tool.clang_tidy.ClangTidyToolPlugin.stream_output_batched"
+)
+def test_clang_tidy_tool_plugin_scan_oserror(mock_stream_output):
     """Test what happens when an OSError is raised (usually means clang-tidy doesn't
     exist).
 
     Expected result: issues is None
     """
-    mock_subprocess_check_output.side_effect = OSError("mocked error")
+    mock_stream_output.side_effect = OSError("mocked error")
     cttp = setup_clang_tidy_tool_plugin()
     with TemporaryDirectory() as bin_dir:
         package = Package(
@@ -297,14 +298,16 @@ def test_clang_tidy_tool_plugin_scan_oserror(mock_subprocess_check_output):
     assert issues is None
 
 
-@mock.patch("statick_tool.plugins.tool.clang_tidy.subprocess.check_output")
-def test_clang_tidy_tool_plugin_scan_calledprocesserror(mock_subprocess_check_output):
+@mock.patch(
+    "statick_tool.plugins.tool.clang_tidy.ClangTidyToolPlugin.stream_output_batched"
+)
+def test_clang_tidy_tool_plugin_scan_calledprocesserror(mock_stream_output):
     """Test what happens when a CalledProcessError is raised (usually means clang-tidy
     hit an error).
 
     Expected result: issues is None
     """
-    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
+    mock_stream_output.side_effect = subprocess.CalledProcessError(
         2, "", output="mocked error"
     )
     cttp = setup_clang_tidy_tool_plugin()
@@ -323,14 +326,16 @@ def test_clang_tidy_tool_plugin_scan_calledprocesserror(mock_subprocess_check_ou
     assert issues is None
 
 
-@mock.patch("statick_tool.plugins.tool.clang_tidy.subprocess.check_output")
-def test_clang_tidy_tool_plugin_scan_diagnosticerror(mock_subprocess_check_output):
+@mock.patch(
+    "statick_tool.plugins.tool.clang_tidy.ClangTidyToolPlugin.stream_output_batched"
+)
+def test_clang_tidy_tool_plugin_scan_diagnosticerror(mock_stream_output):
     """Test that a CalledProcessError is raised when subprocess's output contains
     'clang-diagnostic-error'.
 
     Expected result: issues is None
     """
-    mock_subprocess_check_output.return_value = "clang-diagnostic-error"
+    mock_stream_output.return_value = iter(["clang-diagnostic-error"])
     cttp = setup_clang_tidy_tool_plugin()
     with TemporaryDirectory() as bin_dir:
         package = Package(
@@ -347,6 +352,76 @@ def test_clang_tidy_tool_plugin_scan_diagnosticerror(mock_subprocess_check_outpu
     assert issues is None
 
 
+def test_clang_tidy_tool_plugin_get_translation_units():
+    """Test that only files in the compilation database are checked.
+
+    Expected result: headers are skipped, and all files are kept if the database can
+    not be read
+    """
+    with TemporaryDirectory() as bin_dir:
+        src_dir = os.path.join(os.path.dirname(__file__), "valid_package")
+        compile_commands = os.path.join(bin_dir, "compile_commands.json")
+        with open(compile_commands, "w", encoding="utf8") as fid:
+            json.dump(
+                [
+                    {"directory": src_dir, "file": "test.c", "command": "cc test.c"},
+                    {"directory": bin_dir, "file": "/other/main.c", "command": "cc"},
+                ],
+                fid,
+            )
+        files = [os.path.join(src_dir, "test.c"), os.path.join(src_dir, "test.h")]
+        assert ClangTidyToolPlugin.get_translation_units(compile_commands, files) == [
+            files[0]
+        ]
+        assert (
+            ClangTidyToolPlugin.get_translation_units(
+                os.path.join(bin_dir, "missing.json"), files
+            )
+            == files
+        )
+
+
+@mock.patch(
+    "statick_tool.plugins.tool.clang_tidy.ClangTidyToolPlugin.stream_output_batched"
+)
+def test_clang_tidy_tool_plugin_scan_shards(mock_stream_output):
+    """Test that translation units are split into shards and header issues are merged.
+
+    Expected result: clang-tidy runs on the translation units in shards, and an issue
+    in a header reported for two translation units is kept once
+    """
+    header_line = "/tmp/valid_package/test.h:3:5: warning: header issue [readability-x]"
+    mock_stream_output.return_value = iter(
+        [
+            header_line,
+            "/tmp/valid_package/test.c:6:3: warning: source issue [readability-y]",
+            header_line,
+        ]
+    )
+    cttp = setup_clang_tidy_tool_plugin()
+    with TemporaryDirectory() as bin_dir:
+        src_dir = os.path.join(os.path.dirname(__file__), "valid_package")
+        with open(
+            os.path.join(bin_dir, "compile_commands.json"), "w", encoding="utf8"
+        ) as fid:
+            json.dump([{"directory": src_dir, "file": "test.c", "command": "cc"}], fid)
+        package = Package("valid_package", src_dir)
+        package["make_targets"] = [
+            {"src": [os.path.join(src_dir, "test.c"), os.path.join(src_dir, "test.h")]}
+        ]
+        package["bin_dir"] = bin_dir
+        package["src_dir"] = src_dir
+        with mock.patch.object(ClangTidyToolPlugin, "get_shards", return_value=4):
+            issues = cttp.scan(package, "level")
+    assert [(issue.filename, issue.line_number) for issue in issues] == [
+        ("/tmp/valid_package/test.h", 3),
+        ("/tmp/valid_package/test.c", 6),
+    ]
+    args, kwargs = mock_stream_output.call_args
+    assert args[1] == [os.path.join(src_dir, "test.c")]
+    assert kwargs["shards"] == 4
+
+
 def test_checkforexceptions_true():
     """Test check_for_exceptions behavior where it should return True."""
     mm = mock.MagicMock()
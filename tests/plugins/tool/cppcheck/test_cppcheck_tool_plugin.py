@@ -1,9 +1,11 @@
 """Unit tests for the cppcheck plugin."""
 
 import argparse
+import json
 import os
 import subprocess
 import sys
+from tempfile import TemporaryDirectory
 
 import mock
 import pytest
@@ -290,3 +292,186 @@ def test_cppcheck_tool_plugin_version_match(mock_subprocess_check_output):
     package["headers"] = []
     issues = cctp.scan(package, "level")
     assert issues is None
+
+
+def test_cppcheck_tool_plugin_get_project():
+    """Test that project mode uses the compilation database of the package.
+
+    Expected result: the database is used only when project mode is enabled and the
+    database exists
+    """
+    cctp = setup_cppcheck_tool_plugin()
+    with TemporaryDirectory() as bin_dir:
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        package["bin_dir"] = bin_dir
+        compile_commands = os.path.join(bin_dir, "compile_commands.json")
+        with open(compile_commands, "w", encoding="utf8") as fid:
+            fid.write("[]")
+        assert cctp.get_project(package, "level") is None
+
+        cctp.plugin_context.config.get_tool_config = mock.MagicMock(return_value=True)
+        assert cctp.get_project(package, "level") == compile_commands
+
+        os.remove(compile_commands)
+        assert cctp.get_project(package, "level") is None
+
+
+@mock.patch("statick_tool.plugins.tool.cppcheck.subprocess.check_output")
+def test_cppcheck_tool_plugin_scan_project(mock_subprocess_check_output):
+    """Test that project mode checks the compilation database with parallel jobs.
+
+    Expected result: cppcheck runs once on the project with a build directory in the
+    cache directory, the version is not probed, and issues are parsed as usual
+    """
+    package_dir = os.path.join(os.path.dirname(__file__), "valid_package")
+    mock_subprocess_check_output.return_value = (
+        f"[{os.path.join(package_dir, 'test.c')}:4]: (error uninitvar) "
+        "Uninitialized variable: si\n"
+    )
+    cctp = setup_cppcheck_tool_plugin()
+    cctp.plugin_context.config.get_tool_config = mock.MagicMock(
+        side_effect=lambda tool, level, key: "true" if key == "project" else None
+    )
+    with TemporaryDirectory() as bin_dir, TemporaryDirectory() as cache_dir:
+        cctp.plugin_context.args.cache_dir = cache_dir
+        cctp.plugin_context.args.max_procs = 4
+        # Keep the log out of the working directory.
+        cctp.plugin_context.args.output_directory = None
+        with open(
+            os.path.join(bin_dir, "compile_commands.json"), "w", encoding="utf8"
+        ) as fid:
+            fid.write("[]")
+        package = Package(
+            "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+        )
+        package["bin_dir"] = bin_dir
+        package["make_targets"] = [
+            {
+                "src": [
+                    os.path.join(os.path.dirname(__file__), "valid_package", "test.c")
+                ]
+            }
+        ]
+        package["headers"] = []
+        issues = cctp.scan(package, "level")
+
+        assert mock_subprocess_check_output.call_count == 1
+        command = mock_subprocess_check_output.call_args[0][0]
+        assert "--project=" + os.path.join(bin_dir, "compile_commands.json") in command
+        assert command[command.index("-j") + 1] == "4"
+        build_dirs = [arg for arg in command if arg.startswith("--cppcheck-build-dir=")]
+        assert len(build_dirs) == 1
+        assert build_dirs[0].startswith(
+            "--cppcheck-build-dir=" + os.path.join(cache_dir, "cppcheck", "")
+        )
+        assert os.path.isdir(build_dirs[0].split("=", 1)[1])
+        assert "--file-filter=" + os.path.join(package_dir, "*") in command
+        assert not any(arg.endswith("test.c") for arg in command)
+    assert [issue.issue_type for issue in issues] == ["error/uninitvar"]
+
+
+@mock.patch("statick_tool.plugins.tool.cppcheck.subprocess.check_output")
+def test_cppcheck_tool_plugin_scan_project_outside_package(
+    mock_subprocess_check_output,
+):
+    """Test that project mode only checks and reports files of the package.
+
+    Expected result: cppcheck is limited to the package, or to the changed files, and
+    issues in files outside the package are dropped
+    """
+    package_dir = os.path.join(os.path.dirname(__file__), "valid_package")
+    with TemporaryDirectory() as bin_dir, TemporaryDirectory() as other_dir:
+        other_file = os.path.join(other_dir, "generated.c")
+        mock_subprocess_check_output.return_value = (
+            f"[{other_file}:1]: (error uninitvar) Uninitialized variable: x\n"
+            f"[{os.path.join(package_dir, 'test.c')}:4]: (error uninitvar) "
+            "Uninitialized variable: si\n"
+        )
+        cctp = setup_cppcheck_tool_plugin()
+        cctp.plugin_context.config.get_tool_config = mock.MagicMock(
+            side_effect=lambda tool, level, key: "true" if key == "project" else None
+        )
+        cctp.plugin_context.args.output_directory = None
+        with open(
+            os.path.join(bin_dir, "compile_commands.json"), "w", encoding="utf8"
+        ) as fid:
+            fid.write(
+                json.dumps(
+                    [
+                        {
+                            "directory": package_dir,
+                            "command": "cc -c test.c",
+                            "file": os.path.join(package_dir, "test.c"),
+                        },
+                        {
+                            "directory": other_dir,
+                            "command": "cc -c generated.c",
+                            "file": other_file,
+                        },
+                    ]
+                )
+            )
+        package = Package("valid_package", package_dir)
+        package["bin_dir"] = bin_dir
+        package["make_targets"] = [{"src": [os.path.join(package_dir, "test.c")]}]
+        package["headers"] = []
+        issues = cctp.scan(package, "level")
+
+        command = mock_subprocess_check_output.call_args[0][0]
+        assert "--file-filter=" + os.path.join(package_dir, "*") in command
+        assert [issue.filename for issue in issues] == [
+            os.path.join(package_dir, "test.c")
+        ]
+
+        package.changed_files = {os.path.join(package_dir, "test.c")}
+        cctp.scan(package, "level")
+        command = mock_subprocess_check_output.call_args[0][0]
+        assert [arg for arg in command if arg.startswith("--file-filter=")] == [
+            "--file-filter=" + os.path.join(package_dir, "test.c")
+        ]
+
+
+def test_cppcheck_tool_plugin_get_build_dir():
+    """Test where the build directory is kept without a cache directory.
+
+    Expected result: the build directory is in the output directory of the package and
+    level, independent of the working directory
+    """
+    cctp = setup_cppcheck_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    with TemporaryDirectory() as output_dir:
+        cctp.plugin_context.args.output_directory = output_dir
+        assert cctp.get_build_dir(package, "level") == os.path.join(
+            output_dir, "valid_package-level", "cppcheck-build"
+        )
+        assert os.path.isdir(
+            os.path.join(output_dir, "valid_package-level", "cppcheck-build")
+        )
+    cctp.plugin_context.args.output_directory = None
+    assert cctp.get_build_dir(package, "level") is None
+
+
+def test_cppcheck_tool_plugin_version_not_found():
+    """Test the result of requesting a version when cppcheck is not installed.
+
+    Expected result: issues is None and cppcheck is reported as not found
+    """
+    cctp = setup_cppcheck_tool_plugin()
+    cctp.plugin_context.config.get_tool_config = mock.MagicMock(return_value="1.3")
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["make_targets"] = [
+        {"src": [os.path.join(os.path.dirname(__file__), "valid_package", "test.c")]}
+    ]
+    package["headers"] = []
+    with (
+        mock.patch.object(cctp, "get_version", return_value=cctp.TOOL_MISSING_STR),
+        mock.patch("statick_tool.plugins.tool.cppcheck.logging.warning") as warning,
+    ):
+        assert cctp.scan(package, "level") is None
+    assert warning.call_args[0][0].startswith("Cppcheck not found!")
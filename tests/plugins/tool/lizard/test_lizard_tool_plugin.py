@@ -73,6 +73,25 @@ def test_lizard_tool_plugin_scan_valid():
     )
 
 
+def test_lizard_tool_plugin_scan_changed_files():
+    """Test that only changed files are analyzed when they are set.
+
+    Expected result: issues are found in the changed file, and no issues are found if
+    no source files changed
+    """
+    ltp = setup_lizard_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package.changed_files = {os.path.join(package.path, "test.c")}
+    issues = ltp.scan(package, "level")
+    assert len(issues) == 1
+    assert issues[0].filename == os.path.join(package.path, "test.c")
+
+    package.changed_files = {os.path.join(package.path, "CMakeLists.txt")}
+    assert not ltp.scan(package, "level")
+
+
 def test_lizard_tool_plugin_parse_valid():
     """Verify that we can parse the normal output of lizard."""
     ltp = setup_lizard_tool_plugin()
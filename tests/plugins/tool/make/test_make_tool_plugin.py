@@ -46,9 +46,7 @@ def test_make_tool_plugin_found():
     for plugin_type in tool_plugins:
         plugin = plugin_type.load()
         plugins[plugin_type.name] = plugin()
-    assert any(
-        plugin.get_name() == "make" for _, plugin in list(plugins.items())
-    )
+    assert any(plugin.get_name() == "make" for _, plugin in list(plugins.items()))
 
 
 def test_make_tool_plugin_scan_valid():
@@ -76,6 +74,21 @@ def test_make_tool_plugin_scan_missing_tool_name():
     assert not issues
 
 
+def test_make_tool_plugin_scan_no_changed_files():
+    """Check that make is skipped when none of its files changed."""
+    mtp = setup_make_tool_plugin()
+    package = Package(
+        "valid_package", os.path.join(os.path.dirname(__file__), "valid_package")
+    )
+    package["make_targets"] = [{"src": [os.path.join(package.path, "main.cpp")]}]
+    package["headers"] = []
+    package.changed_files = {os.path.join(package.path, "README.md")}
+    with mock.patch("subprocess.check_output") as mock_subprocess_check_output:
+        issues = mtp.scan(package, "level")
+    assert not issues
+    mock_subprocess_check_output.assert_not_called()
+
+
 def test_make_tool_plugin_parse_valid():
     """Verify that we can parse the normal output of make."""
     mtp = setup_make_tool_plugin()
@@ -170,6 +183,22 @@ def test_make_tool_plugin_parse_linker_error():
     assert issues[0].issue_type == "linker"
 
 
+def test_make_tool_plugin_parse_lines():
+    """Verify that streamed output is parsed the same as the whole output."""
+    mtp = setup_make_tool_plugin()
+    package = Package("valid_package", "/tmp/valid_package")
+    output = (
+        "test.c:6:1: warning: unused variable 'x' [-Wunused-variable]\n"
+        "collect2: ld returned 1 exit status"
+    )
+    issues = mtp.parse_package_lines(package, iter(output.splitlines()))
+    assert issues == mtp.parse_package_output(package, output)
+    assert [issue.filename for issue in issues] == [
+        "test.c",
+        "Linker",
+    ]
+
+
 def test_make_tool_plugin_parse_warnings_mapping():
     """Verify that we can associate a make warning with a SEI Cert warning."""
     mtp = setup_make_tool_plugin()
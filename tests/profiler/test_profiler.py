@@ -0,0 +1,121 @@
+"""Tests for the profiler module."""
+
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from statick_tool.profiler import Profiler
+
+
+@pytest.fixture(autouse=True)
+def clear_profiler():
+    """Start and finish every test with profiling enabled and no spans."""
+    Profiler.clear()
+    Profiler.enable()
+    yield
+    Profiler.clear()
+    Profiler.enable(False)
+
+
+def test_profiler_span_nesting():
+    """Test that spans record their parent, even across threads.
+
+    Expected result: each span points to the span that encloses it
+    """
+    with Profiler.span("package", "package") as package_span:
+        with Profiler.span("tools", "stage") as stage_span:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+
+                def run_plugin():
+                    with Profiler.span("plugin", "plugin"):
+                        return threading.get_ident()
+
+                thread_id = executor.submit(
+                    contextvars.copy_context().run, run_plugin
+                ).result()
+
+    spans = {span.name: span for span in Profiler.get_spans()}
+    assert spans["package"].parent_id is None
+    assert spans["tools"].parent_id == package_span.span_id
+    assert spans["plugin"].parent_id == stage_span.span_id
+    assert spans["plugin"].thread_id == thread_id
+    assert spans["package"].duration >= spans["tools"].duration > 0
+
+
+def test_profiler_disabled():
+    """Test that spans are timed but not recorded when profiling is disabled.
+
+    Expected result: the duration is measured and no span is recorded
+    """
+    Profiler.enable(False)
+    with Profiler.span("plugin", "plugin") as span:
+        Profiler.add_counts(10, 1)
+    assert span.duration > 0
+    assert not Profiler.get_spans()
+
+
+def test_profiler_child_usage():
+    """Test that CPU time and output of child processes are recorded.
+
+    Expected result: the span holds the CPU time of the child and the counts added
+    """
+    script = "sum(range(3000000))"
+    with Profiler.span("python", "subprocess"):
+        output = subprocess.check_output(
+            [sys.executable, "-c", script], universal_newlines=True
+        )
+        Profiler.add_counts(len(output) + 5, 2)
+    span = Profiler.get_spans()[0]
+    assert span.child_cpu_user + span.child_cpu_system > 0
+    assert span.child_max_rss_kb > 0
+    assert span.output_chars == 5
+    assert span.file_count == 2
+
+
+def test_profiler_pop_spans():
+    """Test that a process hands back only the spans it recorded.
+
+    Expected result: spans of other processes are kept
+    """
+    with Profiler.span("own", "package"):
+        pass
+    other = Profiler.get_spans()[0]._replace(pid=os.getpid() + 1, name="other")
+    Profiler.add_spans([other])
+    assert [span.name for span in Profiler.pop_spans()] == ["own"]
+    assert [span.name for span in Profiler.get_spans()] == ["other"]
+
+
+def test_profiler_write():
+    """Test that spans are written as JSON and as Chrome trace events.
+
+    Expected result: both files hold every span, starting from zero
+    """
+    with Profiler.span("package", "package"):
+        with Profiler.span("plugin", "plugin"):
+            Profiler.add_counts(42, 3)
+    with TemporaryDirectory() as tmp_dir:
+        json_file = os.path.join(tmp_dir, "profile.json")
+        trace_file = os.path.join(tmp_dir, "trace.json")
+        Profiler.write(json_file, trace_file)
+        with open(json_file, encoding="utf8") as fid:
+            spans = json.load(fid)["spans"]
+        with open(trace_file, encoding="utf8") as fid:
+            trace = json.load(fid)
+
+    assert [span["name"] for span in spans] == ["package", "plugin"]
+    assert spans[0]["start"] == 0
+    assert spans[1]["output_chars"] == 42
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["package", "plugin"]
+    assert [event["cat"] for event in events] == ["package", "plugin"]
+    assert all(event["ph"] == "X" for event in events)
+    assert events[0]["ts"] == 0
+    assert events[0]["dur"] >= events[1]["dur"]
+    assert events[1]["args"]["file_count"] == 3
@@ -0,0 +1,109 @@
+"""Tests for the resource cache module."""
+
+import os
+from tempfile import TemporaryDirectory
+
+import mock
+import pytest
+
+from statick_tool.resource_cache import ResourceCache
+from statick_tool.resources import Resources
+
+
+@pytest.fixture(autouse=True)
+def clear_resource_cache():
+    """Start and finish every test with an empty resource cache."""
+    ResourceCache.clear()
+    yield
+    ResourceCache.clear()
+
+
+def write_file(path, contents):
+    """Write a file, creating its directory, and move its modification time ahead."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mtime = None
+    if os.path.exists(path):
+        mtime = os.stat(path).st_mtime_ns + 1_000_000_000
+    with open(path, "w", encoding="utf8") as fid:
+        fid.write(contents)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_resource_cache_find_file():
+    """Test that file lookups are kept until a searched directory changes.
+
+    Expected result: the file in the first path that has it is found, and a file added
+    to an earlier path is found after it is added
+    """
+    with TemporaryDirectory() as first_dir, TemporaryDirectory() as second_dir:
+        os.makedirs(os.path.join(first_dir, "rsc"))
+        write_file(os.path.join(second_dir, "rsc", "test.txt"), "second")
+        resources = Resources([first_dir, second_dir])
+
+        with mock.patch("os.path.isfile", wraps=os.path.isfile) as isfile:
+            assert resources.get_file("test.txt") == os.path.join(
+                second_dir, "rsc", "test.txt"
+            )
+            calls = isfile.call_count
+            assert resources.get_file("test.txt") == os.path.join(
+                second_dir, "rsc", "test.txt"
+            )
+            assert isfile.call_count == calls
+        assert resources.get_file("missing.txt") is None
+
+        write_file(os.path.join(first_dir, "rsc", "test.txt"), "first")
+        rsc_dir = os.path.join(first_dir, "rsc")
+        mtime = os.stat(rsc_dir).st_mtime_ns + 1_000_000_000
+        os.utime(rsc_dir, ns=(mtime, mtime))
+        assert resources.get_file("test.txt") == os.path.join(
+            first_dir, "rsc", "test.txt"
+        )
+
+
+def test_resource_cache_get_mapping(caplog):
+    """Test that mappings are parsed again only when the mapping file changes.
+
+    Expected result: invalid lines are skipped, and changes to the file are picked up
+    """
+    with TemporaryDirectory() as tmp_dir:
+        mapping_file = os.path.join(tmp_dir, "mapping.txt")
+        write_file(mapping_file, "warning-a:CERT-A\ninvalid line\n")
+
+        mapping = ResourceCache.get_mapping(mapping_file, "mapping.txt")
+        assert mapping == {"warning-a": "CERT-A"}
+        assert "Invalid line" in caplog.text
+        mapping["warning-b"] = "CERT-B"
+        with mock.patch("statick_tool.resource_cache.open") as mock_open:
+            assert ResourceCache.get_mapping(mapping_file, "mapping.txt") == {
+                "warning-a": "CERT-A"
+            }
+            mock_open.assert_not_called()
+
+        write_file(mapping_file, "warning-a:CERT-A\nwarning-b:CERT-B\n")
+        assert ResourceCache.get_mapping(mapping_file, "mapping.txt") == {
+            "warning-a": "CERT-A",
+            "warning-b": "CERT-B",
+        }
+
+
+def test_resource_cache_get_profile():
+    """Test that profiles are parsed again only when the profile file changes.
+
+    Expected result: the same profile is returned until the file changes, and invalid
+    profiles raise ValueError
+    """
+    with TemporaryDirectory() as tmp_dir:
+        profile_file = os.path.join(tmp_dir, "profile.yaml")
+        write_file(profile_file, "default: threshold\n")
+
+        profile = ResourceCache.get_profile(profile_file)
+        assert ResourceCache.get_profile(profile_file) is profile
+        assert profile.profile["default"] == "threshold"
+
+        write_file(profile_file, "default: objective\n")
+        assert ResourceCache.get_profile(profile_file).profile["default"] == "objective"
+
+        write_file(profile_file, "packages:\n")
+        with pytest.raises(ValueError):
+            ResourceCache.get_profile(profile_file)
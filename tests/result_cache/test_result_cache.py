@@ -0,0 +1,194 @@
+"""Tests for the result cache module."""
+
+import argparse
+import os
+import time
+from tempfile import TemporaryDirectory
+
+from statick_tool.issue import Issue
+from statick_tool.package import Package
+from statick_tool.plugin_context import PluginContext
+from statick_tool.resources import Resources
+from statick_tool.result_cache import ResultCache
+from statick_tool.tool_plugin import ToolPlugin
+
+
+class FileLocalToolPlugin(ToolPlugin):
+    """File-local tool plugin that reports one issue per file and counts its runs."""
+
+    def __init__(self):
+        """Initialize the plugin."""
+        self.scanned_files = []
+
+    def get_name(self):
+        """Get name of tool."""
+        return "file_local"
+
+    @classmethod
+    def is_file_local(cls):
+        """Return whether the tool reports issues for each file on its own."""
+        return True
+
+    def get_file_types(self):
+        """Return a list of file types the plugin can scan."""
+        return ["python_src"]
+
+    def get_version(self):
+        """Get version of tool."""
+        return "1.0"
+
+    def get_user_flags(self, level, name=None):
+        """Get user flags."""
+        return []
+
+    def process_files(self, package, level, files, user_flags):
+        """Record the scanned files."""
+        self.scanned_files += files
+        return files
+
+    def parse_output(self, total_output, package=None):
+        """Report one issue per file."""
+        return [
+            Issue(fname, 1, self.get_name(), "type", 3, "message", None)
+            for fname in total_output
+        ]
+
+
+def make_plugin(cache_dir, no_cache=False):
+    """Make a file-local tool plugin that uses a cache directory."""
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--output-directory", dest="output_directory")
+    arg_parser.add_argument("--cache-dir", dest="cache_dir", default=cache_dir)
+    arg_parser.add_argument("--no-cache", dest="no_cache", default=no_cache)
+    resources = Resources([])
+    plugin = FileLocalToolPlugin()
+    plugin.set_plugin_context(PluginContext(arg_parser.parse_args([]), resources, None))
+    return plugin
+
+
+def make_package(tmp_dir, names):
+    """Make a package with some python files."""
+    package = Package("test", tmp_dir)
+    package["python_src"] = []
+    for name in names:
+        path = os.path.join(tmp_dir, name)
+        with open(path, "w", encoding="utf8") as fid:
+            fid.write(f"print('{name}')\n")
+        package["python_src"].append(path)
+    return package
+
+
+def test_result_cache_store_load():
+    """Test that stored issues are loaded back for another path.
+
+    Expected result: issues match, with the filename of the requested path
+    """
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(tmp_dir)
+        issue = Issue("/a/b.py", 3, "tool", "type", 5, "message", "CERT")
+        cache.store("abcdef", [issue])
+        assert cache.load("abcdef", "/c/d.py") == [issue._replace(filename="/c/d.py")]
+        assert cache.load("fedcba", "/c/d.py") is None
+
+
+def test_result_cache_key_changes_with_contents():
+    """Test that the cache key depends on the file contents and the context.
+
+    Expected result: keys differ when the contents or context change
+    """
+    with TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "x.py")
+        with open(path, "w", encoding="utf8") as fid:
+            fid.write("a = 1\n")
+        key = ResultCache.get_key(["tool", "1.0"], path)
+        assert key == ResultCache.get_key(["tool", "1.0"], path)
+        assert key != ResultCache.get_key(["tool", "2.0"], path)
+        with open(path, "w", encoding="utf8") as fid:
+            fid.write("a = 2\n")
+        assert key != ResultCache.get_key(["tool", "1.0"], path)
+        assert ResultCache.get_key(["tool"], os.path.join(tmp_dir, "missing")) is None
+
+
+def test_result_cache_evict_least_recently_used():
+    """Test that eviction removes the least recently used entries first.
+
+    Expected result: the oldest entry is removed, newer entries are kept
+    """
+    with TemporaryDirectory() as tmp_dir:
+        cache = ResultCache(tmp_dir)
+        issue = Issue("x.py", 1, "tool", "type", 5, "m" * 1000, None)
+        for key in ["aa1", "bb2", "cc3"]:
+            cache.store(key, [issue])
+        now = time.time()
+        os.utime(cache.get_entry_path("aa1"), (now - 30, now - 30))
+        os.utime(cache.get_entry_path("bb2"), (now - 20, now - 20))
+        entry_size = os.path.getsize(cache.get_entry_path("cc3"))
+        cache.max_size = 2 * entry_size
+
+        cache.evict()
+
+        assert not os.path.exists(cache.get_entry_path("aa1"))
+        assert os.path.exists(cache.get_entry_path("bb2"))
+        assert os.path.exists(cache.get_entry_path("cc3"))
+
+
+def test_tool_plugin_scan_uses_result_cache():
+    """Test that only changed files are passed to the tool on a second scan.
+
+    Expected result: unchanged file is not scanned again and issues are the same
+    """
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as cache_dir:
+        package = make_package(tmp_dir, ["a.py", "b.py"])
+        plugin = make_plugin(cache_dir)
+        first_issues = plugin.scan(package, "level")
+        assert len(plugin.scanned_files) == 2
+
+        with open(package["python_src"][1], "a", encoding="utf8") as fid:
+            fid.write("print('changed')\n")
+        plugin = make_plugin(cache_dir)
+        second_issues = plugin.scan(package, "level")
+
+        assert plugin.scanned_files == [package["python_src"][1]]
+        assert sorted(first_issues) == sorted(second_issues)
+
+
+def test_tool_plugin_scan_no_cache():
+    """Test that --no-cache disables the result cache.
+
+    Expected result: all files are scanned every time
+    """
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as cache_dir:
+        package = make_package(tmp_dir, ["a.py", "b.py"])
+        make_plugin(cache_dir).scan(package, "level")
+        plugin = make_plugin(cache_dir, no_cache=True)
+        plugin.scan(package, "level")
+        assert len(plugin.scanned_files) == 2
+
+
+def test_tool_plugin_scan_not_file_local():
+    """Test that tools which are not file-local never use the result cache.
+
+    Expected result: no cache is returned for the base tool plugin
+    """
+    with TemporaryDirectory() as cache_dir:
+        plugin = make_plugin(cache_dir)
+        assert plugin.get_result_cache() is not None
+        base_plugin = ToolPlugin()
+        base_plugin.set_plugin_context(plugin.plugin_context)
+        assert base_plugin.get_result_cache() is None
+
+
+def test_tool_plugin_store_unexpected_file():
+    """Test that results are not cached when an issue can not be matched to a file.
+
+    Expected result: nothing is written to the cache
+    """
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as cache_dir:
+        package = make_package(tmp_dir, ["a.py"])
+        plugin = make_plugin(cache_dir)
+        _, _, cache_keys = plugin.load_cached_results(
+            package, "level", package["python_src"], []
+        )
+        issue = Issue("relative.py", 1, "file_local", "type", 3, "message", None)
+        plugin.store_cached_results(cache_keys, [issue])
+        assert not os.path.exists(os.path.join(cache_dir, "results"))
@@ -1,5 +1,8 @@
 """Unit tests of statick_tool.py."""
+
+import argparse
 import contextlib
+import json
 import logging
 import multiprocessing
 import os
@@ -7,6 +10,7 @@ import shutil
 import subprocess
 import sys
 import time
+from tempfile import TemporaryDirectory
 
 import mock
 import pytest
@@ -14,7 +18,11 @@ import pytest
 from statick_tool.args import Args
 from statick_tool.discovery_plugin import DiscoveryPlugin
 from statick_tool.package import Package
+from statick_tool.package_scheduler import PackageScheduler
 from statick_tool.plugins.tool.clang_tidy import ClangTidyToolPlugin
+from statick_tool.profiler import Profiler
+from statick_tool.resource_cache import ResourceCache
+from statick_tool.result_cache import ResultCache
 from statick_tool.statick_tool import Statick
 
 LOGGER = logging.getLogger(__name__)
@@ -159,12 +167,13 @@ def test_get_level_nonexistent_file(init_statick):
     assert level is None
 
 
-@mock.patch("statick_tool.statick_tool.Profile")
+@mock.patch("statick_tool.resource_cache.Profile")
 def test_get_level_ioerror(mocked_profile_constructor, init_statick):
     """Test the behavior when Profile throws an OSError.
 
     Expected result: None is returned
     """
+    ResourceCache.clear()
     mocked_profile_constructor.side_effect = OSError("error")
     args = Args("Statick tool")
     args.parser.add_argument(
@@ -175,9 +184,10 @@ def test_get_level_ioerror(mocked_profile_constructor, init_statick):
     assert level is None
 
 
-@mock.patch("statick_tool.statick_tool.Profile")
+@mock.patch("statick_tool.resource_cache.Profile")
 def test_get_level_valueerror(mocked_profile_constructor, init_statick):
     """Test the behavior when Profile throws a ValueError."""
+    ResourceCache.clear()
     mocked_profile_constructor.side_effect = ValueError("error")
     args = Args("Statick tool")
     args.parser.add_argument(
@@ -249,6 +259,38 @@ def test_get_config_oserror(mocked_config_constructor, init_statick):
     assert init_statick.config is None
 
 
+def test_get_config_cycle(caplog):
+    """Test running Statick with levels that inherit from each other in a cycle.
+
+    Expected result: the error is logged, there is no configuration, and the scan fails
+    """
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+    statick = Statick(args.get_user_paths(["--user-paths", os.path.dirname(__file__)]))
+    statick.gather_args(args.parser)
+    with TemporaryDirectory() as output_dir:
+        parsed_args = args.get_args(
+            [
+                "--user-paths",
+                os.path.dirname(__file__),
+                "--config",
+                "config-cycle.yaml",
+                "--output-directory",
+                output_dir,
+                "--path",
+                os.path.dirname(__file__),
+            ]
+        )
+        with caplog.at_level(logging.ERROR):
+            statick.get_config(parsed_args)
+        assert statick.config is None
+        assert "Levels inherit from each other in a cycle" in caplog.text
+
+        issues, success = statick.run(parsed_args.path, parsed_args)
+    assert issues is None
+    assert not success
+
+
 @mock.patch("statick_tool.statick_tool.Exceptions")
 def test_get_exceptions_valueerror(mocked_exceptions_constructor, init_statick):
     """Test the behavior when Exceptions throws a ValueError."""
@@ -568,6 +610,301 @@ def test_run_tool_dependency(init_statick):
         print(f"Error: {ex}")
 
 
+def test_get_tool_graph_force_tool_list(init_statick):
+    """Test that forced tools pull in their dependencies.
+
+    Expected result: clang-tidy and make are run, other tools are skipped
+    """
+    graph = init_statick.get_tool_graph(["pylint", "clang-tidy", "make"], "clang-tidy")
+    assert graph == {"clang-tidy": ["make"], "make": []}
+
+
+def test_get_tool_graph_missing_dependency(init_statick):
+    """Test that a dependency which is not enabled is an error.
+
+    Expected result: None is returned
+    """
+    assert init_statick.get_tool_graph(["clang-tidy"]) is None
+
+
+def test_get_tool_graph_missing_plugin(init_statick):
+    """Test that an enabled plugin which is not installed is an error.
+
+    Expected result: None is returned
+    """
+    assert init_statick.get_tool_graph(["pylint", "not_a_plugin"]) is None
+
+
+class FakeToolPlugin:
+    """Tool plugin stand-in that records when it runs."""
+
+    def __init__(self, name, events, issues=None):
+        """Initialize the fake plugin."""
+        self.name = name
+        self.events = events
+        self.issues = issues if issues is not None else []
+
+    def get_name(self):
+        """Get name of tool."""
+        return self.name
+
+    def get_version(self):
+        """Get version of tool."""
+        return "1.0"
+
+    def scan(self, package, level):
+        """Record start and end of the scan."""
+        self.events.append(("start", self.name))
+        time.sleep(0.05)
+        self.events.append(("end", self.name))
+        return self.issues
+
+
+@pytest.mark.parametrize("tool_jobs", [1, 3])
+def test_run_tool_plugins_dependency_order(init_statick, tool_jobs):
+    """Test that dependencies finish before dependent plugins start.
+
+    Expected result: make ends before clang-tidy and spotbugs start, every plugin
+    gets a timing and a version entry
+    """
+    events = []
+    init_statick.tool_plugins = {
+        name: FakeToolPlugin(name, events)
+        for name in ["clang-tidy", "make", "spotbugs", "pylint"]
+    }
+    graph = {"clang-tidy": ["make"], "make": [], "spotbugs": ["make"], "pylint": []}
+    package = Package("test", os.path.dirname(__file__))
+
+    issues, success = init_statick.run_tool_plugins(package, "level", graph, tool_jobs)
+
+    assert success
+    assert list(issues) == list(graph)
+    make_end = events.index(("end", "make"))
+    assert events.index(("start", "clang-tidy")) > make_end
+    assert events.index(("start", "spotbugs")) > make_end
+    assert sorted(timing.name for timing in init_statick.get_timings()) == sorted(graph)
+    assert len(init_statick.get_tool_versions()) == len(graph)
+
+
+def test_run_tool_plugins_concurrent(init_statick):
+    """Test that independent plugins run at the same time.
+
+    Expected result: both plugins start before either one ends
+    """
+    events = []
+    init_statick.tool_plugins = {
+        name: FakeToolPlugin(name, events) for name in ["pylint", "mypy"]
+    }
+    graph = {"pylint": [], "mypy": []}
+    package = Package("test", os.path.dirname(__file__))
+
+    _, success = init_statick.run_tool_plugins(package, "level", graph, 2)
+
+    assert success
+    assert [event[0] for event in events] == ["start", "start", "end", "end"]
+
+
+def test_run_tool_plugins_failure(init_statick):
+    """Test that a failing plugin marks the run as unsuccessful.
+
+    Expected result: success is False and failed plugin has no issues entry
+    """
+    events = []
+    init_statick.tool_plugins = {
+        "make": FakeToolPlugin("make", events, None),
+        "clang-tidy": FakeToolPlugin("clang-tidy", events),
+    }
+    init_statick.tool_plugins["make"].issues = None
+    graph = {"clang-tidy": ["make"], "make": []}
+    package = Package("test", os.path.dirname(__file__))
+
+    issues, success = init_statick.run_tool_plugins(package, "level", graph, 2)
+
+    assert not success
+    assert "make" not in issues
+    assert "clang-tidy" in issues
+
+
+def test_run_tool_plugins_circular_dependency(init_statick):
+    """Test that circular dependencies are reported instead of hanging.
+
+    Expected result: success is False and no plugin runs
+    """
+    events = []
+    init_statick.tool_plugins = {
+        name: FakeToolPlugin(name, events) for name in ["a", "b"]
+    }
+    graph = {"a": ["b"], "b": ["a"]}
+    package = Package("test", os.path.dirname(__file__))
+
+    issues, success = init_statick.run_tool_plugins(package, "level", graph, 2)
+
+    assert not success
+    assert not issues
+    assert not events
+
+
+def test_run_tool_jobs(init_statick):
+    """Test running Statick with several tool plugins at the same time."""
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    sys.argv = [
+        "--path",
+        os.path.dirname(__file__),
+        "--force-tool-list",
+        "bandit,do_nothing",
+        "--tool-jobs",
+        "2",
+    ]
+    parsed_args = args.get_args(sys.argv)
+    path = parsed_args.path
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    issues, success = statick.run(path, parsed_args)
+    for tool in issues:
+        assert not issues[tool]
+    assert success
+
+
+def init_git_repo(repo_dir):
+    """Create a git repository with one commit and return the revision."""
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="statick",
+        GIT_AUTHOR_EMAIL="statick@example.com",
+        GIT_COMMITTER_NAME="statick",
+        GIT_COMMITTER_EMAIL="statick@example.com",
+    )
+    os.makedirs(os.path.join(repo_dir, "pkg"))
+    for fname in ["top.py", os.path.join("pkg", "a.py"), os.path.join("pkg", "b.py")]:
+        with open(os.path.join(repo_dir, fname), "w", encoding="utf8") as fid:
+            fid.write("a = 1\n")
+    subprocess.check_output(["git", "init", "-q"], cwd=repo_dir)
+    subprocess.check_output(["git", "add", "."], cwd=repo_dir)
+    subprocess.check_output(
+        ["git", "commit", "-q", "-m", "init"], cwd=repo_dir, env=env
+    )
+    return subprocess.check_output(
+        ["git", "rev-parse", "HEAD"], cwd=repo_dir, universal_newlines=True
+    ).strip()
+
+
+def test_get_changed_files(tmp_path):
+    """Test getting the files below a path that changed since a git revision.
+
+    Expected results: only changed files in the package directory are returned, and
+    untracked files are only returned when asked for
+    """
+    if shutil.which("git") is None:
+        pytest.skip("git does not exist. Skipping test that requires it.")
+    revision = init_git_repo(str(tmp_path))
+    pkg_dir = os.path.join(str(tmp_path), "pkg")
+    for fname in ["top.py", os.path.join("pkg", "a.py")]:
+        with open(os.path.join(str(tmp_path), fname), "a", encoding="utf8") as fid:
+            fid.write("b = 2\n")
+    os.remove(os.path.join(pkg_dir, "b.py"))
+    with open(os.path.join(pkg_dir, "new.py"), "w", encoding="utf8") as fid:
+        fid.write("c = 3\n")
+
+    assert Statick.get_changed_files(pkg_dir, revision) == {
+        os.path.join(pkg_dir, "a.py")
+    }
+    assert Statick.get_changed_files(pkg_dir, revision, True) == {
+        os.path.join(pkg_dir, "a.py"),
+        os.path.join(pkg_dir, "new.py"),
+    }
+
+
+def test_get_changed_files_invalid_revision(tmp_path):
+    """Test getting changed files for a revision that does not exist.
+
+    Expected results: None is returned
+    """
+    if shutil.which("git") is None:
+        pytest.skip("git does not exist. Skipping test that requires it.")
+    init_git_repo(str(tmp_path))
+    assert Statick.get_changed_files(str(tmp_path), "not-a-revision") is None
+
+
+@mock.patch("subprocess.check_output")
+def test_get_changed_files_no_git(mock_subprocess_check_output):
+    """Test getting changed files when git is not installed.
+
+    Expected results: None is returned
+    """
+    mock_subprocess_check_output.side_effect = OSError("mocked error")
+    assert Statick.get_changed_files(os.path.dirname(__file__), "HEAD") is None
+
+
+def test_run_changed_since(init_statick, tmp_path):
+    """Test running Statick on only the files that changed since a git revision.
+
+    Expected results: discovery only finds the changed file
+    """
+    if shutil.which("git") is None:
+        pytest.skip("git does not exist. Skipping test that requires it.")
+    revision = init_git_repo(str(tmp_path))
+    pkg_dir = os.path.join(str(tmp_path), "pkg")
+    with open(os.path.join(pkg_dir, "a.py"), "a", encoding="utf8") as fid:
+        fid.write("b = 2\n")
+
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    sys.argv = [
+        "--path",
+        pkg_dir,
+        "--force-tool-list",
+        "do_nothing",
+        "--changed-since",
+        revision,
+    ]
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    discovered = []
+
+    def record_files(package, exceptions=None):
+        DiscoveryPlugin.find_files(
+            statick.discovery_plugins["python"], package, exceptions
+        )
+        discovered.extend(package.files)
+
+    with mock.patch.object(
+        statick.discovery_plugins["python"], "find_files", side_effect=record_files
+    ):
+        issues, success = statick.run(parsed_args.path, parsed_args)
+
+    assert success
+    assert issues is not None
+    assert discovered == [os.path.join(pkg_dir, "a.py")]
+
+
+def test_run_changed_since_invalid_revision(init_statick, tmp_path):
+    """Test running Statick with a revision that does not exist.
+
+    Expected results: issues is None and success is False
+    """
+    if shutil.which("git") is None:
+        pytest.skip("git does not exist. Skipping test that requires it.")
+    init_git_repo(str(tmp_path))
+    args = Args("Statick tool")
+    args.parser.add_argument("--path", help="Path of package to scan")
+    statick = Statick(args.get_user_paths())
+    statick.gather_args(args.parser)
+    sys.argv = ["--path", str(tmp_path), "--changed-since", "not-a-revision"]
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    issues, success = statick.run(parsed_args.path, parsed_args)
+    assert issues is None
+    assert not success
+
+
 def test_run_discovery_dependency(init_statick):
     """Test that a discovery plugin can run its dependencies.
 
@@ -964,6 +1301,121 @@ def test_run_workspace_two_procs(init_statick_ws):
     assert success
 
 
+def test_run_workspace_records_durations(init_statick_ws):
+    """Test that package durations are kept in the cache directory.
+
+    Expected result: a duration is recorded for every package in the workspace
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    with TemporaryDirectory() as cache_dir:
+        sys.argv.extend(["--cache-dir", cache_dir, "--max-procs", "1"])
+
+        parsed_args = args.get_args(sys.argv)
+        statick.get_config(parsed_args)
+        statick.get_exceptions(parsed_args)
+
+        with mock.patch.object(PackageScheduler, "get_order") as get_order:
+            issues, success = statick.run_workspace(parsed_args)
+        # Packages are not ordered for a single worker.
+        get_order.assert_not_called()
+
+        scheduler = PackageScheduler(cache_dir)
+        assert sorted(os.path.basename(path) for path in scheduler.durations) == [
+            "test_package",
+            "test_package2",
+        ]
+    for tool in issues:
+        assert not issues[tool]
+    assert success
+
+
+def test_run_workspace_package_order(init_statick_ws):
+    """Test that packages are ordered for more than one worker.
+
+    Expected result: packages are ordered with the sizes found when the workspace was
+    walked
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    parsed_args = args.get_args(sys.argv)
+    # The number of processes is limited to the number of CPU cores when parsed.
+    parsed_args.max_procs = 2
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+
+    with mock.patch.object(
+        PackageScheduler,
+        "get_order",
+        autospec=True,
+        side_effect=lambda scheduler, packages, sizes=None: packages,
+    ) as get_order:
+        issues, success = statick.run_workspace(parsed_args)
+    assert get_order.call_count == 1
+    packages, sizes = get_order.call_args[0][1:]
+    assert sorted(sizes) == sorted(package.path for package in packages)
+    for tool in issues:
+        assert not issues[tool]
+    assert success
+
+
+def test_run_workspace_profiling(init_statick_ws):
+    """Test that profiling spans of every package are written for a workspace.
+
+    Expected result: spans from the worker processes nest package, stage and plugin
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    with TemporaryDirectory() as tmp_dir:
+        json_file = os.path.join(tmp_dir, "profile.json")
+        trace_file = os.path.join(tmp_dir, "trace.json")
+        sys.argv.extend(
+            [
+                "--max-procs",
+                "1",
+                "--profiling-json",
+                json_file,
+                "--profiling-trace",
+                trace_file,
+            ]
+        )
+
+        parsed_args = args.get_args(sys.argv)
+        statick.get_config(parsed_args)
+        statick.get_exceptions(parsed_args)
+        statick.set_profiling(parsed_args)
+        try:
+            statick.run_workspace(parsed_args)
+            statick.write_profiling(parsed_args)
+        finally:
+            Profiler.enable(False)
+            Profiler.clear()
+
+        with open(json_file, encoding="utf8") as fid:
+            spans = json.load(fid)["spans"]
+        assert os.path.isfile(trace_file)
+
+    spans_by_id = {span["span_id"]: span for span in spans}
+    packages = [span for span in spans if span["category"] == "package"]
+    assert sorted(span["name"] for span in packages) == [
+        "test_package",
+        "test_package2",
+    ]
+    for span in spans:
+        if span["category"] == "stage":
+            assert spans_by_id[span["parent_id"]]["category"] == "package"
+        elif span["category"] == "plugin":
+            assert spans_by_id[span["parent_id"]]["category"] == "stage"
+    assert {span["name"] for span in spans if span["category"] == "stage"} == {
+        "discovery",
+        "tools",
+        "reporting",
+    }
+
+
 def test_run_workspace_max_proc(init_statick_ws):
     """Test running Statick on a workspace."""
     statick = init_statick_ws[0]
@@ -1038,6 +1490,35 @@ def test_run_workspace_package_is_ignored(init_statick_ws):
     assert success
 
 
+def test_probe_tool_versions(init_statick_ws):
+    """Test probing tool versions before scanning packages in a workspace.
+
+    Expected result: each enabled tool is probed once, other tools are not probed
+    """
+    statick = init_statick_ws[0]
+    args = init_statick_ws[1]
+    sys.argv = init_statick_ws[2]
+    sys.argv.extend(["--force-tool-list", "pylint,bandit"])
+    parsed_args = args.get_args(sys.argv)
+    statick.get_config(parsed_args)
+    statick.get_exceptions(parsed_args)
+    workspace = os.path.join(os.path.dirname(__file__), "test_workspace")
+    packages = [
+        Package(name, os.path.join(workspace, name))
+        for name in ["test_package", "test_package2"]
+    ]
+
+    probed = []
+    for plugin_name, plugin in statick.tool_plugins.items():
+        plugin.get_version = mock.MagicMock(
+            side_effect=lambda name=plugin_name: probed.append(name)
+        )
+
+    statick.probe_tool_versions(packages, parsed_args)
+
+    assert sorted(probed) == ["bandit", "pylint"]
+
+
 def test_run_workspace_list_packages(init_statick_ws):
     """Test running Statick on a workspace but only listing packages."""
     statick = init_statick_ws[0]
@@ -1456,3 +1937,26 @@ def test_print_logging_level_invalid():
 
     logger = logging.getLogger()
     assert logger.getEffectiveLevel() == logging.WARNING
+
+
+def test_evict_result_cache():
+    """Test that the result cache is evicted once a run is done.
+
+    Expected result: eviction happens only when a cache directory is used, with the
+    configured size limit
+    """
+    parsed_args = argparse.Namespace(cache_dir=None, no_cache=False)
+    with mock.patch.object(ResultCache, "evict", autospec=True) as evict:
+        Statick.evict_result_cache(parsed_args)
+        evict.assert_not_called()
+
+        with TemporaryDirectory() as cache_dir:
+            parsed_args.cache_dir = cache_dir
+            parsed_args.cache_max_size = 1
+            Statick.evict_result_cache(parsed_args)
+            assert evict.call_count == 1
+            assert evict.call_args[0][0].max_size == 1024 * 1024
+
+            parsed_args.no_cache = True
+            Statick.evict_result_cache(parsed_args)
+            assert evict.call_count == 1
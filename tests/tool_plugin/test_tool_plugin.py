@@ -2,9 +2,13 @@
 
 import argparse
 import os
+import re
 import stat
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 from tempfile import TemporaryDirectory
 
 import pytest
@@ -337,3 +341,272 @@ def test_tool_plugin_command_exists_shortpath_invalid(monkeypatch):
             os.chmod(tmp_file.name, st.st_mode | stat.S_IXUSR)
             _, tmp_file_name = os.path.split(tmp_file.name)
             assert not ToolPlugin.command_exists(tmp_file_name)
+
+
+def make_max_procs_plugin(max_procs):
+    """Make a tool plugin with a value for --max-procs."""
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--max-procs", dest="max_procs", type=int)
+    plugin_context = PluginContext(
+        arg_parser.parse_args(["--max-procs", str(max_procs)]), Resources([]), None
+    )
+    tp = ToolPlugin()
+    tp.set_plugin_context(plugin_context)
+    return tp
+
+
+def test_tool_plugin_run_per_file_order():
+    """Test that per-file results are in file order with a bounded number of calls.
+
+    Expected result: results follow the order of the files even though later files
+    finish first, and no more than --max-procs calls run at once
+    """
+    tp = make_max_procs_plugin(3)
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def run(src):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.01 * (10 - int(src)))
+        with lock:
+            running[0] -= 1
+        if src == "4":
+            raise OSError("mocked error")
+        return src + "!"
+
+    files = [str(index) for index in range(10)]
+    results = list(tp.run_per_file(run, files))
+    assert [src for src, _ in results] == files
+    assert [result.result() for src, result in results if src != "4"] == [
+        src + "!" for src in files if src != "4"
+    ]
+    with pytest.raises(OSError):
+        results[4][1].result()
+    assert 1 < running[1] <= 3
+
+
+def test_tool_plugin_run_per_file_stop_early():
+    """Test that calls which have not started are cancelled when the caller stops.
+
+    Expected result: the function is not called for the remaining files
+    """
+    calls = []
+
+    def run(src):
+        calls.append(src)
+        time.sleep(0.01)
+        return src
+
+    files = [str(index) for index in range(20)]
+    for tp in [ToolPlugin(), make_max_procs_plugin(2)]:
+        calls.clear()
+        results = tp.run_per_file(run, files)
+        next(results)
+        results.close()
+        assert len(calls) < len(files)
+
+
+def test_tool_plugin_batch_files():
+    """Test that files are split into batches that fit the argument limit.
+
+    Expected result: batches keep the file order and each fits the limit
+    """
+    files = [f"file{index}.py" for index in range(10)]
+    # Each argument takes its length plus a null byte and a pointer.
+    batches = ToolPlugin.batch_files(["tool"], files, arg_max=13 + 3 * 18)
+    assert batches == [files[0:3], files[3:6], files[6:9], files[9:10]]
+    assert ToolPlugin.batch_files(["tool"], files) == [files]
+    assert ToolPlugin.batch_files(["tool"], []) == [[]]
+
+
+def test_tool_plugin_check_output_batched(monkeypatch):
+    """Test that a command is run in batches when its files do not fit.
+
+    Expected result: output of all batches in order, and the highest return code
+    """
+    script = (
+        "import sys; print(' '.join(sys.argv[1:]));"
+        " sys.exit(2 if 'bad' in sys.argv else 0)"
+    )
+    command = [sys.executable, "-c", script]
+    files = ["a", "b", "bad", "c"]
+    arg_max = sum(len(arg) + 9 for arg in command) + 2 * 12
+    monkeypatch.setattr(ToolPlugin, "get_arg_max", staticmethod(lambda: arg_max))
+    tp = make_max_procs_plugin(2)
+
+    assert tp.check_output_batched(command, ["a", "b", "c"]) == "a b\nc\n"
+    with pytest.raises(subprocess.CalledProcessError) as ex:
+        tp.check_output_batched(command, files)
+    assert ex.value.returncode == 2
+    assert ex.value.output == "a b\nbad c\n"
+
+
+def test_tool_plugin_check_output_batched_file_list(monkeypatch):
+    """Test that files are passed in a list when the tool can read one.
+
+    Expected result: the command is run once with all files in the list
+    """
+    script = "import sys; print(open(sys.argv[1].split('=', 1)[1]).read().split())"
+    command = [sys.executable, "-c", script]
+    arg_max = sum(len(arg) + 9 for arg in command) + 12
+    monkeypatch.setattr(ToolPlugin, "get_arg_max", staticmethod(lambda: arg_max))
+    output = ToolPlugin().check_output_batched(command, ["a", "b", "c"], "--list=")
+    assert output == "['a', 'b', 'c']\n"
+
+
+def test_tool_plugin_stream_output():
+    """Test that output is streamed one line at a time and written to a log file.
+
+    Expected result: lines without line endings, the raw output in the log file, and
+    the last lines of output in the error of a failed command
+    """
+    script = (
+        "import sys; print('one'); print('two');"
+        " sys.exit(3 if 'bad' in sys.argv else 0)"
+    )
+    command = [sys.executable, "-c", script]
+    with TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "tool.log")
+        assert list(ToolPlugin().stream_output(command, log_file)) == ["one", "two"]
+        with open(log_file, encoding="utf8") as fid:
+            assert fid.read() == "one\ntwo\n"
+
+    tp = ToolPlugin()
+    tp.STREAM_TAIL_LINES = 1
+    lines = []
+    with pytest.raises(subprocess.CalledProcessError) as ex:
+        for line in tp.stream_output(command + ["bad"]):
+            lines.append(line)
+    assert lines == ["one", "two"]
+    assert ex.value.returncode == 3
+    assert ex.value.output == "two\n"
+
+
+def test_tool_plugin_stream_output_batched(monkeypatch):
+    """Test that batches of files are streamed in order.
+
+    Expected result: output of all batches in order, and the highest return code
+    """
+    script = (
+        "import sys; print(' '.join(sys.argv[1:]));"
+        " sys.exit(2 if 'bad' in sys.argv else 0)"
+    )
+    command = [sys.executable, "-c", script]
+    arg_max = sum(len(arg) + 9 for arg in command) + 2 * 12
+    monkeypatch.setattr(ToolPlugin, "get_arg_max", staticmethod(lambda: arg_max))
+    tp = make_max_procs_plugin(2)
+
+    assert list(tp.stream_output_batched(command, ["a", "b", "c"])) == ["a b", "c"]
+    lines = []
+    with pytest.raises(subprocess.CalledProcessError) as ex:
+        for line in tp.stream_output_batched(command, ["a", "b", "bad", "c"]):
+            lines.append(line)
+    assert lines == ["a b", "bad c"]
+    assert ex.value.returncode == 2
+
+
+def test_tool_plugin_stream_output_batched_shards():
+    """Test that files split into shards are streamed in order of the shards.
+
+    Expected result: one run of the command for each shard
+    """
+    command = [sys.executable, "-c", "import sys; print(' '.join(sys.argv[1:]))"]
+    with TemporaryDirectory() as tmp_dir:
+        files = []
+        for index in range(4):
+            path = os.path.join(tmp_dir, f"file{index}")
+            with open(path, "w", encoding="utf8") as fid:
+                fid.write("x" * 10)
+            files.append(path)
+        tp = make_max_procs_plugin(2)
+        lines = list(tp.stream_output_batched(command, files, shards=2))
+        assert lines == [" ".join(shard) for shard in ToolPlugin.shard_files(files, 2)]
+    assert len(lines) == 2
+
+
+def test_tool_plugin_get_shards(monkeypatch):
+    """Test that the number of shards is read from the tool config.
+
+    Expected result: auto uses --max-procs, numbers are used as is, and sharding is
+    off for missing or invalid values
+    """
+    monkeypatch.setattr(ToolPlugin, "get_name", lambda self: "test")
+    with TemporaryDirectory() as tmp_dir:
+        config_file = os.path.join(tmp_dir, "config.yaml")
+        with open(config_file, "w", encoding="utf8") as fid:
+            fid.write(
+                "levels:\n"
+                "  auto:\n    tool:\n      test:\n        shards: auto\n"
+                "  three:\n    tool:\n      test:\n        shards: '3'\n"
+                "  invalid:\n    tool:\n      test:\n        shards: many\n"
+                "  none:\n    tool:\n      test:\n        flags: ''\n"
+            )
+        arg_parser = argparse.ArgumentParser()
+        arg_parser.add_argument("--max-procs", dest="max_procs", type=int)
+        plugin_context = PluginContext(
+            arg_parser.parse_args(["--max-procs", "4"]),
+            Resources([]),
+            Config(config_file),
+        )
+        tp = ToolPlugin()
+        tp.set_plugin_context(plugin_context)
+        assert tp.get_shards("auto") == 4
+        assert tp.get_shards("three") == 3
+        assert tp.get_shards("invalid") == 1
+        assert tp.get_shards("none") == 1
+
+
+def test_tool_plugin_shard_files():
+    """Test that files are split into shards of about the same size.
+
+    Expected result: shard sizes are balanced and files keep their order
+    """
+    with TemporaryDirectory() as tmp_dir:
+        files = []
+        for index, size in enumerate([50, 10, 40, 20, 30, 0]):
+            path = os.path.join(tmp_dir, f"file{index}")
+            with open(path, "w", encoding="utf8") as fid:
+                fid.write("x" * size)
+            files.append(path)
+        files.append(os.path.join(tmp_dir, "missing"))
+
+        shards = ToolPlugin.shard_files(files, 3)
+        assert sorted(src for shard in shards for src in shard) == sorted(files)
+        assert sorted(
+            sum(os.path.getsize(src) for src in shard if os.path.exists(src))
+            for shard in shards
+        ) == [50, 50, 50]
+        for shard in shards:
+            assert shard == sorted(shard, key=files.index)
+        assert ToolPlugin.shard_files(files[:2], 8) == [[files[0]], [files[1]]]
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        "[a.c:1]: (error id) one\nnoise\n[b.c:2]: (style id) two\n",
+        "noise\r\n[a.c:1]: (error id) one\r\n[b.c:2]: (style id) two",
+        "[a.c:1]: (error id) one\x0c[b.c:2]: (style id) two noise [c.c:3]",
+        "noise only\n",
+        "",
+    ],
+)
+def test_tool_plugin_find_line_matches(output):
+    """Test that matches are the same as matching each line of the output.
+
+    Expected result: the same matches with and without a prefix, for any line breaks
+    """
+    pattern = re.compile(r"^\[(.+):(\d+)\]:[^\S\n]\((.+?)\)[^\S\n](.+)", re.MULTILINE)
+    expected = [
+        match.groups()
+        for match in (pattern.match(line) for line in output.splitlines())
+        if match is not None
+    ]
+    assert [
+        match.groups() for match in ToolPlugin.find_line_matches(pattern, output)
+    ] == expected
+    assert [
+        match.groups() for match in ToolPlugin.find_line_matches(pattern, output, "[")
+    ] == expected
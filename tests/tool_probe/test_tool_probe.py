@@ -0,0 +1,128 @@
+"""Tests for the tool probe module."""
+
+import os
+import stat
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+import mock
+import pytest
+
+from statick_tool.tool_plugin import ToolPlugin
+from statick_tool.tool_probe import ToolProbe
+
+
+@pytest.fixture(autouse=True)
+def clear_tool_probe():
+    """Start and finish every test with an empty tool probe cache."""
+    ToolProbe.clear()
+    ToolProbe.set_cache_dir(None)
+    yield
+    ToolProbe.clear()
+    ToolProbe.set_cache_dir(None)
+
+
+def make_executable(tmp_dir, name="tool", output="1.0"):
+    """Make an executable script that prints a version."""
+    path = os.path.join(tmp_dir, name)
+    with open(path, "w", encoding="utf8") as fid:
+        fid.write(f"#!/bin/sh\necho {output}\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def test_tool_probe_find_executable_cached(monkeypatch):
+    """Test that executable lookups are kept until the cache is cleared.
+
+    Expected result: a removed executable is still found until the cache is cleared
+    """
+    monkeypatch.delenv("PATHEXT", raising=False)
+    with TemporaryDirectory() as tmp_dir:
+        path = make_executable(tmp_dir)
+        monkeypatch.setenv("PATH", tmp_dir)
+        assert ToolProbe.find_executable("tool") == path
+        os.remove(path)
+        assert ToolProbe.find_executable("tool") == path
+        assert ToolPlugin.command_exists("tool")
+        ToolProbe.clear()
+        assert ToolProbe.find_executable("tool") is None
+
+
+def test_tool_probe_find_executable_path_changed(monkeypatch):
+    """Test that executable lookups depend on the value of $PATH.
+
+    Expected result: the executable is not found with a different $PATH
+    """
+    monkeypatch.delenv("PATHEXT", raising=False)
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as other_dir:
+        make_executable(tmp_dir)
+        monkeypatch.setenv("PATH", tmp_dir)
+        assert ToolProbe.find_executable("tool") is not None
+        monkeypatch.setenv("PATH", other_dir)
+        assert ToolProbe.find_executable("tool") is None
+
+
+@mock.patch("subprocess.check_output")
+def test_tool_probe_get_output_once(mock_subprocess_check_output):
+    """Test that a probe command is only run once per process.
+
+    Expected result: the command is run once and its output is returned every time
+    """
+    mock_subprocess_check_output.return_value = b"tool 1.0\n"
+    assert ToolProbe.get_output(["npm", "list"]) == "tool 1.0\n"
+    assert ToolProbe.get_output(["npm", "list"]) == "tool 1.0\n"
+    assert mock_subprocess_check_output.call_count == 1
+    assert ToolProbe.get_output(["npm", "list", "-g"]) == "tool 1.0\n"
+    assert mock_subprocess_check_output.call_count == 2
+
+
+@mock.patch("subprocess.check_output")
+def test_tool_probe_get_output_failure(mock_subprocess_check_output):
+    """Test that a failed probe command returns None.
+
+    Expected result: None is returned and nothing is kept on disk
+    """
+    mock_subprocess_check_output.side_effect = subprocess.CalledProcessError(
+        1, "", output="mocked error"
+    )
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as cache_dir:
+        path = make_executable(tmp_dir)
+        ToolProbe.set_cache_dir(cache_dir)
+        assert ToolProbe.get_output([path, "--version"], path) is None
+        assert not os.path.exists(os.path.join(cache_dir, ToolProbe.CACHE_FILE_NAME))
+
+
+def test_tool_probe_get_output_disk_cache():
+    """Test that probe output is kept on disk until the executable changes.
+
+    Expected result: the command is not run again in a new process, unless the
+    executable changed
+    """
+    if sys.platform == "win32":
+        pytest.skip("Shell scripts are not executable on Windows.")
+    with TemporaryDirectory() as tmp_dir, TemporaryDirectory() as cache_dir:
+        path = make_executable(tmp_dir)
+        ToolProbe.set_cache_dir(cache_dir)
+        assert ToolProbe.get_output([path, "--version"], path) == "1.0\n"
+
+        # Forget the in-memory results, as a new process would.
+        ToolProbe.clear()
+        with mock.patch("subprocess.check_output") as mock_subprocess_check_output:
+            assert ToolProbe.get_output([path, "--version"], path) == "1.0\n"
+            mock_subprocess_check_output.assert_not_called()
+
+        make_executable(tmp_dir, output="2.0.0")
+        assert ToolProbe.get_output([path, "--version"], path) == "2.0.0\n"
+
+
+def test_tool_plugin_get_version_missing(monkeypatch):
+    """Test that a missing tool is reported without running it.
+
+    Expected result: the tool is reported as not installed
+    """
+    monkeypatch.setenv("PATH", "")
+    with mock.patch.object(ToolPlugin, "get_binary", return_value="missing-tool"):
+        with mock.patch("subprocess.check_output") as mock_subprocess_check_output:
+            assert ToolPlugin().get_version() == ToolPlugin.TOOL_MISSING_STR
+            mock_subprocess_check_output.assert_not_called()
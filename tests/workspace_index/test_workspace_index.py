@@ -0,0 +1,54 @@
+"""Tests for the workspace index module."""
+
+import os
+from tempfile import TemporaryDirectory
+
+from statick_tool.workspace_index import WorkspaceIndex
+
+
+def make_tree(root, paths):
+    """Make empty files, creating their directories."""
+    for path in paths:
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf8"):
+            pass
+
+
+def test_workspace_index_walk():
+    """Test that packages are found with a single walk of the workspace.
+
+    Expected result: packages are found in name order, ignored directories, build
+    trees and nested packages are left out, and the entries of each package directory
+    are counted
+    """
+    with TemporaryDirectory() as tmp_dir:
+        make_tree(
+            tmp_dir,
+            [
+                "package.xml",
+                "src/b_pkg/package.xml",
+                "src/b_pkg/nested/setup.py",
+                "src/a_pkg/pyproject.toml",
+                "src/subdir/c_pkg/package.xml",
+                "src/ignored/COLCON_IGNORE",
+                "src/ignored/d_pkg/package.xml",
+                "src/ignored_pkg/CATKIN_IGNORE",
+                "src/ignored_pkg/package.xml",
+                "build/CMakeCache.txt",
+                "build/e_pkg/package.xml",
+                "node_modules/f_pkg/package.xml",
+            ],
+        )
+        packages, entry_counts = WorkspaceIndex.find_packages(tmp_dir)
+        assert [package.name for package in packages] == ["a_pkg", "b_pkg", "c_pkg"]
+        assert [package.path for package in packages] == [
+            os.path.join(tmp_dir, "src", "a_pkg"),
+            os.path.join(tmp_dir, "src", "b_pkg"),
+            os.path.join(tmp_dir, "src", "subdir", "c_pkg"),
+        ]
+        assert entry_counts == {
+            os.path.join(tmp_dir, "src", "a_pkg"): 1,
+            os.path.join(tmp_dir, "src", "b_pkg"): 2,
+            os.path.join(tmp_dir, "src", "subdir", "c_pkg"): 1,
+        }